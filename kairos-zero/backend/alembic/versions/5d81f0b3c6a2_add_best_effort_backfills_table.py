@@ -0,0 +1,45 @@
+"""add_best_effort_backfills_table
+
+Revision ID: 5d81f0b3c6a2
+Revises: e3a9d5c27f18
+Create Date: 2026-10-17 20:11:52.630417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d81f0b3c6a2'
+down_revision: Union[str, Sequence[str], None] = 'e3a9d5c27f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+activities = sa.table(
+    'strava_activities',
+    sa.column('athlete_id', sa.BigInteger),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    backfills = op.create_table('best_effort_backfills',
+    sa.Column('athlete_id', sa.BigInteger(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('athlete_id')
+    )
+
+    # La migration cb9b6631fb64 a rempli best_efforts pour toutes les activités déjà en base
+    op.get_bind().execute(backfills.insert().from_select(
+        ['athlete_id', 'completed_at'],
+        sa.select(activities.c.athlete_id, sa.func.now())
+        .where(activities.c.athlete_id.isnot(None))
+        .distinct()
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('best_effort_backfills')
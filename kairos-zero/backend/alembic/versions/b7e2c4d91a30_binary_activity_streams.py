@@ -0,0 +1,233 @@
+"""binary_activity_streams
+
+Revision ID: b7e2c4d91a30
+Revises: 9ec89eb8d966
+Create Date: 2026-10-17 16:40:12.318204
+
+"""
+import json
+import struct
+import zlib
+from typing import Dict, Optional, Sequence, Union
+
+from alembic import op
+import numpy as np
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c4d91a30'
+down_revision: Union[str, Sequence[str], None] = '9ec89eb8d966'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 200
+
+activities = sa.table(
+    'strava_activities',
+    sa.column('id', sa.Integer),
+    sa.column('streams', sa.LargeBinary),
+    sa.column('elevation_data', sa.Text),
+    sa.column('pace_data', sa.Text),
+    sa.column('heartrate_data', sa.Text),
+    sa.column('power_data', sa.Text),
+)
+
+# Format des blobs à cette révision (copie figée de app/utils/activity_streams.py :
+# la migration ne doit pas suivre les évolutions du code applicatif)
+STREAM_MAGIC = b"KZS1"
+STREAM_FLAG_ZLIB = 0x01
+STREAM_DTYPES = {
+    "time": "<i4",
+    "distance": "<f4",
+    "altitude": "<f4",
+    "velocity_smooth": "<f4",
+    "heartrate": "<i2",
+    "cadence": "<i2",
+    "watts": "<i2",
+}
+_HEADER = struct.Struct("<4sBB2x")
+_CHANNEL = struct.Struct("<16s4sI")
+_ALIGNMENT = 8
+
+
+def _to_array(name, values) -> np.ndarray:
+    """Convertit un stream en tableau typé ; les canaux entiers avec trous passent en float32 (NaN)."""
+    dtype = np.dtype(STREAM_DTYPES.get(name, "<f4"))
+    arr = np.asarray(values)
+    if arr.dtype == dtype:
+        return arr
+    if dtype.kind == "i" and arr.dtype.kind == "f":
+        if not np.all(np.isfinite(arr)) or np.any(arr != np.round(arr)):
+            dtype = np.dtype("<f4")
+    return arr.astype(dtype)
+
+
+def _encode_streams(streams) -> Optional[bytes]:
+    """Encode des streams en blob binaire non compressé, ou None si aucun canal n'est rempli."""
+    arrays = {name: _to_array(name, values) for name, values in streams.items() if len(values)}
+    if not arrays:
+        return None
+
+    table = []
+    chunks = []
+    for name, arr in arrays.items():
+        table.append(_CHANNEL.pack(name.encode("ascii"), arr.dtype.str.encode("ascii"), len(arr)))
+        raw = arr.tobytes()
+        chunks.append(raw + b"\x00" * (-len(raw) % _ALIGNMENT))
+    return _HEADER.pack(STREAM_MAGIC, 0, len(arrays)) + b"".join(table) + b"".join(chunks)
+
+
+def _decode_streams(blob) -> Dict[str, np.ndarray]:
+    """Décode un blob de streams (compressé ou non)."""
+    blob = bytes(blob)
+    magic, flags, n_channels = _HEADER.unpack_from(blob, 0)
+    if magic != STREAM_MAGIC:
+        raise ValueError(f"Signature de streams inconnue: {magic!r}")
+
+    table_end = _HEADER.size + n_channels * _CHANNEL.size
+    channels = [_CHANNEL.unpack_from(blob, _HEADER.size + i * _CHANNEL.size) for i in range(n_channels)]
+    payload = memoryview(blob)[table_end:]
+    if flags & STREAM_FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+
+    streams = {}
+    offset = 0
+    for raw_name, raw_dtype, length in channels:
+        dtype = np.dtype(raw_dtype.rstrip(b"\x00").decode("ascii"))
+        streams[raw_name.rstrip(b"\x00").decode("ascii")] = np.frombuffer(
+            payload, dtype=dtype, count=length, offset=offset
+        )
+        nbytes = length * dtype.itemsize
+        offset += nbytes + (-nbytes % _ALIGNMENT)
+    return streams
+
+
+def _load_json(value) -> Optional[dict]:
+    if not value:
+        return None
+    try:
+        data = json.loads(value)
+    except (json.JSONDecodeError, TypeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _streams_from_legacy_json(elevation_data, pace_data, heartrate_data, power_data) -> Dict[str, np.ndarray]:
+    """Reconstruit les streams (unités Strava) depuis les colonnes JSON : distances en km, vitesse en km/h."""
+    elevation = _load_json(elevation_data) or {}
+    pace = _load_json(pace_data) or {}
+    heartrate = _load_json(heartrate_data) or {}
+    power = _load_json(power_data) or {}
+
+    raw = {
+        "time": pace.get("time") or heartrate.get("time") or power.get("time"),
+        "distance": pace.get("distance") or elevation.get("distance"),
+        "altitude": elevation.get("altitude"),
+        "velocity_smooth": pace.get("velocity"),
+        "heartrate": heartrate.get("heartrate"),
+        "cadence": power.get("cadence"),
+        "watts": power.get("watts"),
+    }
+
+    streams = {}
+    for name, values in raw.items():
+        if not values:
+            continue
+        arr = np.array(values, dtype=np.float64)
+        if name == "distance":
+            arr *= 1000
+        elif name == "velocity_smooth":
+            arr /= 3.6
+        streams[name] = arr
+    return streams
+
+
+def _to_json_list(values: np.ndarray) -> list:
+    if values.dtype.kind != "f":
+        return values.tolist()
+    return [None if v != v else v for v in np.round(values.astype(np.float64), 5).tolist()]
+
+
+def _legacy_json_columns(streams) -> Dict[str, Optional[str]]:
+    """Sérialise des streams dans les colonnes JSON : distances en km, vitesse en km/h."""
+    time_s = streams.get("time")
+    distance_km = np.divide(streams["distance"], 1000, dtype=np.float64) if "distance" in streams else None
+    altitude = streams.get("altitude")
+    velocity = streams.get("velocity_smooth")
+    heartrate = streams.get("heartrate")
+    watts = streams.get("watts")
+    cadence = streams.get("cadence")
+
+    def column(present, **channels):
+        if not present:
+            return None
+        return json.dumps({name: _to_json_list(values) for name, values in channels.items() if values is not None})
+
+    return {
+        "elevation_data": column(distance_km is not None or altitude is not None,
+                                 distance=distance_km, altitude=altitude),
+        "pace_data": column(time_s is not None or distance_km is not None or velocity is not None,
+                            time=time_s, distance=distance_km,
+                            velocity=np.round(velocity * 3.6, 2) if velocity is not None else None),
+        "heartrate_data": column(time_s is not None or heartrate is not None, time=time_s, heartrate=heartrate),
+        "power_data": column(watts is not None or cadence is not None, watts=watts, cadence=cadence, time=time_s),
+    }
+
+
+def _batches(bind, where):
+    """Parcourt les activités concernées par lots, par id croissant."""
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(activities)
+            .where(where, activities.c.id > last_id)
+            .order_by(activities.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('strava_activities', sa.Column('streams', sa.LargeBinary(), nullable=True))
+
+    # Conversion des streams JSON existants ; les anciennes colonnes sont vidées
+    bind = op.get_bind()
+    legacy = sa.or_(
+        activities.c.elevation_data.isnot(None),
+        activities.c.pace_data.isnot(None),
+        activities.c.heartrate_data.isnot(None),
+        activities.c.power_data.isnot(None),
+    )
+    for rows in _batches(bind, sa.and_(activities.c.streams.is_(None), legacy)):
+        for row in rows:
+            blob = _encode_streams(
+                _streams_from_legacy_json(row.elevation_data, row.pace_data, row.heartrate_data, row.power_data)
+            )
+            if blob is None:
+                # JSON illisible : laissé tel quel pour inspection
+                continue
+            bind.execute(
+                activities.update()
+                .where(activities.c.id == row.id)
+                .values(streams=blob, elevation_data=None, pace_data=None,
+                        heartrate_data=None, power_data=None)
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    for rows in _batches(bind, activities.c.streams.isnot(None)):
+        for row in rows:
+            bind.execute(
+                activities.update()
+                .where(activities.c.id == row.id)
+                .values(**_legacy_json_columns(_decode_streams(row.streams)))
+            )
+
+    op.drop_column('strava_activities', 'streams')
@@ -0,0 +1,119 @@
+"""add_best_efforts_table
+
+Revision ID: cb9b6631fb64
+Revises: 70ba0ed83dc6
+Create Date: 2026-10-17 18:16:10.575146
+
+"""
+import json
+import re
+from typing import Dict, List, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cb9b6631fb64'
+down_revision: Union[str, Sequence[str], None] = '70ba0ed83dc6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+activities = sa.table(
+    'strava_activities',
+    sa.column('id', sa.Integer),
+    sa.column('athlete_id', sa.BigInteger),
+    sa.column('activity_id', sa.BigInteger),
+    sa.column('start_date', sa.DateTime),
+    sa.column('best_efforts', sa.Text),
+)
+
+
+# Lecture des meilleurs efforts à cette révision (copie figée de parse_best_efforts et
+# convert_distance_to_meters : la migration ne doit pas suivre le code applicatif)
+def _distance_to_meters(name: str) -> int:
+    """Distance d'un meilleur effort Strava en mètres (ex. "5k", "400m", "1 mile"), 0 si inconnue."""
+    match = re.match(r'(\d+(?:\.\d+)?)\s*([a-zA-Z]+)', name)
+    if not match:
+        return 0
+    number = float(match.group(1))
+    unit = match.group(2).lower()
+    if unit in ['km', 'k']:
+        return int(number * 1000)
+    elif unit in ['m', 'meter', 'meters']:
+        return int(number)
+    elif unit in ['mi', 'mile', 'miles']:
+        return int(number * 1609.34)
+    return 0
+
+
+def _best_effort_rows(athlete_id, activity_id, start_date, best_efforts) -> List[Dict]:
+    """Lignes best_efforts d'une activité : meilleur temps par distance, efforts incomplets ignorés."""
+    if isinstance(best_efforts, (str, bytes)):
+        best_efforts = json.loads(best_efforts)
+
+    efforts = {}
+    for effort in best_efforts or []:
+        name = effort.get("name")
+        elapsed_time = effort.get("elapsed_time")
+        if not name or elapsed_time is None:
+            continue
+        distance_m = _distance_to_meters(name)
+        if distance_m <= 0:
+            continue
+        elapsed_s = int(elapsed_time)
+        if distance_m not in efforts or elapsed_s < efforts[distance_m]:
+            efforts[distance_m] = elapsed_s
+    return [
+        {"athlete_id": athlete_id, "activity_id": activity_id, "distance_m": distance_m,
+         "elapsed_s": elapsed_s, "start_date": start_date}
+        for distance_m, elapsed_s in efforts.items()
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    best_efforts = op.create_table('best_efforts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('athlete_id', sa.BigInteger(), nullable=False),
+    sa.Column('activity_id', sa.BigInteger(), nullable=False),
+    sa.Column('distance_m', sa.Integer(), nullable=False),
+    sa.Column('elapsed_s', sa.Integer(), nullable=False),
+    sa.Column('start_date', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('activity_id', 'distance_m', name='uq_best_efforts_activity_distance')
+    )
+    op.create_index('ix_best_efforts_athlete_distance', 'best_efforts', ['athlete_id', 'distance_m', 'elapsed_s'], unique=False)
+    op.create_index(op.f('ix_best_efforts_id'), 'best_efforts', ['id'], unique=False)
+
+    # Remplissage depuis la colonne JSON des activités existantes, par lots d'id croissants
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(activities)
+            .where(activities.c.best_efforts.isnot(None), activities.c.id > last_id)
+            .order_by(activities.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        efforts = []
+        for row in rows:
+            try:
+                efforts.extend(_best_effort_rows(row.athlete_id, row.activity_id, row.start_date, row.best_efforts))
+            except (ValueError, TypeError, AttributeError):
+                # JSON illisible : activité ignorée, comme à la lecture des records
+                continue
+        if efforts:
+            bind.execute(best_efforts.insert(), efforts)
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_best_efforts_id'), table_name='best_efforts')
+    op.drop_index('ix_best_efforts_athlete_distance', table_name='best_efforts')
+    op.drop_table('best_efforts')
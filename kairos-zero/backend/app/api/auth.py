@@ -7,8 +7,7 @@ Contient les routes pour :
 - La déconnexion
 """
 
-import requests
-from app.config import STRAVA_CLIENT_ID, STRAVA_CLIENT_SECRET
+from app.services.strava_client import strava_client
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import datetime, timedelta
@@ -24,14 +23,7 @@ def refresh_strava_token(refresh_token: str) -> dict:
     Rafraîchit un access_token Strava à partir d'un refresh_token.
     Retourne le nouveau token (dict avec access_token, refresh_token, expires_at, etc.)
     """
-    url = "https://www.strava.com/oauth/token"
-    data = {
-        "client_id": STRAVA_CLIENT_ID,
-        "client_secret": STRAVA_CLIENT_SECRET,
-        "grant_type": "refresh_token",
-        "refresh_token": refresh_token
-    }
-    response = requests.post(url, data=data)
+    response = strava_client.refresh_token(refresh_token)
     response.raise_for_status()
     return response.json()
 
@@ -1,12 +1,21 @@
 """
 Point d'entrée pour les prédictions de performance.
-Gère la route POST /predict qui permet de prédire les performances
-sur différentes distances (5k, 10k, semi, marathon) à partir
-des données d'entraînement.
+Gère :
+- La route POST /predict qui permet de prédire les performances
+  sur différentes distances (5k, 10k, semi, marathon) à partir
+  des données d'entraînement
+- La route GET /predictions/table : table d'équivalences des temps de
+  l'utilisateur connecté (400 m à 100 km) et courbe pour les graphiques
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.dependencies.auth import get_current_identity
+from app.services.identity_cache import Identity
 from app.services.prediction_service import predict_race_time
+from app.services.prediction_table import get_prediction_table
+from app.utils.strava_auth import get_athlete_id_from_token
 
 router = APIRouter()
 
@@ -14,3 +23,20 @@ router = APIRouter()
 def predict_endpoint(gpx_path: str, training_log_path: str):
     prediction, distance = predict_race_time(gpx_path, training_log_path)
     return {"prediction": prediction, "distance": distance}
+
+
+@router.get("/predictions/table")
+def prediction_table_endpoint(
+    points: int = Query(200, ge=2, le=5000, description="Nombre de points de la courbe temps-distance"),
+    db: Session = Depends(get_db),
+    identity: Identity = Depends(get_current_identity)
+):
+    """
+    Table d'équivalences des temps de course de l'utilisateur connecté, prédits par le
+    modèle de puissance ajusté sur ses records (recalculée quand ses records changent).
+    """
+    athlete_id = get_athlete_id_from_token(identity)
+    table = get_prediction_table(db, athlete_id, points)
+    if table is None:
+        raise HTTPException(status_code=404, detail="Aucun record trouvé pour cet utilisateur")
+    return table
@@ -1,5 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import RedirectResponse, StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.config import STRAVA_CLIENT_ID, REDIRECT_URI
@@ -7,21 +7,37 @@ from app.services.strava_service import StravaService
 from app.repositories.strava_token import upsert_strava_token
 from app.models.strava_token import StravaToken
 from app.models.strava_activity import StravaActivity
-from app.repositories.strava_activity import save_activities, fetch_full_activity_details, get_latest_activity_date, get_activities_summary
+from app.repositories.strava_activity import save_activities, save_fetched_activities, get_latest_activity_date, get_activities_summary
+from app.repositories.training_load import get_training_load
+from app.utils.training_load import analytics_payload, analytics_period
+from app.services.strava_fetcher import fetch_activities_details, StravaRateLimitExceeded
+from app.services.strava_client import strava_client
+from app.services.sync_jobs import submit_sync_job
+from app.repositories.sync_job import create_sync_job, get_sync_job, request_sync_job_cancel
 from app.utils.strava_auth import get_current_token, get_athlete_id_from_token
-from app.dependencies.auth import get_current_user
+from app.dependencies.auth import get_current_identity, get_current_user
+from app.services.identity_cache import Identity, invalidate_identity
+from app.services.strava_tokens import strava_token_manager
 from app.models.user import User
 import requests
-import asyncio
-import time
-import pandas as pd
-import numpy as np
-from datetime import datetime
+from datetime import date, datetime
+from typing import Optional
+import math
 import os
 
 router = APIRouter()
 service = StravaService()
 
+
+def rate_limit_error(error: StravaRateLimitExceeded) -> HTTPException:
+    """Réponse 429 lorsque le quota journalier Strava est épuisé, avec le délai avant sa remise à zéro."""
+    return HTTPException(
+        status_code=429,
+        detail=f"{error} : réessayez plus tard",
+        headers={"Retry-After": str(max(1, math.ceil(error.retry_after)))}
+    )
+
+
 @router.get("/strava/auth")
 def auth():
     url = (
@@ -76,6 +92,9 @@ def link_strava_token_to_user(db: Session = Depends(get_db), current_user: User
         # Lier le token à l'utilisateur connecté
         token_entry.user_id = current_user.id
         db.commit()
+        invalidate_identity(current_user.id)
+        # Oublier le token d'accès en mémoire : il peut appartenir à l'athlète lié précédemment
+        strava_token_manager.forget(current_user.id)
         
         return {"message": "Token Strava lié avec succès", "athlete_id": token_entry.athlete_id}
         
@@ -86,14 +105,12 @@ def link_strava_token_to_user(db: Session = Depends(get_db), current_user: User
         raise HTTPException(status_code=500, detail=f"Erreur lors de la liaison du token: {str(e)}")
 
 @router.get("/strava/activities")
-def get_activities(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    athlete_id = get_athlete_id_from_token(db, current_user)
-    token = get_current_token(db, current_user)
-    headers = {"Authorization": f"Bearer {token}"}
+def get_activities(db: Session = Depends(get_db), identity: Identity = Depends(get_current_identity)):
+    athlete_id = get_athlete_id_from_token(identity)
+    token = get_current_token(db, identity)
     
     # Récupération des activités (liste de base)
-    url = "https://www.strava.com/api/v3/athlete/activities"
-    resp = requests.get(url, headers=headers, params={"per_page": 50})
+    resp = make_strava_request_with_retry("/athlete/activities", params={"per_page": 50}, access_token=token)
 
     # Ajout d'une gestion d'erreur robuste
     if resp.status_code != 200:
@@ -112,14 +129,16 @@ def get_activities(db: Session = Depends(get_db), current_user: User = Depends(g
         )
 
     detailed_activities = []
-    for act in base_activities:
-        activity_id = act.get("id")
-        if not activity_id:
-            continue # On passe à la suite si l'activité n'a pas d'ID
-
-        full_data = fetch_full_activity_details(token, activity_id)
-        if full_data:
-            detailed_activities.append(full_data)
+    activity_ids = [act["id"] for act in base_activities if act.get("id")]
+    try:
+        for activity_id, full_data, error in fetch_activities_details(token, activity_ids):
+            if error:
+                print(f"Erreur sur l'activité {activity_id}: {str(error)}")
+                continue
+            if full_data:
+                detailed_activities.append(full_data)
+    except StravaRateLimitExceeded as e:
+        raise rate_limit_error(e)
 
     result = save_activities(db, athlete_id, detailed_activities)
 
@@ -130,152 +149,92 @@ def get_activities(db: Session = Depends(get_db), current_user: User = Depends(g
         "total_processed": result["total_processed"]
     }
 
-def make_strava_request_with_retry(url, headers, params=None, max_retries=3, delay=1):
+def make_strava_request_with_retry(url, headers=None, params=None, access_token=None):
     """
-    Fait une requête à l'API Strava avec retry automatique en cas d'erreur.
+    Fait une requête à l'API Strava via le client partagé.
+    Les retries (erreurs réseau, 5xx) et l'attente sur 429 sont gérés par le client.
     """
-    for attempt in range(max_retries):
-        try:
-            response = requests.get(url, headers=headers, params=params, timeout=30)
-            
-            if response.status_code == 200:
-                return response
-            
-            # Si c'est une erreur de rate limiting, on attend plus longtemps
-            if response.status_code == 429:
-                wait_time = delay * (2 ** attempt)  # Backoff exponentiel
-                time.sleep(wait_time)
-                continue
-                
-            # Pour les autres erreurs, on attend un peu puis on réessaie
-            if response.status_code >= 500:
-                time.sleep(delay)
-                continue
-                
-            # Si c'est une erreur client (4xx), on ne réessaie pas
-            return response
-            
-        except requests.exceptions.Timeout:
-            if attempt < max_retries - 1:
-                time.sleep(delay)
-                continue
-            raise HTTPException(status_code=408, detail="Timeout lors de la requête à Strava")
-            
-        except requests.exceptions.RequestException as e:
-            if attempt < max_retries - 1:
-                time.sleep(delay)
-                continue
-            raise HTTPException(status_code=500, detail=f"Erreur réseau: {str(e)}")
-    
-    # Si on arrive ici, toutes les tentatives ont échoué
-    raise HTTPException(status_code=500, detail="Impossible de récupérer les données de Strava après plusieurs tentatives")
+    try:
+        return strava_client.get(url, access_token=access_token, params=params, headers=headers)
+    except requests.exceptions.Timeout:
+        raise HTTPException(status_code=408, detail="Timeout lors de la requête à Strava")
+    except requests.exceptions.RequestException as e:
+        raise HTTPException(status_code=500, detail=f"Impossible de récupérer les données de Strava: {str(e)}")
 
-async def stream_activity_sync(db: Session, current_user: User):
+@router.post("/strava/sync-jobs", status_code=202)
+def start_sync_job(
+    response: Response,
+    mode: str = Query("intelligent", pattern="^(intelligent|full)$"),
+    db: Session = Depends(get_db),
+    identity: Identity = Depends(get_current_identity)
+):
     """
-    Générateur qui récupère les activités, les sauvegarde,
-    et streame l'état d'avancement.
+    Lance une synchronisation en tâche de fond et renvoie immédiatement son état.
+    Si l'athlète a déjà une synchronisation en cours, c'est celle-ci qui est renvoyée.
+    Suivi : GET /strava/sync-jobs/{job_id}.
     """
-    yield "data: Connexion à Strava...\n\n"
-    await asyncio.sleep(1)
+    athlete_id = get_athlete_id_from_token(identity)
+    job, created = create_sync_job(db, identity.user.id, athlete_id, mode)
+    if created:
+        submit_sync_job(job.id)
+    else:
+        response.status_code = 200
+    return {**job.to_dict(), "created": created}
 
-    athlete_id = get_athlete_id_from_token(db, current_user)
-    token = get_current_token(db, current_user)
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    # 1. Récupération de la liste des activités
-    url = "https://www.strava.com/api/v3/athlete/activities"
-    
-    try:
-        resp = make_strava_request_with_retry(url, headers, {"per_page": 200})
-    except HTTPException as e:
-        yield f"data: Erreur - {e.detail}\n\n"
-        return
+@router.get("/strava/sync-jobs/{job_id}")
+def get_sync_job_status(job_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    """
+    État et avancement d'une synchronisation.
+    """
+    job = get_sync_job(db, job_id, user_id=current_user.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Synchronisation introuvable")
+    return job.to_dict()
 
-    base_activities = resp.json()
-    if not isinstance(base_activities, list):
-        yield "data: Erreur - Réponse inattendue de Strava\n\n"
-        return
-    
-    total_activities = len(base_activities)
-    yield f"data: {total_activities} activités à synchroniser...\n\n"
-    await asyncio.sleep(1)
-
-    # 2. Récupération des détails et sauvegarde
-    new_activities_count = 0
-    updated_activities_count = 0
-    for i, act in enumerate(base_activities):
-        activity_id = act.get("id")
-        if not activity_id:
-            continue
-        
-        # Envoi de l'état d'avancement
-        progress = int(((i + 1) / total_activities) * 100)
-        yield f"data: {{\"progress\": {progress}, \"message\": \"Chargement de l'activité {i+1}/{total_activities}\"}}\n\n"
-
-        try:
-            full_data = fetch_full_activity_details(token, activity_id)
-            if full_data:
-                result = save_activities(db, athlete_id, [full_data])
-                new_activities_count += result["new_activities"]
-                updated_activities_count += result["updated_activities"]
-            
-            # Délai entre les requêtes pour éviter le rate limiting
-            await asyncio.sleep(0.5)
-            
-        except Exception as e:
-            yield f"data: {{\"progress\": {progress}, \"message\": \"Erreur sur l'activité {i+1}: {str(e)}\"}}\n\n"
-            continue
-
-    yield f"data: Synchronisation terminée ! {new_activities_count} nouvelles activités, {updated_activities_count} mises à jour.\n\n"
-
-@router.get("/strava/sync-activities")
-async def sync_activities_stream(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    return StreamingResponse(
-        stream_activity_sync(db, current_user),
-        media_type="text/event-stream"
-    )
+@router.post("/strava/sync-jobs/{job_id}/cancel")
+def cancel_sync_job(job_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    """
+    Annule une synchronisation (elle s'arrête après l'activité en cours).
+    """
+    job = get_sync_job(db, job_id, user_id=current_user.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Synchronisation introuvable")
+    return request_sync_job_cancel(db, job).to_dict()
+
+@router.post("/strava/sync-activities", status_code=202)
+def sync_activities_stream(response: Response, db: Session = Depends(get_db), identity: Identity = Depends(get_current_identity)):
+    """
+    Ancienne synchronisation en SSE : lance désormais une synchronisation complète
+    en tâche de fond, à suivre avec GET /strava/sync-jobs/{job_id}.
+    En POST, comme POST /strava/sync-jobs : un GET ne doit pas créer de synchronisation.
+    """
+    return start_sync_job(response, mode="full", db=db, identity=identity)
 
 @router.get("/strava/sync-simple")
-def sync_activities_simple(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def sync_activities_simple(db: Session = Depends(get_db), identity: Identity = Depends(get_current_identity)):
     """
     Version simple de la synchronisation qui retourne un résultat JSON.
+
+    Bloquante (exécutée dans le pool de threads de FastAPI) : préférer POST /strava/sync-jobs.
     """
     try:
-        athlete_id = get_athlete_id_from_token(db, current_user)
-        token = get_current_token(db, current_user)
-        headers = {"Authorization": f"Bearer {token}"}
+        athlete_id = get_athlete_id_from_token(identity)
+        token = get_current_token(db, identity)
         
         # Récupération de la liste des activités
-        url = "https://www.strava.com/api/v3/athlete/activities"
-        resp = make_strava_request_with_retry(url, headers, {"per_page": 200})
+        resp = make_strava_request_with_retry("/athlete/activities", params={"per_page": 200}, access_token=token)
         
         base_activities = resp.json()
         if not isinstance(base_activities, list):
             raise HTTPException(status_code=400, detail="Réponse inattendue de Strava")
         
         total_activities = len(base_activities)
-        new_activities_count = 0
-        updated_activities_count = 0
         
-        # Récupération des détails et sauvegarde
-        for i, act in enumerate(base_activities):
-            activity_id = act.get("id")
-            if not activity_id:
-                continue
-            
-            try:
-                full_data = fetch_full_activity_details(token, activity_id)
-                if full_data:
-                    result = save_activities(db, athlete_id, [full_data])
-                    new_activities_count += result["new_activities"]
-                    updated_activities_count += result["updated_activities"]
-                
-                # Délai entre les requêtes pour éviter le rate limiting
-                time.sleep(0.5)
-                
-            except Exception as e:
-                print(f"Erreur sur l'activité {i+1}: {str(e)}")
-                continue
+        # Récupération concurrente des détails et sauvegarde par lots
+        activity_ids = [act["id"] for act in base_activities if act.get("id")]
+        result = save_fetched_activities(db, athlete_id, fetch_activities_details(token, activity_ids))
+        new_activities_count = result["new_activities"]
+        updated_activities_count = result["updated_activities"]
         
         return {
             "status": "success",
@@ -285,48 +244,35 @@ def sync_activities_simple(db: Session = Depends(get_db), current_user: User = D
             "updated_activities": updated_activities_count
         }
         
+    except StravaRateLimitExceeded as e:
+        raise rate_limit_error(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erreur lors de la synchronisation: {str(e)}")
 
 @router.get("/strava/sync-activities-fast")
-async def sync_activities_fast(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def sync_activities_fast(db: Session = Depends(get_db), identity: Identity = Depends(get_current_identity)):
     """
     Version rapide de la synchronisation avec système de cache intelligent.
+
+    Bloquante (exécutée dans le pool de threads de FastAPI) : préférer POST /strava/sync-jobs.
     """
     try:
-        athlete_id = get_athlete_id_from_token(db, current_user)
-        token = get_current_token(db, current_user)
-        headers = {"Authorization": f"Bearer {token}"}
+        athlete_id = get_athlete_id_from_token(identity)
+        token = get_current_token(db, identity)
         
         # Récupération de la liste des activités (limité à 50 pour la rapidité)
-        url = "https://www.strava.com/api/v3/athlete/activities"
-        resp = make_strava_request_with_retry(url, headers, {"per_page": 50})
+        resp = make_strava_request_with_retry("/athlete/activities", params={"per_page": 50}, access_token=token)
         
         base_activities = resp.json()
         if not isinstance(base_activities, list):
             raise HTTPException(status_code=400, detail="Réponse inattendue de Strava")
         
         total_activities = len(base_activities)
-        successful_syncs = 0
         
-        # Récupération des détails et sauvegarde intelligente
-        for i, act in enumerate(base_activities):
-            activity_id = act.get("id")
-            if not activity_id:
-                continue
-            
-            try:
-                full_data = fetch_full_activity_details(token, activity_id)
-                if full_data:
-                    result = save_activities(db, athlete_id, [full_data])
-                    successful_syncs += result["new_activities"]
-                
-                # Délai réduit entre les requêtes
-                time.sleep(0.2)  # 200ms au lieu de 500ms
-                
-            except Exception as e:
-                print(f"Erreur sur l'activité {i+1}: {str(e)}")
-                continue
+        # Récupération concurrente des détails et sauvegarde intelligente par lots
+        activity_ids = [act["id"] for act in base_activities if act.get("id")]
+        result = save_fetched_activities(db, athlete_id, fetch_activities_details(token, activity_ids))
+        successful_syncs = result["new_activities"]
         
         return {
             "status": "OK", 
@@ -335,33 +281,34 @@ async def sync_activities_fast(db: Session = Depends(get_db), current_user: User
             "message": f"Synchronisation rapide terminée : {successful_syncs} nouvelles activités ajoutées"
         }
         
+    except StravaRateLimitExceeded as e:
+        raise rate_limit_error(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erreur lors de la synchronisation : {str(e)}")
 
 @router.get("/strava/sync-intelligent")
-async def sync_activities_intelligent(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def sync_activities_intelligent(db: Session = Depends(get_db), identity: Identity = Depends(get_current_identity)):
     """
     Synchronisation intelligente qui récupère seulement les nouvelles activités
     et met à jour les activités modifiées.
+
+    Bloquante (exécutée dans le pool de threads de FastAPI) : préférer POST /strava/sync-jobs.
     """
     try:
-        print(f"Début de synchronisation intelligente pour l'utilisateur {current_user.id}")
+        print(f"Début de synchronisation intelligente pour l'utilisateur {identity.user.id}")
         
-        athlete_id = get_athlete_id_from_token(db, current_user)
+        athlete_id = get_athlete_id_from_token(identity)
         print(f"Athlete ID récupéré: {athlete_id}")
         
-        token = get_current_token(db, current_user)
+        token = get_current_token(db, identity)
         print(f"Token récupéré: {token[:20]}...")
         
-        headers = {"Authorization": f"Bearer {token}"}
-        
         # Récupération de la date de la dernière activité
         latest_date = get_latest_activity_date(db, athlete_id)
         print(f"Date de la dernière activité: {latest_date}")
         
         # Récupération de la liste des activités depuis Strava
-        url = "https://www.strava.com/api/v3/athlete/activities"
-        resp = make_strava_request_with_retry(url, headers, {"per_page": 200})
+        resp = make_strava_request_with_retry("/athlete/activities", params={"per_page": 200}, access_token=token)
         
         base_activities = resp.json()
         if not isinstance(base_activities, list):
@@ -386,26 +333,11 @@ async def sync_activities_intelligent(db: Session = Depends(get_db), current_use
         print(f"Nombre de nouvelles activités à synchroniser: {len(new_activities)}")
         
         total_new = len(new_activities)
-        successful_syncs = 0
         
-        # Récupération des détails et sauvegarde intelligente
-        for i, act in enumerate(new_activities):
-            activity_id = act.get("id")
-            if not activity_id:
-                continue
-            
-            try:
-                full_data = fetch_full_activity_details(token, activity_id)
-                if full_data:
-                    result = save_activities(db, athlete_id, [full_data])
-                    successful_syncs += result["new_activities"]
-                
-                # Délai réduit entre les requêtes
-                time.sleep(0.2)
-                
-            except Exception as e:
-                print(f"Erreur sur l'activité {i+1}: {str(e)}")
-                continue
+        # Récupération concurrente des détails et sauvegarde intelligente par lots
+        activity_ids = [act["id"] for act in new_activities if act.get("id")]
+        result = save_fetched_activities(db, athlete_id, fetch_activities_details(token, activity_ids))
+        successful_syncs = result["new_activities"]
         
         # Récupération du résumé des activités
         summary = get_activities_summary(db, athlete_id)
@@ -424,21 +356,23 @@ async def sync_activities_intelligent(db: Session = Depends(get_db), current_use
             "message": f"Synchronisation intelligente terminée : {successful_syncs} nouvelles activités ajoutées"
         }
         
+    except StravaRateLimitExceeded as e:
+        raise rate_limit_error(e)
     except Exception as e:
         print(f"Erreur lors de la synchronisation intelligente: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur lors de la synchronisation intelligente : {str(e)}")
 
 @router.get("/strava/stats")
-def get_activities_stats(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def get_activities_stats(db: Session = Depends(get_db), identity: Identity = Depends(get_current_identity)):
     """
     Récupère les statistiques des activités synchronisées.
     """
     try:
-        athlete_id = get_athlete_id_from_token(db, current_user)
+        athlete_id = get_athlete_id_from_token(identity)
         
-        # Récupération des statistiques
+        # Récupération des statistiques (agrégées en base, date la plus récente comprise)
         summary = get_activities_summary(db, athlete_id)
-        latest_date = get_latest_activity_date(db, athlete_id)
+        latest_date = summary["latest_activity"]
         
         return {
             "status": "OK",
@@ -456,12 +390,12 @@ def get_activities_stats(db: Session = Depends(get_db), current_user: User = Dep
         raise HTTPException(status_code=500, detail=f"Erreur lors de la récupération des statistiques : {str(e)}")
 
 @router.get("/strava/recent-activities")
-def get_recent_activities(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def get_recent_activities(db: Session = Depends(get_db), identity: Identity = Depends(get_current_identity)):
     """
     Retrieves the 5 most recent activities of the connected user.
     """
     try:
-        athlete_id = get_athlete_id_from_token(db, current_user)
+        athlete_id = get_athlete_id_from_token(identity)
         
         # Retrieving the 5 most recent activities
         recent_activities = db.query(StravaActivity).filter_by(athlete_id=athlete_id)\
@@ -495,13 +429,13 @@ def get_recent_activities(db: Session = Depends(get_db), current_user: User = De
 def get_activity_heart_rate_zones(
     activity_id: int, 
     db: Session = Depends(get_db), 
-    current_user: User = Depends(get_current_user)
+    identity: Identity = Depends(get_current_identity)
 ):
     """
     Retrieves heart rate zones for a specific activity.
     """
     try:
-        athlete_id = get_athlete_id_from_token(db, current_user)
+        athlete_id = get_athlete_id_from_token(identity)
         
         # Récupération de l'activité
         activity = db.query(StravaActivity).filter_by(
@@ -565,69 +499,32 @@ def get_activity_heart_rate_zones(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving heart rate zones: {str(e)}")
 
-# Import des fonctions FFM centralisées
-from app.utils.ffm import ACWR, courbe_ffm, clean_nan_values
-
 @router.get("/analytics")
-def get_analytics(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    """Récupère les données d'analyse (ACWR et FFM) pour l'utilisateur connecté"""
+def get_analytics(
+    start: Optional[date] = Query(None, description="Premier jour (défaut : 30 jours avant end)"),
+    end: Optional[date] = Query(None, description="Dernier jour (défaut : aujourd'hui, UTC)"),
+    db: Session = Depends(get_db),
+    identity: Identity = Depends(get_current_identity)
+):
+    """
+    Récupère les données d'analyse (ACWR et FFM) de l'utilisateur connecté, par jour,
+    entre start et end (par défaut les 30 derniers jours).
+    Lecture de la charge quotidienne stockée (table training_loads), tenue à jour à la synchronisation.
+    """
+    # Jours en UTC, comme les dates de début d'activité Strava
     try:
-        import pandas as pd
-        import numpy as np
-        from sqlalchemy import text
-        
-        athlete_id = get_athlete_id_from_token(db, current_user)
-        
-        # Récupérer toutes les activités de l'utilisateur pour des calculs précis
-        result = db.execute(text("SELECT start_date, effort_score FROM strava_activities WHERE effort_score IS NOT NULL AND athlete_id = :athlete_id ORDER BY start_date"), {"athlete_id": athlete_id})
-        
-        data = [
-            {"start_date": row[0], "effort_score": row[1]}
-            for row in result
-        ]
-        
-        if not data:
+        start, end = analytics_period(start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        athlete_id = get_athlete_id_from_token(identity)
+
+        loads = get_training_load(db, athlete_id, start, end)
+        if loads.empty:
             return {"error": "Aucune donnée trouvée pour cet utilisateur"}
-        
-        df = pd.DataFrame(data)
-        df['start_date'] = pd.to_datetime(df['start_date'])
-        
-        # Calculer ACWR sur toutes les données
-        df_acwr = ACWR(df)
-        
-        # Calculer FFM sur toutes les données
-        courbe_fatigue, courbe_fitness, courbe_performance, courbe_forme, courbe_rapport, fatigue_pre, fitness_pre = courbe_ffm(df)
-        
-        # Filtrer pour ne garder que les 30 derniers jours
-        date_limite = pd.Timestamp.now() - pd.Timedelta(days=30)
-        df_recent = df[df['start_date'] >= date_limite]
-        df_acwr_recent = df_acwr[df_acwr['start_date'] >= date_limite]
-        
-        # Obtenir les indices des 30 derniers jours pour les courbes FFM
-        recent_indices = df[df['start_date'] >= date_limite].index
-        start_idx = max(0, len(courbe_fatigue) - len(recent_indices))
-        
-        # Préparer les données pour le frontend avec nettoyage des NaN (30 derniers jours seulement)
-        acwr_data = {
-            "dates": df_acwr_recent['start_date'].dt.strftime('%Y-%m-%d').tolist(),
-            "charge_aigue": clean_nan_values(df_acwr_recent['Charge_aigue'].tolist()),
-            "charge_chronique": clean_nan_values(df_acwr_recent['Charge_chronique'].tolist()),
-            "ratio_ac": clean_nan_values(df_acwr_recent['Ratio_AC'].tolist())
-        }
-        
-        ffm_data = {
-            "dates": df_recent['start_date'].dt.strftime('%Y-%m-%d').tolist(),
-            "fatigue": clean_nan_values(courbe_fatigue[start_idx:]),
-            "fitness": clean_nan_values(courbe_fitness[start_idx:]),
-            "performance": clean_nan_values(courbe_performance[start_idx:]),
-            "forme": clean_nan_values(courbe_forme[start_idx:]),
-            "rapport": clean_nan_values(courbe_rapport[start_idx:])
-        }
-        
-        return {
-            "acwr": acwr_data,
-            "ffm": ffm_data
-        }
+
+        return analytics_payload(loads)
         
     except Exception as e:
         return {"error": f"Erreur lors du calcul des analyses: {str(e)}"}
@@ -3,11 +3,12 @@ import glob
 import json
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer_group
 from app.database import get_db
 from app.services.prediction_service import predict_race_time
 from app.models.strava_token import StravaToken
-from app.models.strava_activity import StravaActivity
+from app.models.strava_activity import StravaActivity, STREAMS_GROUP
+from app.utils.activity_streams import encode_streams, load_activity_streams, legacy_payloads
 import time
 
 router = APIRouter(tags=["test"])
@@ -44,18 +45,12 @@ def create_test_activities(athlete_id: int, db: Session = Depends(get_db)):
             average_heartrate=150 + (i * 5),
             max_heartrate=180 + (i * 5),
             calories=300 + (i * 50),
-            # Données JSON pour la prédiction
-            elevation_data=json.dumps({
-                "distance": [0, 1, 2, 3, 4, 5],
-                "altitude": [100, 105, 110, 108, 112, 115]
-            }),
-            pace_data=json.dumps({
-                "time": [0, 300, 600, 900, 1200, 1500],
-                "distance": [0, 1, 2, 3, 4, 5],
-                "velocity": [3.2, 3.1, 3.3, 3.0, 3.4, 3.2]
-            }),
-            heartrate_data=json.dumps({
+            # Streams binaires pour la prédiction
+            streams=encode_streams({
                 "time": [0, 300, 600, 900, 1200, 1500],
+                "distance": [0, 1000, 2000, 3000, 4000, 5000],
+                "altitude": [100, 105, 110, 108, 112, 115],
+                "velocity_smooth": [0.89, 0.86, 0.92, 0.83, 0.94, 0.89],
                 "heartrate": [140, 150, 155, 160, 165, 170]
             })
         )
@@ -76,7 +71,8 @@ def list_activities(athlete_id: int, db: Session = Depends(get_db)):
     """
     Route de test pour lister toutes les activités d'un utilisateur.
     """
-    activities = db.query(StravaActivity).filter_by(athlete_id=athlete_id).all()
+    activities = db.query(StravaActivity).options(undefer_group(STREAMS_GROUP)).filter_by(athlete_id=athlete_id).all()
+    payloads = [legacy_payloads(load_activity_streams(act)) for act in activities]
     return {
         "athlete_id": athlete_id,
         "activities": [
@@ -87,11 +83,11 @@ def list_activities(athlete_id: int, db: Session = Depends(get_db)):
                 "type": act.type,
                 "distance": act.distance,
                 "moving_time": act.moving_time,
-                "has_elevation_data": act.elevation_data is not None,
-                "has_pace_data": act.pace_data is not None,
-                "has_heartrate_data": act.heartrate_data is not None
+                "has_elevation_data": payload["elevation_data"] is not None,
+                "has_pace_data": payload["pace_data"] is not None,
+                "has_heartrate_data": payload["heartrate_data"] is not None
             }
-            for act in activities
+            for act, payload in zip(activities, payloads)
         ]
     }
 
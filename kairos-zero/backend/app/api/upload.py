@@ -5,12 +5,20 @@ de télécharger leurs fichiers GPX d'entraînement pour analyse.
 """
 
 import os
-from fastapi import UploadFile, File, APIRouter, HTTPException, Depends
+import shutil
+import time
+from fastapi import UploadFile, File, APIRouter, HTTPException, Depends, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.services.prediction_service import predict_race_time
-from app.dependencies.auth import get_current_user
-from app.models.user import User
+from app.services.prediction_service import predict_course_async
+from app.services.prediction_executor import PredictionBusyError
+from app.services.course_analysis import CourseAnalysis
+from app.dependencies.auth import get_current_identity
+from app.services.identity_cache import Identity
+from app.utils.strava_auth import get_athlete_id_from_token
+from app.config import GPX_UPLOAD_SAVE
+from app.utils.gpx_tools import parse_gpx_stream
 import logging
 
 # Configuration du logging
@@ -21,55 +29,69 @@ router = APIRouter()
 
 # Chemin de sauvegarde cohérent avec le reste de l'application
 UPLOAD_DIR = "app/data/gpx_uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+if GPX_UPLOAD_SAVE:
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+
+def save_upload_copy(fileobj, filepath: str) -> None:
+    """Copie le fichier uploadé (déjà lu) dans le dossier d'uploads."""
+    fileobj.seek(0)
+    with open(filepath, "wb") as buffer:
+        shutil.copyfileobj(fileobj, buffer)
+
 
 @router.post("/upload-gpx")
 async def upload_gpx_file(
+    response: Response,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    identity: Identity = Depends(get_current_identity)
 ):
     # Vérifier l'extension du fichier
     if not file.filename.endswith('.gpx'):
         raise HTTPException(status_code=400, detail="Type de fichier invalide. Seuls les fichiers .gpx sont acceptés.")
 
-    filepath = os.path.join(UPLOAD_DIR, file.filename)
-    logger.info(f"Tentative de sauvegarde du fichier : {filepath}")
+    filepath = os.path.join(UPLOAD_DIR, file.filename) if GPX_UPLOAD_SAVE else None
+    # Temps de chaque étape de la requête (ms), partagés avec l'analyse du parcours
+    timings = {}
 
     try:
-        # Lire le contenu du fichier
-        content = await file.read()
+        # Analyser le GPX directement depuis le corps de la requête, sans passer par le disque
+        # (dans le pool de threads : le parsing bloquerait la boucle d'événements)
+        start = time.perf_counter()
+        file_size = file.file.seek(0, os.SEEK_END)
+        file.file.seek(0)
+        track = await run_in_threadpool(parse_gpx_stream, file.file)
+        timings["lecture"] = (time.perf_counter() - start) * 1000
+        logger.info(f"Fichier '{file.filename}' lu en mémoire ({file_size} octets, {len(track) if track else 0} points).")
         
-        # Utiliser un buffer pour écrire le fichier
-        with open(filepath, "wb") as buffer:
-            buffer.write(content)
-        
-        file_size = os.path.getsize(filepath)
-        logger.info(f"Fichier '{file.filename}' sauvegardé avec succès ({file_size} octets).")
+        # Copie optionnelle dans le dossier d'uploads
+        if filepath:
+            start = time.perf_counter()
+            await run_in_threadpool(save_upload_copy, file.file, filepath)
+            timings["sauvegarde"] = (time.perf_counter() - start) * 1000
+            logger.info(f"Fichier '{file.filename}' sauvegardé dans {filepath}.")
         
         # Faire la prédiction
         try:
-            logger.info(f"Début de la prédiction pour l'utilisateur {current_user.id}")
+            logger.info(f"Début de la prédiction pour l'utilisateur {identity.user.id}")
             
-            # Récupérer le vrai athlete_id Strava
-            from app.utils.strava_auth import get_athlete_id_from_token
-            athlete_id = get_athlete_id_from_token(db, current_user)
+            # Récupérer le vrai athlete_id Strava (identité en cache)
+            athlete_id = get_athlete_id_from_token(identity)
             logger.info(f"Athlete ID Strava: {athlete_id}")
-            logger.info(f"Fichier GPX: {filepath}")
+            if not track:
+                raise ValueError("Impossible de parser le fichier GPX")
             
-            predicted_time_minutes, total_distance = predict_race_time(filepath, db, athlete_id)
+            # Profil de pente et dénivelé calculés une seule fois pour la prédiction et la réponse
+            course = await run_in_threadpool(CourseAnalysis, track, timings)
             
-            logger.info(f"Prédiction réussie: {predicted_time_minutes} minutes, {total_distance} mètres")
+            # Calcul dans un processus dédié : la boucle d'événements reste disponible
+            predicted_time_minutes, total_distance = await predict_course_async(course, db, athlete_id)
             
-            # Calculer le dénivelé à partir du fichier GPX
-            from app.utils.gpx_tools import parse_gpx, calculate_elevation_stats, calculate_elevation_gain
-            points = parse_gpx(filepath)
-            
-            # Utiliser la fonction améliorée pour un dénivelé plus réaliste
-            elevation_gain = calculate_elevation_gain(points, min_distance=30.0, min_elevation_gain=1.5)
+            logger.info(f"Prédiction réussie: {predicted_time_minutes} minutes, {total_distance} mètres")
             
-            # Calculer aussi les stats complètes pour le debug
-            elevation_stats = calculate_elevation_stats(points)
+            elevation_gain = course.elevation_gain
+            elevation_stats = course.elevation_stats
             
             logger.info(f"Statistiques d'élévation: gain={elevation_gain:.0f}m (lissé), gain_raw={elevation_stats['elevation_gain']:.0f}m (brut), perte={elevation_stats['elevation_loss']:.0f}m, min={elevation_stats['min_elevation']:.0f}m, max={elevation_stats['max_elevation']:.0f}m")
             
@@ -79,21 +101,8 @@ async def upload_gpx_file(
             seconds = int((predicted_time_minutes % 1) * 60)
             predicted_time_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
             
-            # Calculer la difficulté basée sur la distance et le dénivelé
-            difficulty = "Easy"
-            if total_distance > 20000:  # Plus de 20km
-                difficulty = "Difficult"
-            elif total_distance > 10000:  # Plus de 10km
-                difficulty = "Moderate"
-            
-            # Ajuster la difficulté en fonction du dénivelé
-            if elevation_gain > 1000:  # Plus de 1000m de dénivelé
-                difficulty = "Very difficult"
-            elif elevation_gain > 500:  # Plus de 500m de dénivelé
-                if difficulty == "Easy":
-                    difficulty = "Moderate"
-                elif difficulty == "Moderate":
-                    difficulty = "Difficult"
+            # Difficulté basée sur la distance et le dénivelé
+            difficulty = course.difficulty
             
             # Calculer un niveau de confiance basé sur la quantité de données d'entraînement
             confidence = 75  # Valeur par défaut
@@ -125,6 +134,8 @@ async def upload_gpx_file(
                 ]
             
             logger.info(f"Résultats finaux: temps={predicted_time_str}, distance={total_distance}, dénivelé={elevation_gain}, difficulté={difficulty}")
+            logger.info(f"Temps de traitement: {course.timing_summary()}")
+            response.headers["Server-Timing"] = course.server_timing()
             
             return {
                 "message": "GPX file uploaded and analyzed successfully",
@@ -139,6 +150,10 @@ async def upload_gpx_file(
                 "recommendations": recommendations
             }
             
+        except PredictionBusyError as busy:
+            logger.warning(f"Prédiction refusée, file d'attente pleine : {busy}")
+            raise HTTPException(status_code=503, detail=str(busy), headers={"Retry-After": "5"})
+
         except Exception as pred_error:
             logger.error(f"Erreur détaillée lors de la prédiction : {pred_error}")
             logger.error(f"Type d'erreur : {type(pred_error)}")
@@ -154,6 +169,8 @@ async def upload_gpx_file(
                 "error": f"Impossible de générer la prédiction: {str(pred_error)}"
             }
             
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Erreur lors de la sauvegarde du fichier : {e}")
-        raise HTTPException(status_code=500, detail=f"Impossible de sauvegarder le fichier : {e}")
\ No newline at end of file
+        logger.error(f"Erreur lors de la lecture du fichier : {e}")
+        raise HTTPException(status_code=500, detail=f"Impossible de lire le fichier : {e}")
\ No newline at end of file
@@ -14,6 +14,54 @@ import secrets
 STRAVA_CLIENT_ID = os.environ.get("STRAVA_CLIENT_ID", "141778")  # Valeur par défaut pour les tests
 STRAVA_CLIENT_SECRET = os.environ.get("STRAVA_CLIENT_SECRET", "a334c280c5e9cd771d1a4659b58ce9e2cfe183f4")  # Valeur par défaut pour les tests
 
+# Client HTTP Strava
+STRAVA_API_URL = os.environ.get("STRAVA_API_URL", "https://www.strava.com/api/v3")
+STRAVA_OAUTH_URL = os.environ.get("STRAVA_OAUTH_URL", "https://www.strava.com/oauth/token")
+STRAVA_HTTP_TIMEOUT = float(os.environ.get("STRAVA_HTTP_TIMEOUT", "30"))  # secondes
+STRAVA_HTTP_RETRIES = int(os.environ.get("STRAVA_HTTP_RETRIES", "3"))
+
+# Tokens d'accès Strava (voir app/services/strava_tokens.py) : rafraîchis avant usage
+# à moins de MARGIN secondes de leur expiration, en tâche de fond à moins de AHEAD
+# secondes (Strava ne renouvelle un token que dans sa dernière heure)
+STRAVA_TOKEN_REFRESH_MARGIN_SECONDS = int(os.environ.get("STRAVA_TOKEN_REFRESH_MARGIN_SECONDS", "300"))
+STRAVA_TOKEN_REFRESH_AHEAD_SECONDS = int(os.environ.get("STRAVA_TOKEN_REFRESH_AHEAD_SECONDS", "1800"))
+
+# Nombre de récupérations d'activités Strava simultanées pendant une synchronisation
+STRAVA_SYNC_MAX_WORKERS = int(os.environ.get("STRAVA_SYNC_MAX_WORKERS", "4"))
+
+# Synchronisations Strava en tâche de fond (voir app/services/sync_jobs.py) :
+# nombre de synchronisations simultanées par processus, et délai sans nouvelle
+# d'une tâche "running" après lequel elle est considérée abandonnée et reprise
+SYNC_JOB_WORKERS = int(os.environ.get("SYNC_JOB_WORKERS", "2"))
+SYNC_JOB_STALE_SECONDS = int(os.environ.get("SYNC_JOB_STALE_SECONDS", "1200"))
+# Nombre d'activités récupérées sauvegardées ensemble (un upsert et un commit par lot)
+SYNC_SAVE_BATCH_SIZE = int(os.environ.get("SYNC_SAVE_BATCH_SIZE", "20"))
+
+# Prédictions de temps de course (voir app/services/prediction_executor.py) : nombre de
+# processus de calcul (0 : un thread du processus serveur) et nombre de prédictions
+# pouvant attendre un processus libre ; au-delà, l'upload répond 503
+PREDICTION_WORKERS = int(os.environ.get("PREDICTION_WORKERS", str(os.cpu_count() or 1)))
+PREDICTION_QUEUE_DEPTH = int(os.environ.get("PREDICTION_QUEUE_DEPTH", "8"))
+# Records utilisés pour entraîner le modèle de prédiction : meilleurs temps des N derniers
+# jours seulement, pour refléter la forme actuelle (0 : tout l'historique). Sans record
+# sur la période, tout l'historique est utilisé.
+PREDICTION_RECORDS_WINDOW_DAYS = int(os.environ.get("PREDICTION_RECORDS_WINDOW_DAYS", "0"))
+# Tables d'équivalences gardées en mémoire (une par athlète, voir app/services/prediction_table.py)
+PREDICTION_TABLE_CACHE_SIZE = int(os.environ.get("PREDICTION_TABLE_CACHE_SIZE", "1000"))
+# Modèle d'effort mis à jour activité par activité à la synchronisation : réentraînement
+# complet (qui corrige la dérive des mises à jour) au plus tard N jours après le précédent,
+# ou dès que N activités ont été ajoutées depuis
+EFFORT_MODEL_REFIT_DAYS = int(os.environ.get("EFFORT_MODEL_REFIT_DAYS", "30"))
+EFFORT_MODEL_REFIT_ACTIVITIES = int(os.environ.get("EFFORT_MODEL_REFIT_ACTIVITIES", "50"))
+
+# Compression zlib des streams d'activité stockés en base (voir app/utils/activity_streams.py).
+# Désactivée par défaut : PostgreSQL compresse déjà les gros blobs (TOAST) et le
+# chargement reste alors sans copie.
+STREAM_COMPRESSION = os.environ.get("STREAM_COMPRESSION", "false").lower() in ("1", "true", "yes")
+
+# Conserver une copie des GPX uploadés dans app/data/gpx_uploads (l'analyse se fait en mémoire)
+GPX_UPLOAD_SAVE = os.environ.get("GPX_UPLOAD_SAVE", "true").lower() in ("1", "true", "yes")
+
 # URL de redirection selon l'environnement
 ENVIRONMENT = os.environ.get("ENVIRONMENT", "development")
 if ENVIRONMENT == "production":
@@ -26,6 +74,11 @@ SECRET_KEY = os.environ.get("SECRET_KEY", secrets.token_urlsafe(32))
 ALGORITHM = os.environ.get("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.environ.get("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
+# Cache des identités authentifiées (voir app/services/identity_cache.py) :
+# durée de vie d'une entrée (secondes) et nombre maximal d'utilisateurs en cache
+AUTH_CACHE_TTL_SECONDS = float(os.environ.get("AUTH_CACHE_TTL_SECONDS", "60"))
+AUTH_CACHE_MAX_ENTRIES = int(os.environ.get("AUTH_CACHE_MAX_ENTRIES", "10000"))
+
 # Configuration de l'application
 APP_NAME = "PeakFlow Kairos Zero"
 APP_VERSION = "1.0.0" 
\ No newline at end of file
@@ -1,6 +1,8 @@
 """
 Dépendances pour l'authentification.
 Contient les fonctions pour :
+- Récupérer l'identité connectée (utilisateur et athlete_id Strava),
+  en cache pour éviter une requête par appel (app/services/identity_cache.py)
 - Récupérer l'utilisateur connecté
 - Vérifier l'authentification
 - Gérer les permissions
@@ -10,7 +12,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.repositories.user import UserRepository
+from app.services.identity_cache import Identity, get_identity
 from app.utils.auth_utils import get_user_id_from_token
 from app.schemas.auth import TokenData
 
@@ -18,19 +20,20 @@ from app.schemas.auth import TokenData
 security = HTTPBearer()
 
 
-def get_current_user(
+def get_current_identity(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
-):
+) -> Identity:
     """
-    Dépendance pour récupérer l'utilisateur connecté.
+    Dépendance pour récupérer l'identité connectée : utilisateur et athlete_id Strava lié,
+    sans requête tant qu'elle est en cache.
     
     Args:
         credentials: Credentials HTTP (token Bearer)
         db: Session de base de données
         
     Returns:
-        User: Utilisateur connecté
+        Identity: Identité connectée (athlete_id à None sans compte Strava lié)
         
     Raises:
         HTTPException: Si le token est invalide ou l'utilisateur n'existe pas
@@ -45,17 +48,29 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user_repo = UserRepository(db)
-    user = user_repo.get_user_by_id(user_id)
+    identity = get_identity(db, user_id)
     
-    if user is None:
+    if identity is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Utilisateur non trouvé",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    return user
+    return identity
+
+
+def get_current_user(identity: Identity = Depends(get_current_identity)):
+    """
+    Dépendance pour récupérer l'utilisateur connecté.
+    
+    Args:
+        identity: Identité connectée (via get_current_identity)
+        
+    Returns:
+        User: Utilisateur connecté
+    """
+    return identity.user
 
 
 def get_current_active_user(current_user = Depends(get_current_user)):
@@ -98,9 +113,8 @@ def get_optional_user(
         if user_id is None:
             return None
         
-        user_repo = UserRepository(db)
-        user = user_repo.get_user_by_id(user_id)
+        identity = get_identity(db, user_id)
         
-        return user
+        return identity.user if identity else None
     except:
         return None 
\ No newline at end of file
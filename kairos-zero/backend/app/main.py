@@ -7,6 +7,7 @@ Configure et lance le serveur avec :
 - Les gestionnaires d'erreurs
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import predict, strava, test, upload, auth_routes, newsletter
@@ -14,18 +15,41 @@ from app.models.strava_token import Base
 from app.models.strava_activity import Base as ActivityBase
 from app.models.user import Base as UserBase
 from app.models.newsletter import Base as NewsletterBase
+from app.models.athlete_model import Base as AthleteModelBase
+from app.models.sync_job import Base as SyncJobBase
+from app.models.training_load import Base as TrainingLoadBase
+from app.models.best_effort import Base as BestEffortBase
 from app.database import engine
+from app.services.sync_jobs import start_sync_workers, stop_sync_workers
+from app.services.prediction_executor import shutdown_prediction_executor
+from app.services.strava_tokens import strava_token_manager
 
 # Création des tables de la base de données
 Base.metadata.create_all(bind=engine)
 ActivityBase.metadata.create_all(bind=engine)
 UserBase.metadata.create_all(bind=engine)
 NewsletterBase.metadata.create_all(bind=engine)
+AthleteModelBase.metadata.create_all(bind=engine)
+SyncJobBase.metadata.create_all(bind=engine)
+TrainingLoadBase.metadata.create_all(bind=engine)
+BestEffortBase.metadata.create_all(bind=engine)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Reprise des synchronisations Strava interrompues par un redémarrage
+    start_sync_workers()
+    yield
+    stop_sync_workers()
+    shutdown_prediction_executor()
+    strava_token_manager.shutdown()
+
 
 app = FastAPI(
     title="PeakFlow Kairos Zero API",
     description="API for running performance analysis",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configuration CORS
@@ -1,4 +1,8 @@
 from .user import User
 from .strava_token import StravaToken
 from .strava_activity import StravaActivity
-from .newsletter import NewsletterSubscriber 
\ No newline at end of file
+from .newsletter import NewsletterSubscriber
+from .athlete_model import AthleteModel
+from .sync_job import SyncJob
+from .training_load import TrainingLoad
+from .best_effort import BestEffort, BestEffortBackfill
\ No newline at end of file
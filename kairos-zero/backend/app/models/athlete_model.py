@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, Float, String, BigInteger, DateTime, LargeBinary
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class AthleteModel(Base):
+    """
+    Modèle de prédiction entraîné pour un athlète : paramètres du modèle de puissance
+    (optimize_params) et du modèle pente-vitesse (elev_func_ml).
+    Réentraîné seulement lorsque l'ensemble de ses activités change (voir `version`) ;
+    le classifieur d'effort est mis à jour avec les seules nouvelles activités entre deux
+    réentraînements complets (voir update_athlete_model).
+    """
+    __tablename__ = "athlete_models"
+
+    id = Column(Integer, primary_key=True, index=True)
+    athlete_id = Column(BigInteger, unique=True, index=True, nullable=False)
+    version = Column(String, nullable=False)       # Empreinte de l'ensemble d'activités utilisé
+
+    # Modèle de puissance (None si l'athlète n'a aucun record)
+    vm = Column(Float, nullable=True)
+    tc = Column(Float, nullable=True)
+    gamma_s = Column(Float, nullable=True)
+    gamma_l = Column(Float, nullable=True)
+
+    # Modèle pente-vitesse (None si pas assez de données détaillées)
+    k1 = Column(Float, nullable=True)               # Coefficient de montée
+    k2 = Column(Float, nullable=True)               # Coefficient de descente
+    classifier = Column(LargeBinary, nullable=True) # EffortClassifier sérialisé (pickle)
+
+    # Mises à jour incrémentales du classifieur depuis son entraînement complet
+    last_activity_row_id = Column(Integer, nullable=True)   # StravaActivity.id le plus élevé pris en compte
+    fitted_at = Column(DateTime, nullable=True)             # Date du dernier entraînement complet
+    incremental_activities = Column(Integer, nullable=True) # Activités ajoutées depuis
+
+    trained_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<AthleteModel(athlete_id={self.athlete_id}, version='{self.version}')>"
@@ -0,0 +1,44 @@
+from sqlalchemy import Column, Integer, BigInteger, DateTime, Index, UniqueConstraint
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class BestEffort(Base):
+    """
+    Meilleur effort Strava d'une activité sur une distance standard (400m, 1 mile, 5k...),
+    une ligne par activité et distance.
+
+    Copie normalisée de la colonne JSON StravaActivity.best_efforts, remplie à la
+    sauvegarde des activités : les records d'un athlète sont lus par une seule requête
+    MIN(elapsed_s) ... GROUP BY distance_m sur l'index (athlete_id, distance_m, elapsed_s).
+    """
+    __tablename__ = "best_efforts"
+    __table_args__ = (
+        UniqueConstraint("activity_id", "distance_m", name="uq_best_efforts_activity_distance"),
+        Index("ix_best_efforts_athlete_distance", "athlete_id", "distance_m", "elapsed_s"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    athlete_id = Column(BigInteger, nullable=False)
+    activity_id = Column(BigInteger, nullable=False)   # StravaActivity.activity_id
+    distance_m = Column(Integer, nullable=False)       # Distance en mètres (convert_distance_to_meters)
+    elapsed_s = Column(Integer, nullable=False)        # Temps en secondes
+    start_date = Column(DateTime, nullable=True)       # Date de l'activité (records sur une période)
+
+    def __repr__(self):
+        return f"<BestEffort(athlete_id={self.athlete_id}, distance_m={self.distance_m}, elapsed_s={self.elapsed_s})>"
+
+
+class BestEffortBackfill(Base):
+    """
+    Athlètes dont les meilleurs efforts des activités antérieures à la table best_efforts
+    ont été recopiés depuis la colonne JSON (backfill_best_efforts). Les lignes écrites à la
+    sauvegarde d'une nouvelle activité ne disent pas si les anciennes ont été recopiées.
+    """
+    __tablename__ = "best_effort_backfills"
+
+    athlete_id = Column(BigInteger, primary_key=True)
+    completed_at = Column(DateTime, default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<BestEffortBackfill(athlete_id={self.athlete_id}, completed_at={self.completed_at})>"
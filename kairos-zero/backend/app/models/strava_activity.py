@@ -1,8 +1,13 @@
-from sqlalchemy import Column, Integer, Float, String, Text, BigInteger, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, Float, String, Text, BigInteger, DateTime, Boolean, ForeignKey, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from app.database import Base
 
+# Colonnes volumineuses différées : chargées à la première lecture sur l'objet, ou avec la
+# requête via .options(undefer_group(...)) quand on sait en avoir besoin
+STREAMS_GROUP = "streams"   # streams binaires et anciennes colonnes JSON
+DETAILS_GROUP = "details"   # segments et best_efforts (JSON)
+
 
 class StravaActivity(Base):
     __tablename__ = "strava_activities"
@@ -22,12 +27,14 @@ class StravaActivity(Base):
     average_heartrate = Column(Float, nullable=True)
     max_heartrate = Column(Float, nullable=True)
     calories = Column(Float, nullable=True)
-    segments = Column(Text, nullable=True)      # JSON string
-    best_efforts = Column(Text, nullable=True)      # JSON string
-    elevation_data = Column(Text, nullable=True)    # JSON string
-    pace_data = Column(Text, nullable=True)         # JSON string
-    heartrate_data = Column(Text, nullable=True)    # JSON string
-    power_data = Column(Text, nullable=True)        # JSON string
+    segments = deferred(Column(Text, nullable=True), group=DETAILS_GROUP)      # JSON string
+    best_efforts = deferred(Column(Text, nullable=True), group=DETAILS_GROUP)      # JSON string
+    streams = deferred(Column(LargeBinary, nullable=True), group=STREAMS_GROUP)    # Streams binaires (app/utils/activity_streams.py)
+    # Anciennes colonnes JSON, lues seulement pour les activités pas encore migrées
+    elevation_data = deferred(Column(Text, nullable=True), group=STREAMS_GROUP)    # JSON string
+    pace_data = deferred(Column(Text, nullable=True), group=STREAMS_GROUP)         # JSON string
+    heartrate_data = deferred(Column(Text, nullable=True), group=STREAMS_GROUP)    # JSON string
+    power_data = deferred(Column(Text, nullable=True), group=STREAMS_GROUP)        # JSON string
     weighted_average_watts = Column(Float, nullable=True)
     max_watts = Column(Float, nullable=True)
     kilojoules = Column(Float, nullable=True)
@@ -1,7 +1,6 @@
 from sqlalchemy import Column, Integer, String, BigInteger, ForeignKey
 from sqlalchemy.orm import relationship
 from app.database import Base
-import requests
 
 
 class StravaToken(Base):
@@ -22,8 +21,10 @@ def get_athlete_id_from_token(access_token: str) -> int:
     """
     Appelle l'endpoint /athlete pour récupérer l'ID de l'athlète à partir du token d'accès.
     """
-    headers = {"Authorization": f"Bearer {access_token}"}
-    resp = requests.get("https://www.strava.com/api/v3/athlete", headers=headers)
+    # Import local : le modèle est importé très tôt (Alembic, create_all)
+    from app.services.strava_client import strava_client
+
+    resp = strava_client.get("/athlete", access_token=access_token)
     if resp.status_code == 200:
         return resp.json().get("id")
     else:
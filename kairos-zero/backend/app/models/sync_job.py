@@ -0,0 +1,79 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, BigInteger, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy.sql import func
+from app.database import Base
+
+# États d'une synchronisation
+SYNC_JOB_QUEUED = "queued"
+SYNC_JOB_RUNNING = "running"
+SYNC_JOB_COMPLETED = "completed"
+SYNC_JOB_FAILED = "failed"
+SYNC_JOB_CANCELLED = "cancelled"
+
+SYNC_JOB_ACTIVE_STATUSES = (SYNC_JOB_QUEUED, SYNC_JOB_RUNNING)
+
+
+class SyncJob(Base):
+    """
+    Synchronisation Strava exécutée en tâche de fond.
+
+    La liste des activités à récupérer est figée au premier démarrage (activity_ids)
+    et `processed` sert de curseur : après un redémarrage du serveur, la tâche
+    reprend à la première activité non encore sauvegardée.
+    """
+    __tablename__ = "sync_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    athlete_id = Column(BigInteger, nullable=False, index=True)
+    mode = Column(String, nullable=False, default="intelligent")   # "intelligent" (nouvelles activités) ou "full"
+    status = Column(String, nullable=False, default=SYNC_JOB_QUEUED)
+
+    # Renseigné tant que la tâche est active : l'unicité empêche deux synchronisations
+    # simultanées pour un même athlète (plusieurs NULL sont autorisés)
+    active_athlete_id = Column(BigInteger, unique=True, nullable=True)
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+
+    # Avancement
+    activity_ids = Column(Text, nullable=True)       # Liste JSON des activités à récupérer
+    total_activities = Column(Integer, nullable=True)
+    processed = Column(Integer, nullable=False, default=0)
+    last_activity_id = Column(BigInteger, nullable=True)
+    new_activities = Column(Integer, nullable=False, default=0)
+    updated_activities = Column(Integer, nullable=False, default=0)
+    failed_activities = Column(Integer, nullable=False, default=0)
+    message = Column(String, nullable=True)
+    error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, default=func.now(), nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    # Horloge Python (UTC) : comparée à datetime.utcnow() pour détecter les tâches abandonnées
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def to_dict(self) -> dict:
+        progress = 0
+        if self.status == SYNC_JOB_COMPLETED:
+            progress = 100
+        elif self.total_activities:
+            progress = int(self.processed / self.total_activities * 100)
+        return {
+            "id": self.id,
+            "mode": self.mode,
+            "status": self.status,
+            "progress": progress,
+            "total_activities": self.total_activities,
+            "processed": self.processed,
+            "new_activities": self.new_activities,
+            "updated_activities": self.updated_activities,
+            "failed_activities": self.failed_activities,
+            "cancel_requested": self.cancel_requested,
+            "message": self.message,
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+    def __repr__(self):
+        return f"<SyncJob(id={self.id}, athlete_id={self.athlete_id}, status='{self.status}')>"
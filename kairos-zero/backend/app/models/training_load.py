@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, Float, BigInteger, Date, UniqueConstraint
+from app.database import Base
+
+
+class TrainingLoad(Base):
+    """
+    Charge d'entraînement quotidienne d'un athlète (une ligne par jour, jours de repos compris,
+    du premier au dernier jour d'activité).
+
+    Tenue à jour par refresh_training_load lors de la sauvegarde des activités :
+    seuls les jours à partir de la première date modifiée sont recalculés.
+    """
+    __tablename__ = "training_loads"
+    __table_args__ = (UniqueConstraint("athlete_id", "date", name="uq_training_loads_athlete_date"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    athlete_id = Column(BigInteger, nullable=False, index=True)
+    date = Column(Date, nullable=False)
+
+    effort = Column(Float, nullable=False, default=0.0)   # Somme des scores d'effort du jour
+
+    # ACWR (moyennes glissantes sur 7 et 28 jours calendaires)
+    acute_load = Column(Float, nullable=True)
+    chronic_load = Column(Float, nullable=True)
+    acwr = Column(Float, nullable=True)
+
+    # Modèle fitness-fatigue (app/utils/ffm.py)
+    fatigue = Column(Float, nullable=True)
+    fitness = Column(Float, nullable=True)
+    performance = Column(Float, nullable=True)
+    form = Column(Float, nullable=True)
+    ratio = Column(Float, nullable=True)
+
+    # État fitness-fatigue à la fin de la journée, point de départ du recalcul des jours suivants
+    fatigue_state = Column(Float, nullable=False, default=0.0)
+    fitness_state = Column(Float, nullable=False, default=0.0)
+
+    def __repr__(self):
+        return f"<TrainingLoad(athlete_id={self.athlete_id}, date={self.date})>"
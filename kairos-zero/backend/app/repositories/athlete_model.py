@@ -0,0 +1,43 @@
+from typing import Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.athlete_model import AthleteModel
+
+
+def get_athlete_model(db: Session, athlete_id: int) -> Optional[AthleteModel]:
+    """
+    Récupère le modèle de prédiction en cache pour un athlète.
+    """
+    return db.query(AthleteModel).filter_by(athlete_id=athlete_id).first()
+
+
+def upsert_athlete_model(db: Session, athlete_id: int, version: str, **params) -> AthleteModel:
+    """
+    Enregistre (ou remplace) le modèle de prédiction d'un athlète.
+
+    Args:
+        db (Session): Session de base de données
+        athlete_id (int): ID de l'athlète
+        version (str): Empreinte de l'ensemble d'activités ayant servi à l'entraînement
+        **params: Colonnes du modèle (vm, tc, gamma_s, gamma_l, k1, k2, classifier)
+    """
+    model = get_athlete_model(db, athlete_id)
+    if model is None:
+        model = AthleteModel(athlete_id=athlete_id, version=version, **params)
+        db.add(model)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Un entraînement concurrent a créé la ligne entre-temps : on la met à jour
+            db.rollback()
+            model = get_athlete_model(db, athlete_id)
+        else:
+            db.refresh(model)
+            return model
+
+    model.version = version
+    for name, value in params.items():
+        setattr(model, name, value)
+    db.commit()
+    db.refresh(model)
+    return model
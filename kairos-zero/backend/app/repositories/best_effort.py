@@ -0,0 +1,134 @@
+import json
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.best_effort import BestEffort, BestEffortBackfill
+from app.models.strava_activity import StravaActivity
+from app.utils.retrieval_performance import convert_distance_to_meters, format_time
+
+
+def parse_best_efforts(best_efforts) -> Dict[int, int]:
+    """
+    Meilleurs efforts d'une activité par distance, depuis la réponse Strava (liste)
+    ou la colonne JSON StravaActivity.best_efforts.
+
+    Returns:
+        dict: {distance en mètres: temps en secondes} ; efforts sans nom, sans temps
+        ou de distance inconnue ignorés
+    """
+    if isinstance(best_efforts, (str, bytes)):
+        best_efforts = json.loads(best_efforts)
+
+    efforts = {}
+    for effort in best_efforts or []:
+        name = effort.get("name")
+        elapsed_time = effort.get("elapsed_time")
+        if not name or elapsed_time is None:
+            continue
+        distance_m = convert_distance_to_meters(name)
+        if distance_m <= 0:
+            continue
+        elapsed_s = int(elapsed_time)
+        if distance_m not in efforts or elapsed_s < efforts[distance_m]:
+            efforts[distance_m] = elapsed_s
+    return efforts
+
+
+def best_effort_rows(athlete_id: int, activity_id: int, start_date: Optional[datetime], best_efforts) -> List[Dict]:
+    """Lignes best_efforts d'une activité (voir parse_best_efforts)."""
+    return [
+        {"athlete_id": athlete_id, "activity_id": activity_id, "distance_m": distance_m,
+         "elapsed_s": elapsed_s, "start_date": start_date}
+        for distance_m, elapsed_s in parse_best_efforts(best_efforts).items()
+    ]
+
+
+def replace_best_efforts(db: Session, activity_ids: Iterable[int], rows: List[Dict]):
+    """
+    Remplace les meilleurs efforts des activités activity_ids par rows (best_effort_rows),
+    sans commit : appelé dans la transaction qui sauvegarde les activités.
+    """
+    activity_ids = list(activity_ids)
+    if activity_ids:
+        db.query(BestEffort).filter(BestEffort.activity_id.in_(activity_ids)).delete(synchronize_session=False)
+    if rows:
+        db.bulk_insert_mappings(BestEffort, rows)
+
+
+def backfill_best_efforts(db: Session, athlete_id: int) -> int:
+    """
+    Remplit les meilleurs efforts d'un athlète depuis la colonne JSON de ses activités
+    (activités sauvegardées avant l'introduction de la table), et le marque comme
+    rempli (BestEffortBackfill), même s'il n'a aucun meilleur effort.
+
+    Returns:
+        int: Nombre de lignes écrites
+    """
+    activities = db.query(
+        StravaActivity.activity_id, StravaActivity.start_date, StravaActivity.best_efforts
+    ).filter(
+        StravaActivity.athlete_id == athlete_id, StravaActivity.best_efforts.isnot(None)
+    ).all()
+
+    rows = []
+    for activity_id, start_date, best_efforts in activities:
+        try:
+            rows.extend(best_effort_rows(athlete_id, activity_id, start_date, best_efforts))
+        except (ValueError, TypeError, AttributeError) as e:
+            print(f"best_efforts illisibles pour l'activité {activity_id}: {e}")
+
+    replace_best_efforts(db, [activity_id for activity_id, _, _ in activities], rows)
+    db.add(BestEffortBackfill(athlete_id=athlete_id))
+    try:
+        db.commit()
+    except IntegrityError:
+        # Remplissage concurrent déjà terminé : il a écrit les mêmes lignes
+        db.rollback()
+    return len(rows)
+
+
+def get_best_efforts(db: Session, athlete_id: int, since: Optional[datetime] = None) -> Dict[int, int]:
+    """
+    Meilleur temps d'un athlète sur chaque distance, en une requête
+    MIN(elapsed_s) ... GROUP BY distance_m sur l'index (athlete_id, distance_m, elapsed_s).
+    La table est remplie au premier appel pour les activités antérieures à son introduction
+    (une seule fois par athlète, voir BestEffortBackfill).
+
+    Args:
+        since: Seulement les activités commencées à partir de cette date (None : tout l'historique)
+
+    Returns:
+        dict: {distance en mètres: temps en secondes}, par distance croissante
+    """
+    if db.get(BestEffortBackfill, athlete_id) is None:
+        backfill_best_efforts(db, athlete_id)
+
+    query = db.query(BestEffort.distance_m, func.min(BestEffort.elapsed_s)).filter(
+        BestEffort.athlete_id == athlete_id
+    )
+    if since is not None:
+        query = query.filter(BestEffort.start_date >= since)
+    return dict(query.group_by(BestEffort.distance_m).order_by(BestEffort.distance_m).all())
+
+
+def get_running_records(db: Session, athlete_id: int, since: Optional[datetime] = None) -> Dict[str, str]:
+    """
+    Records de course d'un athlète, au format de get_running_records_from_csv.
+
+    Args:
+        since: Records établis à partir de cette date seulement, par exemple sur les
+            12 derniers mois (None : tout l'historique)
+
+    Returns:
+        Dict[str, str]: {"distance_en_mètresm": temps formaté}, ex. {"5000m": "19:42"}
+    """
+    records = {
+        f"{distance_m}m": format_time(elapsed_s)
+        for distance_m, elapsed_s in get_best_efforts(db, athlete_id, since).items()
+    }
+    print(f"Records de l'athlète {athlete_id}{f' depuis le {since:%Y-%m-%d}' if since else ''}: {records}")
+    return records
@@ -1,255 +1,306 @@
-from sqlalchemy.orm import Session
-from app.models.strava_activity import StravaActivity
-from typing import List, Dict
-from datetime import datetime
-import requests
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session, undefer_group
+from app.models.strava_activity import StravaActivity, STREAMS_GROUP
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import date, datetime
 import json
-from app.utils.heart_rate_zones import calculate_heart_rate_zones, calculate_effort_score
+from app.utils.activity_encoder import encode_activity_streams
+from app.services.strava_client import StravaClient, strava_client
+from app.repositories.training_load import refresh_training_load
+from app.repositories.best_effort import best_effort_rows, replace_best_efforts
+from app.config import SYNC_SAVE_BATCH_SIZE
+
+# Nombre d'activités par instruction d'upsert (executemany)
+UPSERT_BATCH_SIZE = 200
+
+# Colonnes écrites par la synchronisation ; athlete_id n'est écrit qu'à la création
+_UPDATED_COLUMNS = [
+    "name", "type", "start_date", "distance", "moving_time", "elapsed_time",
+    "total_elevation_gain", "average_speed", "max_speed", "average_heartrate",
+    "max_heartrate", "calories", "streams", "elevation_data", "pace_data",
+    "heartrate_data", "power_data", "segments", "best_efforts",
+    "zone_1_time", "zone_2_time", "zone_3_time", "zone_4_time", "zone_5_time",
+    "below_zone_1_time", "above_zone_5_time", "effort_score",
+]
+
+
+def _activity_row(athlete_id: int, act: Dict) -> Dict:
+    """
+    Ligne strava_activities d'une activité récupérée (fetch_full_activity_details) :
+    champs Strava, puis streams encodés et métriques dérivées (encode_activity_streams).
+    """
+    activity = act["activity_data"]
+    best_efforts = act.get("best_efforts", [])
+
+    return {
+        "athlete_id": athlete_id,
+        "activity_id": activity["id"],
+        "name": activity.get("name"),
+        "type": activity.get("type"),
+        # Date UTC sans fuseau horaire, comme les dates déjà en base
+        "start_date": datetime.fromisoformat(activity["start_date"].replace("Z", "+00:00")).replace(tzinfo=None),
+        "distance": activity.get("distance"),
+        "moving_time": activity.get("moving_time"),
+        "elapsed_time": activity.get("elapsed_time"),
+        "total_elevation_gain": activity.get("total_elevation_gain"),
+        "average_speed": activity.get("average_speed"),
+        "max_speed": activity.get("max_speed"),
+        "average_heartrate": activity.get("average_heartrate"),
+        "max_heartrate": activity.get("max_heartrate"),
+        "calories": activity.get("calories"),
+        # Anciennes colonnes JSON vidées : les streams sont dans le blob binaire
+        "elevation_data": None,
+        "pace_data": None,
+        "heartrate_data": None,
+        "power_data": None,
+        "best_efforts": json.dumps(best_efforts),
+        # Blob des streams, segments, zones cardiaques et score d'effort
+        **encode_activity_streams(act.get("streams", {})),
+    }
+
+
+def _upsert_rows(db: Session, rows: List[Dict]):
+    """
+    Écrit les lignes par INSERT ... ON CONFLICT (activity_id) DO UPDATE (PostgreSQL, SQLite),
+    par lots de UPSERT_BATCH_SIZE, sans commit.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        # Autres bases : une requête par activité via l'ORM
+        for row in rows:
+            existing = db.query(StravaActivity).filter_by(activity_id=row["activity_id"]).first()
+            if existing is None:
+                db.add(StravaActivity(**row))
+            else:
+                for column in _UPDATED_COLUMNS:
+                    setattr(existing, column, row[column])
+        db.flush()
+        return
+
+    statement = insert(StravaActivity.__table__)
+    statement = statement.on_conflict_do_update(
+        index_elements=[StravaActivity.__table__.c.activity_id],
+        set_={column: statement.excluded[column] for column in _UPDATED_COLUMNS},
+    )
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        db.execute(statement, rows[start:start + UPSERT_BATCH_SIZE])
+
+
+def _save_rows(db: Session, rows: List[Dict], efforts: Dict[int, List[Dict]]):
+    """Upsert des activités et remplacement de leurs meilleurs efforts (table best_efforts), sans commit."""
+    _upsert_rows(db, rows)
+    activity_ids = [row["activity_id"] for row in rows]
+    replace_best_efforts(db, activity_ids, [effort for activity_id in activity_ids for effort in efforts[activity_id]])
+
 
-def save_activities(db: Session, athlete_id: int, activities: List[Dict]):
+def upsert_activities(db: Session, athlete_id: int, activities: List[Dict], update_training_load: bool = True) -> Dict:
     """
-    Sauvegarde intelligente des activités Strava avec gestion des mises à jour.
-    - Vérifie si l'activité existe déjà
-    - Met à jour si l'activité a été modifiée
-    - Ajoute seulement les nouvelles activités
+    Sauvegarde en bloc d'activités Strava récupérées (fetch_full_activity_details).
+    - Une seule requête IN pour retrouver les activités déjà en base
+    - Upsert natif (INSERT ... ON CONFLICT) dans une seule transaction, avec les
+      meilleurs efforts des activités (table best_efforts)
+    - Recalcul de la charge d'entraînement à partir du premier jour touché
+      (update_training_load=False : laissé à l'appelant, via "earliest_date")
+
+    Une activité illisible est comptée dans "failed_activities" sans bloquer les autres ;
+    si l'écriture du lot échoue, les activités sont réécrites une par une.
+
+    Returns:
+        dict: new_activities, updated_activities, failed_activities, total_processed, earliest_date
     """
     print(f"Début de sauvegarde de {len(activities)} activités pour l'athlète {athlete_id}")
-    updated_count = 0
-    new_count = 0
-    
+    rows = {}
+    efforts = {}
+    failed = []
     for act in activities:
-        activity = act["activity_data"]
-        activity_id = activity["id"]
-        streams = act.get("streams", {})
-        best_efforts = act.get("best_efforts", [])
-
-        # Vérifie si l'activité existe déjà en base
-        existing = db.query(StravaActivity).filter_by(activity_id=activity_id).first()
-        
-        if existing:
-            print(f"Activité {activity_id} existe déjà, mise à jour...")
-            # Mise à jour de l'activité existante
-            existing.name = activity.get("name")
-            existing.type = activity.get("type")
-            existing.start_date = datetime.fromisoformat(activity["start_date"].replace("Z", "+00:00"))
-            existing.distance = activity.get("distance")
-            existing.moving_time = activity.get("moving_time")
-            existing.elapsed_time = activity.get("elapsed_time")
-            existing.total_elevation_gain = activity.get("total_elevation_gain")
-            existing.average_speed = activity.get("average_speed")
-            existing.max_speed = activity.get("max_speed")
-            existing.average_heartrate = activity.get("average_heartrate")
-            existing.max_heartrate = activity.get("max_heartrate")
-            existing.calories = activity.get("calories")
-            
-            # Récupération sécurisée des données de streams
-            distance_data = streams.get("distance", {}).get("data", [])
-            time_data = streams.get("time", {}).get("data", [])
-            velocity_data = streams.get("velocity_smooth", {}).get("data", [])
-            altitude_data = streams.get("altitude", {}).get("data", [])
-            heartrate_data = streams.get("heartrate", {}).get("data", [])
-            watts_data = streams.get("watts", {}).get("data", [])
-            cadence_data = streams.get("cadence", {}).get("data", [])
-            segments_data = streams.get("segments", {}).get("data", [])
-
-            # Sérialisation JSON conditionnelle
-            elevation_data = json.dumps({
-                "distance": [d / 1000 for d in distance_data],
-                "altitude": altitude_data
-            }) if distance_data or altitude_data else None
-
-            pace_data = json.dumps({
-                "time": time_data,
-                "distance": [d / 1000 for d in distance_data],
-                "velocity": [round(v * 3.6, 2) if v is not None else None for v in velocity_data]
-            }) if time_data or distance_data or velocity_data else None
-
-            heartrate_json = json.dumps({
-                "time": time_data,
-                "heartrate": heartrate_data
-            }) if time_data or heartrate_data else None
-
-            power_data = json.dumps({
-                "watts": watts_data,
-                "cadence": cadence_data,
-                "time": time_data
-            }) if watts_data or cadence_data else None
-
-            segments_json = json.dumps(segments_data) if segments_data else None
-            
-            existing.elevation_data = elevation_data
-            existing.pace_data = pace_data
-            existing.heartrate_data = heartrate_json
-            existing.segments = segments_json
-            existing.power_data = power_data
-            existing.best_efforts = json.dumps(best_efforts)
-            
-            # Calcul des zones cardiaques et du score d'effort
-            zone_data = None
-            effort_score = 0.0
-            zone_times = {
-                "zone_1_time": 0.0,
-                "zone_2_time": 0.0,
-                "zone_3_time": 0.0,
-                "zone_4_time": 0.0,
-                "zone_5_time": 0.0,
-                "below_zone_1_time": 0.0,
-                "above_zone_5_time": 0.0
-            }
-            
-            if heartrate_json:
-                # Calculer les zones cardiaques
-                zone_data = calculate_heart_rate_zones(heartrate_json)
-                if zone_data and "zones" in zone_data:
-                    # Extraire les temps par zone
-                    for zone_name, zone_info in zone_data["zones"].items():
-                        if zone_name in zone_times:
-                            zone_times[zone_name] = zone_info.get("time_minutes", 0.0)
-                    
-                    # Calculer le score d'effort
-                    effort_score = calculate_effort_score(zone_data)
-
-            # Mise à jour des zones cardiaques et du score
-            existing.zone_1_time = zone_times["zone_1_time"]
-            existing.zone_2_time = zone_times["zone_2_time"]
-            existing.zone_3_time = zone_times["zone_3_time"]
-            existing.zone_4_time = zone_times["zone_4_time"]
-            existing.zone_5_time = zone_times["zone_5_time"]
-            existing.below_zone_1_time = zone_times["below_zone_1_time"]
-            existing.above_zone_5_time = zone_times["above_zone_5_time"]
-            existing.effort_score = effort_score
-            
-            updated_count += 1
-        else:
-            print(f"Nouvelle activité {activity_id} trouvée, création...")
-            # Récupération sécurisée des données de streams
-            distance_data = streams.get("distance", {}).get("data", [])
-            time_data = streams.get("time", {}).get("data", [])
-            velocity_data = streams.get("velocity_smooth", {}).get("data", [])
-            altitude_data = streams.get("altitude", {}).get("data", [])
-            heartrate_data = streams.get("heartrate", {}).get("data", [])
-            watts_data = streams.get("watts", {}).get("data", [])
-            cadence_data = streams.get("cadence", {}).get("data", [])
-            segments_data = streams.get("segments", {}).get("data", [])
-
-            # Sérialisation JSON conditionnelle
-            elevation_data = json.dumps({
-                "distance": [d / 1000 for d in distance_data],
-                "altitude": altitude_data
-            }) if distance_data or altitude_data else None
-
-            pace_data = json.dumps({
-                "time": time_data,
-                "distance": [d / 1000 for d in distance_data],
-                "velocity": [round(v * 3.6, 2) if v is not None else None for v in velocity_data]
-            }) if time_data or distance_data or velocity_data else None
-
-            heartrate_json = json.dumps({
-                "time": time_data,
-                "heartrate": heartrate_data
-            }) if time_data or heartrate_data else None
-
-            power_data = json.dumps({
-                "watts": watts_data,
-                "cadence": cadence_data,
-                "time": time_data
-            }) if watts_data or cadence_data else None
-
-            segments_json = json.dumps(segments_data) if segments_data else None
-
-            # Calcul des zones cardiaques et du score d'effort (ajouté ici)
-            zone_data = None
-            effort_score = 0.0
-            zone_times = {
-                "zone_1_time": 0.0,
-                "zone_2_time": 0.0,
-                "zone_3_time": 0.0,
-                "zone_4_time": 0.0,
-                "zone_5_time": 0.0,
-                "below_zone_1_time": 0.0,
-                "above_zone_5_time": 0.0
-            }
-            if heartrate_json:
-                zone_data = calculate_heart_rate_zones(heartrate_json)
-                if zone_data and "zones" in zone_data:
-                    for zone_name, zone_info in zone_data["zones"].items():
-                        if zone_name in zone_times:
-                            zone_times[zone_name] = zone_info.get("time_minutes", 0.0)
-                    effort_score = calculate_effort_score(zone_data)
-
-            # Création d'une nouvelle activité
-            new_act = StravaActivity(
-                athlete_id=athlete_id,
-                activity_id=activity_id,
-                name=activity.get("name"),
-                type=activity.get("type"),
-                start_date=datetime.fromisoformat(activity["start_date"].replace("Z", "+00:00")),
-                distance=activity.get("distance"),
-                moving_time=activity.get("moving_time"),
-                elapsed_time=activity.get("elapsed_time"),
-                total_elevation_gain=activity.get("total_elevation_gain"),
-                average_speed=activity.get("average_speed"),
-                max_speed=activity.get("max_speed"),
-                average_heartrate=activity.get("average_heartrate"),
-                max_heartrate=activity.get("max_heartrate"),
-                calories=activity.get("calories"),
-                elevation_data=elevation_data,
-                pace_data=pace_data,
-                heartrate_data=heartrate_json,
-                segments=segments_json,
-                power_data=power_data,
-                best_efforts=json.dumps(best_efforts),
-                # Zones cardiaques et score d'effort
-                zone_1_time=zone_times["zone_1_time"],
-                zone_2_time=zone_times["zone_2_time"],
-                zone_3_time=zone_times["zone_3_time"],
-                zone_4_time=zone_times["zone_4_time"],
-                zone_5_time=zone_times["zone_5_time"],
-                below_zone_1_time=zone_times["below_zone_1_time"],
-                above_zone_5_time=zone_times["above_zone_5_time"],
-                effort_score=effort_score
-            )
-            db.add(new_act)
-            new_count += 1
+        try:
+            row = _activity_row(athlete_id, act)
+            activity_efforts = best_effort_rows(athlete_id, row["activity_id"], row["start_date"],
+                                                act.get("best_efforts", []))
+        except Exception as e:
+            activity_id = act.get("activity_data", {}).get("id")
+            print(f"Erreur lors de la préparation de l'activité {activity_id}: {str(e)}")
+            failed.append(activity_id)
+            continue
+        # Dernière version si l'activité apparaît plusieurs fois dans le lot
+        rows[row["activity_id"]] = row
+        efforts[row["activity_id"]] = activity_efforts
+
+    # Activités déjà en base, avec leur ancienne date (la charge de ce jour change aussi)
+    previous_dates = dict(
+        db.query(StravaActivity.activity_id, StravaActivity.start_date)
+        .filter(StravaActivity.activity_id.in_(list(rows)))
+        .all()
+    ) if rows else {}
+
+    try:
+        _save_rows(db, list(rows.values()), efforts)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        if len(rows) <= 1:
+            raise
+        print(f"Erreur lors de la sauvegarde du lot ({str(e)}), sauvegarde activité par activité")
+        for activity_id, row in list(rows.items()):
+            try:
+                _save_rows(db, [row], efforts)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                print(f"Erreur lors de la sauvegarde de l'activité {activity_id}: {str(e)}")
+                failed.append(activity_id)
+                del rows[activity_id]
+
+    updated_count = sum(1 for activity_id in rows if activity_id in previous_dates)
+    new_count = len(rows) - updated_count
+    earliest_date = None
+    for activity_id, row in rows.items():
+        earliest_date = min_date(earliest_date, row["start_date"].date())
+        if previous_dates.get(activity_id) is not None:
+            earliest_date = min_date(earliest_date, previous_dates[activity_id].date())
 
-    db.commit()
     print(f"Sauvegarde terminée: {new_count} nouvelles activités, {updated_count} mises à jour")
-    
+
+    if update_training_load and earliest_date is not None:
+        refresh_training_load(db, athlete_id, earliest_date)
+
     return {
         "new_activities": new_count,
         "updated_activities": updated_count,
-        "total_processed": len(activities)
+        "failed_activities": len(failed),
+        "total_processed": len(activities),
+        "earliest_date": earliest_date
     }
 
 
-def get_activities_for_prediction(db: Session, athlete_id: int):
+def save_activities(db: Session, athlete_id: int, activities: List[Dict], update_training_load: bool = True):
     """
-    Récupère toutes les activités avec données JSON nécessaires à l'entraînement du modèle pente-vitesse.
+    Sauvegarde intelligente des activités Strava avec gestion des mises à jour
+    (ajoute les nouvelles activités, met à jour celles déjà en base).
+    Voir upsert_activities ; lève une exception si aucune activité n'a pu être sauvegardée.
     """
-    return db.query(StravaActivity).filter(
+    result = upsert_activities(db, athlete_id, activities, update_training_load)
+    if result["failed_activities"] and result["failed_activities"] == len(activities):
+        raise ValueError(f"Aucune des {len(activities)} activités n'a pu être sauvegardée")
+    return result
+
+
+def save_fetched_activities(db: Session, athlete_id: int, results: Iterable[Tuple], batch_size: int = SYNC_SAVE_BATCH_SIZE) -> Dict:
+    """
+    Sauvegarde au fil de l'eau les activités renvoyées par fetch_activities_details,
+    par lots de batch_size (upsert_activities), puis recalcule une seule fois la charge
+    d'entraînement à partir du premier jour touché.
+
+    Args:
+        results: Triplets (activity_id, full_data, error)
+
+    Returns:
+        dict: new_activities, updated_activities, failed_activities
+    """
+    totals = {"new_activities": 0, "updated_activities": 0, "failed_activities": 0}
+    earliest_date = None
+    batch = []
+
+    def flush():
+        nonlocal earliest_date
+        # Un lot qui ne peut pas être écrit est compté en échec, sans interrompre les suivants
+        try:
+            result = upsert_activities(db, athlete_id, batch, update_training_load=False)
+        except Exception as e:
+            db.rollback()
+            print(f"Erreur lors de la sauvegarde de {len(batch)} activités: {str(e)}")
+            totals["failed_activities"] += len(batch)
+        else:
+            for key in totals:
+                totals[key] += result[key]
+            earliest_date = min_date(earliest_date, result["earliest_date"])
+        batch.clear()
+
+    try:
+        for activity_id, full_data, error in results:
+            if error:
+                print(f"Erreur sur l'activité {activity_id}: {str(error)}")
+                totals["failed_activities"] += 1
+                continue
+            if full_data:
+                batch.append(full_data)
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+    finally:
+        # Charge d'entraînement recalculée une seule fois, à partir du premier jour touché,
+        # y compris pour les lots déjà sauvegardés si la récupération s'interrompt
+        if earliest_date is not None:
+            refresh_training_load(db, athlete_id, earliest_date)
+    return totals
+
+
+def min_date(current: Optional[date], other: Optional[date]) -> Optional[date]:
+    """Plus ancienne des deux dates (None ignoré) : premier jour de charge à recalculer."""
+    if current is None:
+        return other
+    if other is None:
+        return current
+    return min(current, other)
+
+
+def _prediction_filter(athlete_id: int, after_row_id: Optional[int]):
+    """Activités de l'athlète avec streams (binaires ou anciennes colonnes JSON), après after_row_id."""
+    criteria = [
         StravaActivity.athlete_id == athlete_id,
-        StravaActivity.elevation_data.isnot(None),
-        StravaActivity.pace_data.isnot(None),
-        StravaActivity.heartrate_data.isnot(None)
-    ).all()
+        or_(
+            StravaActivity.streams.isnot(None),
+            and_(
+                StravaActivity.elevation_data.isnot(None),
+                StravaActivity.pace_data.isnot(None),
+                StravaActivity.heartrate_data.isnot(None)
+            )
+        )
+    ]
+    if after_row_id is not None:
+        criteria.append(StravaActivity.id > after_row_id)
+    return and_(*criteria)
 
 
-def fetch_full_activity_details(access_token: str, activity_id: int) -> dict:
+def get_activities_for_prediction(db: Session, athlete_id: int, after_row_id: Optional[int] = None):
+    """
+    Récupère toutes les activités avec les streams nécessaires à l'entraînement du modèle pente-vitesse
+    (streams binaires, ou anciennes colonnes JSON pour les activités pas encore migrées).
+
+    Args:
+        after_row_id: Seulement les activités sauvegardées après celle-ci (StravaActivity.id),
+            pour mettre à jour un modèle déjà entraîné
+    """
+    return db.query(StravaActivity).options(undefer_group(STREAMS_GROUP)).filter(
+        _prediction_filter(athlete_id, after_row_id)
+    ).order_by(StravaActivity.id).all()
+
+
+def count_activities_for_prediction(db: Session, athlete_id: int, after_row_id: Optional[int] = None) -> int:
+    """Nombre d'activités que renverrait get_activities_for_prediction, sans charger leurs streams."""
+    return db.query(func.count(StravaActivity.id)).filter(_prediction_filter(athlete_id, after_row_id)).scalar()
+
+
+def fetch_full_activity_details(access_token: str, activity_id: int, client: StravaClient = strava_client) -> dict:
     """
     Récupère les infos détaillées + best_efforts + streams d'une activité Strava via l'API.
+    Les deux requêtes passent par le client partagé et réutilisent la même connexion.
 
     Args:
         access_token (str): Token d'accès OAuth Strava.
         activity_id (int): ID de l'activité.
+        client (StravaClient): Client HTTP Strava (pool de connexions + limiteur de débit).
 
     Returns:
         dict: Dictionnaire contenant "activity_data", "streams", et "best_efforts".
     """
-    headers = {"Authorization": f"Bearer {access_token}"}
-
     # 1. Détails activité
-    detailed_url = f"https://www.strava.com/api/v3/activities/{activity_id}"
-    resp_detail = requests.get(detailed_url, headers=headers)
+    resp_detail = client.get(f"/activities/{activity_id}", access_token=access_token)
     if resp_detail.status_code != 200:
         print(f"Erreur lors de la récupération des détails de l'activité {activity_id}: {resp_detail.status_code}")
         return {}
@@ -261,10 +312,9 @@ def fetch_full_activity_details(access_token: str, activity_id: int) -> dict:
         "distance", "time", "velocity_smooth", "altitude", "heartrate",
         "watts", "cadence", "segments"
     ]
-    stream_url = f"https://www.strava.com/api/v3/activities/{activity_id}/streams"
-    resp_stream = requests.get(
-        stream_url,
-        headers=headers,
+    resp_stream = client.get(
+        f"/activities/{activity_id}/streams",
+        access_token=access_token,
         params={"keys": ",".join(types), "key_by_type": True}
     )
     
@@ -289,8 +339,7 @@ def get_latest_activity_date(db: Session, athlete_id: int) -> datetime:
     Récupère la date de la plus récente activité pour un athlète.
     Utilisé pour récupérer seulement les nouvelles activités.
     """
-    latest = db.query(StravaActivity).filter_by(athlete_id=athlete_id).order_by(StravaActivity.start_date.desc()).first()
-    return latest.start_date if latest else None
+    return db.query(func.max(StravaActivity.start_date)).filter(StravaActivity.athlete_id == athlete_id).scalar()
 
 
 def get_activity_count(db: Session, athlete_id: int) -> int:
@@ -300,40 +349,49 @@ def get_activity_count(db: Session, athlete_id: int) -> int:
     return db.query(StravaActivity).filter_by(athlete_id=athlete_id).count()
 
 
+def get_activity_set_version(db: Session, athlete_id: int) -> str:
+    """
+    Empreinte de l'ensemble d'activités d'un athlète (nombre + plus grand activity_id).
+    Change dès qu'une activité est ajoutée ou supprimée ; sert à invalider les modèles en cache.
+    """
+    count, last_activity_id = db.query(
+        func.count(StravaActivity.id),
+        func.max(StravaActivity.activity_id)
+    ).filter(StravaActivity.athlete_id == athlete_id).one()
+    return f"{count}:{last_activity_id or 0}"
+
+
 def get_activities_summary(db: Session, athlete_id: int) -> dict:
     """
     Récupère un résumé des activités pour un athlète.
+    Agrégé en base (GROUP BY type) : aucune ligne complète ni stream n'est chargé.
     """
-    activities = db.query(StravaActivity).filter_by(athlete_id=athlete_id).all()
-    
-    if not activities:
-        return {
-            "total_activities": 0,
-            "latest_activity": None,
-            "activity_types": {},
-            "total_distance": 0,
-            "total_time": 0
-        }
-    
-    # Statistiques
+    rows = db.query(
+        StravaActivity.type,
+        func.count(StravaActivity.id),
+        func.sum(StravaActivity.distance),
+        func.sum(StravaActivity.moving_time),
+        func.max(StravaActivity.start_date)
+    ).filter(StravaActivity.athlete_id == athlete_id).group_by(StravaActivity.type).all()
+
     activity_types = {}
     total_distance = 0
     total_time = 0
-    
-    for activity in activities:
+    latest_activity = None
+    for activity_type, count, distance, moving_time, latest in rows:
         # Types d'activités
-        activity_type = activity.type or "Unknown"
-        activity_types[activity_type] = activity_types.get(activity_type, 0) + 1
-        
+        activity_type = activity_type or "Unknown"
+        activity_types[activity_type] = activity_types.get(activity_type, 0) + count
+
         # Distance et temps
-        if activity.distance:
-            total_distance += activity.distance
-        if activity.moving_time:
-            total_time += activity.moving_time
-    
+        total_distance += distance or 0
+        total_time += moving_time or 0
+        if latest is not None and (latest_activity is None or latest > latest_activity):
+            latest_activity = latest
+
     return {
-        "total_activities": len(activities),
-        "latest_activity": max(act.start_date for act in activities),
+        "total_activities": sum(activity_types.values()),
+        "latest_activity": latest_activity,
         "activity_types": activity_types,
         "total_distance": total_distance,
         "total_time": total_time
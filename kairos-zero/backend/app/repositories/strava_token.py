@@ -1,5 +1,7 @@
 from sqlalchemy.orm import Session
 from app.models.strava_token import StravaToken
+from app.services.identity_cache import invalidate_identity
+from app.services.strava_tokens import strava_token_manager
 
 def upsert_strava_token(db: Session, athlete_id: int, access_token: str, refresh_token: str, expires_at: int):
     token = db.query(StravaToken).filter_by(athlete_id=athlete_id).first()
@@ -17,4 +19,6 @@ def upsert_strava_token(db: Session, athlete_id: int, access_token: str, refresh
         db.add(token)
     db.commit()
     db.refresh(token)
+    invalidate_identity(token.user_id)
+    strava_token_manager.forget(token.user_id)
     return token
\ No newline at end of file
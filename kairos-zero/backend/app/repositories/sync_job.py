@@ -0,0 +1,138 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.sync_job import (
+    SyncJob,
+    SYNC_JOB_QUEUED,
+    SYNC_JOB_RUNNING,
+    SYNC_JOB_CANCELLED,
+    SYNC_JOB_ACTIVE_STATUSES,
+)
+
+
+def get_sync_job(db: Session, job_id: int, user_id: Optional[int] = None) -> Optional[SyncJob]:
+    """
+    Récupère une synchronisation (limitée à un utilisateur si user_id est fourni).
+    """
+    query = db.query(SyncJob).filter(SyncJob.id == job_id)
+    if user_id is not None:
+        query = query.filter(SyncJob.user_id == user_id)
+    return query.first()
+
+
+def get_active_sync_job(db: Session, athlete_id: int) -> Optional[SyncJob]:
+    """
+    Récupère la synchronisation en attente ou en cours d'un athlète.
+    """
+    return db.query(SyncJob).filter(SyncJob.active_athlete_id == athlete_id).first()
+
+
+def create_sync_job(db: Session, user_id: int, athlete_id: int, mode: str = "intelligent") -> Tuple[SyncJob, bool]:
+    """
+    Crée une synchronisation, sauf si l'athlète en a déjà une active.
+
+    Returns:
+        tuple: (synchronisation, True si elle vient d'être créée, False si c'est la synchronisation déjà active)
+    """
+    existing = get_active_sync_job(db, athlete_id)
+    if existing is not None:
+        return existing, False
+
+    job = SyncJob(user_id=user_id, athlete_id=athlete_id, mode=mode,
+                  status=SYNC_JOB_QUEUED, active_athlete_id=athlete_id)
+    db.add(job)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Une autre requête a créé la synchronisation entre-temps
+        db.rollback()
+        existing = get_active_sync_job(db, athlete_id)
+        if existing is None:
+            raise
+        return existing, False
+    db.refresh(job)
+    return job, True
+
+
+def claim_sync_job(db: Session, job_id: int) -> Optional[SyncJob]:
+    """
+    Passe une synchronisation en attente à l'état "running".
+    La mise à jour est conditionnelle : un seul worker peut la réclamer.
+
+    Returns:
+        SyncJob, ou None si la synchronisation n'est plus en attente
+    """
+    now = datetime.utcnow()
+    claimed = db.query(SyncJob).filter(
+        SyncJob.id == job_id, SyncJob.status == SYNC_JOB_QUEUED
+    ).update({
+        SyncJob.status: SYNC_JOB_RUNNING,
+        SyncJob.started_at: now,
+        SyncJob.updated_at: now,
+    }, synchronize_session=False)
+    db.commit()
+    if not claimed:
+        return None
+    return get_sync_job(db, job_id)
+
+
+def finish_sync_job(db: Session, job: SyncJob, status: str, message: str = None, error: str = None) -> SyncJob:
+    """
+    Termine une synchronisation (completed, failed ou cancelled) et libère l'athlète.
+    """
+    job.status = status
+    job.active_athlete_id = None
+    job.finished_at = datetime.utcnow()
+    if message is not None:
+        job.message = message
+    if error is not None:
+        job.error = error
+    db.commit()
+    return job
+
+
+def release_sync_job(db: Session, job: SyncJob) -> SyncJob:
+    """
+    Remet une synchronisation en cours en attente (arrêt du worker), sans perdre son avancement.
+    """
+    job.status = SYNC_JOB_QUEUED
+    db.commit()
+    return job
+
+
+def request_sync_job_cancel(db: Session, job: SyncJob) -> SyncJob:
+    """
+    Demande l'annulation d'une synchronisation.
+    Une synchronisation en attente est annulée immédiatement ; une synchronisation
+    en cours s'arrête après l'activité en train d'être sauvegardée.
+    """
+    if job.status not in SYNC_JOB_ACTIVE_STATUSES:
+        return job
+    if job.status == SYNC_JOB_QUEUED:
+        return finish_sync_job(db, job, SYNC_JOB_CANCELLED, message="Synchronisation annulée")
+    job.cancel_requested = True
+    db.commit()
+    return job
+
+
+def is_sync_job_cancel_requested(db: Session, job_id: int) -> bool:
+    """
+    Relit le drapeau d'annulation en base (positionné par une autre requête).
+    """
+    return bool(db.query(SyncJob.cancel_requested).filter(SyncJob.id == job_id).scalar())
+
+
+def requeue_stale_sync_jobs(db: Session, stale_before: datetime) -> List[int]:
+    """
+    Remet en attente les synchronisations "running" sans nouvelle depuis stale_before
+    (serveur redémarré ou worker perdu).
+
+    Returns:
+        Liste des identifiants des synchronisations en attente, à relancer
+    """
+    db.query(SyncJob).filter(
+        SyncJob.status == SYNC_JOB_RUNNING, SyncJob.updated_at < stale_before
+    ).update({SyncJob.status: SYNC_JOB_QUEUED}, synchronize_session=False)
+    db.commit()
+    return [job_id for (job_id,) in db.query(SyncJob.id).filter(SyncJob.status == SYNC_JOB_QUEUED).order_by(SyncJob.id)]
@@ -0,0 +1,196 @@
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
+
+import pandas as pd
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session
+
+from app.models.strava_activity import StravaActivity
+from app.models.training_load import TrainingLoad
+from app.utils.training_load import (
+    ACWR_ROLLING,
+    ANALYTICS_MAX_DAYS,
+    CHRONIC_DAYS,
+    acwr_table,
+    compute_training_load,
+    daily_efforts,
+    daily_efforts_by_athlete,
+    window_start,
+)
+
+TRAINING_LOAD_COLUMNS = [
+    "effort", "acute_load", "chronic_load", "acwr", "fatigue", "fitness",
+    "performance", "form", "ratio", "fatigue_state", "fitness_state",
+]
+# Jours de repos prolongés en mémoire au plus après la dernière activité
+MAX_EXTENSION_DAYS = ANALYTICS_MAX_DAYS
+
+
+def _activity_days(db: Session, athlete_id: int):
+    """Premier et dernier jour d'activité avec un score d'effort."""
+    first, last = db.query(
+        func.min(StravaActivity.start_date), func.max(StravaActivity.start_date)
+    ).filter(
+        StravaActivity.athlete_id == athlete_id, StravaActivity.effort_score.isnot(None)
+    ).one()
+    if first is None:
+        return None, None
+    return first.date(), last.date()
+
+
+def refresh_training_load(db: Session, athlete_id: int, from_date: Optional[date] = None) -> int:
+    """
+    Recalcule la charge d'entraînement d'un athlète à partir de from_date (inclus).
+    Les jours précédents ne changent pas : le calcul reprend à partir de l'état
+    fitness-fatigue de la veille stocké en base.
+
+    Args:
+        from_date: Premier jour touché par un ajout ou une modification d'activité
+            (None : recalcul complet)
+
+    Returns:
+        int: Nombre de jours recalculés
+    """
+    first_day, last_day = _activity_days(db, athlete_id)
+    if first_day is None:
+        db.query(TrainingLoad).filter(TrainingLoad.athlete_id == athlete_id).delete(synchronize_session=False)
+        db.commit()
+        return 0
+
+    previous = None
+    if from_date is not None and from_date > first_day:
+        previous = db.query(TrainingLoad).filter(
+            TrainingLoad.athlete_id == athlete_id, TrainingLoad.date < from_date
+        ).order_by(TrainingLoad.date.desc()).first()
+
+    if previous is None:
+        # Pas d'état antérieur : recalcul depuis le premier jour d'activité
+        start, fatigue_state, fitness_state = first_day, 0.0, 0.0
+    else:
+        # Reprise au lendemain du dernier jour stocké (comble un éventuel trou)
+        start = previous.date + timedelta(days=1)
+        fatigue_state, fitness_state = previous.fatigue_state, previous.fitness_state
+
+    # Lignes recalculées, et celles au-delà du dernier jour d'activité (activité supprimée ou déplacée)
+    stale = db.query(TrainingLoad).filter(TrainingLoad.athlete_id == athlete_id)
+    if previous is not None:
+        stale = stale.filter(TrainingLoad.date >= min(start, last_day + timedelta(days=1)))
+    stale.delete(synchronize_session=False)
+
+    if start > last_day:
+        db.commit()
+        return 0
+
+    first_needed = window_start(start, first_day)
+    activities = db.query(StravaActivity.start_date, StravaActivity.effort_score).filter(
+        StravaActivity.athlete_id == athlete_id,
+        StravaActivity.effort_score.isnot(None),
+        StravaActivity.start_date >= datetime.combine(first_needed, time.min),
+    ).all()
+
+    efforts = daily_efforts(activities, first_needed, last_day)
+    loads = compute_training_load(efforts, start, fatigue_state, fitness_state)
+
+    # NaN (ratio indéfini) stocké en NULL
+    records = loads.astype(object).where(loads.notna(), None).to_dict("records")
+    db.bulk_insert_mappings(TrainingLoad, [
+        {"athlete_id": athlete_id, "date": day.date(), **values}
+        for day, values in zip(loads.index, records)
+    ])
+    db.commit()
+    return len(loads)
+
+
+def get_training_load(db: Session, athlete_id: int, start: date, end: date) -> pd.DataFrame:
+    """
+    Charge d'entraînement quotidienne d'un athlète entre start et end (inclus).
+
+    Lecture indexée de la table training_loads ; les jours de repos après la dernière
+    activité sont prolongés en mémoire (effort nul) jusqu'à end, sur MAX_EXTENSION_DAYS
+    jours au plus (la charge est alors retombée à zéro ; les jours suivants sont omis).
+    La table est remplie au premier appel pour les activités antérieures à son introduction.
+
+    Returns:
+        DataFrame indexé par jour (colonnes TRAINING_LOAD_COLUMNS), vide si l'athlète n'a aucune activité
+    """
+    last_stored = db.query(func.max(TrainingLoad.date)).filter(TrainingLoad.athlete_id == athlete_id).scalar()
+    if last_stored is None:
+        if not refresh_training_load(db, athlete_id):
+            return pd.DataFrame(columns=TRAINING_LOAD_COLUMNS)
+        last_stored = db.query(func.max(TrainingLoad.date)).filter(TrainingLoad.athlete_id == athlete_id).scalar()
+
+    end = min(end, last_stored + timedelta(days=MAX_EXTENSION_DAYS))
+    # Lignes stockées, plus les CHRONIC_DAYS - 1 jours précédents si la période doit être prolongée
+    read_from = start
+    if end > last_stored:
+        read_from = min(start, last_stored - timedelta(days=CHRONIC_DAYS - 1))
+    rows = db.query(TrainingLoad).filter(
+        TrainingLoad.athlete_id == athlete_id,
+        TrainingLoad.date >= read_from,
+        TrainingLoad.date <= end,
+    ).order_by(TrainingLoad.date).all()
+
+    loads = pd.DataFrame(
+        [[getattr(row, column) for column in TRAINING_LOAD_COLUMNS] for row in rows],
+        index=pd.DatetimeIndex([row.date for row in rows]),
+        columns=TRAINING_LOAD_COLUMNS,
+        dtype=float,
+    )
+
+    if end > last_stored and rows:
+        first_day = rows[0].date
+        efforts = loads["effort"].reindex(pd.date_range(first_day, end, freq="D"), fill_value=0.0)
+        last = rows[-1]
+        extension = compute_training_load(efforts, last_stored + timedelta(days=1),
+                                          last.fatigue_state, last.fitness_state)
+        loads = pd.concat([loads, extension])
+
+    return loads[loads.index >= pd.Timestamp(start)]
+
+
+def get_athletes_acwr(db: Session, athlete_ids: List[int], start: date, end: date,
+                      method: str = ACWR_ROLLING) -> pd.DataFrame:
+    """
+    ACWR calendaire de plusieurs athlètes entre start et end (inclus), pour les tableaux de bord.
+    Les sommes quotidiennes sont agrégées en base par une seule requête groupée
+    (athlète, jour), puis tous les athlètes sont calculés ensemble.
+
+    Args:
+        method: "rolling" (fenêtres de 7 et 28 jours) ou "ewma" (moyennes exponentielles,
+            calculées sur tout l'historique)
+
+    Returns:
+        DataFrame athlete_id, date, effort, acute_load, chronic_load, acwr
+        (un athlète sans activité avant end n'apparaît pas)
+    """
+    columns = ["athlete_id", "date", "effort", "acute_load", "chronic_load", "acwr"]
+    if not athlete_ids:
+        return pd.DataFrame(columns=columns)
+
+    scored = and_(
+        StravaActivity.athlete_id.in_(athlete_ids),
+        StravaActivity.effort_score.isnot(None),
+        StravaActivity.start_date < datetime.combine(end + timedelta(days=1), time.min),
+    )
+    first_days = pd.Series(dict(
+        db.query(StravaActivity.athlete_id, func.min(StravaActivity.start_date))
+        .filter(scored).group_by(StravaActivity.athlete_id).all()
+    ), dtype="datetime64[ns]")
+    if first_days.empty:
+        return pd.DataFrame(columns=columns)
+
+    # Historique nécessaire : la fenêtre chronique pour "rolling", tout l'historique pour "ewma"
+    read_from = first_days.min().date()
+    if method == ACWR_ROLLING:
+        read_from = max(read_from, start - timedelta(days=CHRONIC_DAYS - 1))
+
+    day = func.date(StravaActivity.start_date)
+    daily = pd.DataFrame(
+        db.query(StravaActivity.athlete_id, day, func.sum(StravaActivity.effort_score))
+        .filter(scored, StravaActivity.start_date >= datetime.combine(read_from, time.min))
+        .group_by(StravaActivity.athlete_id, day).all(),
+        columns=["athlete_id", "day", "effort"],
+    )
+
+    efforts = daily_efforts_by_athlete(daily, read_from, end, first_days)
+    return acwr_table(efforts, start, method)
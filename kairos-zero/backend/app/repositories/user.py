@@ -8,6 +8,8 @@ from sqlalchemy.exc import IntegrityError
 from typing import Optional, List
 from app.models.user import User
 from app.utils.auth_utils import get_password_hash, verify_password
+from app.services.identity_cache import invalidate_identity
+from app.services.strava_tokens import strava_token_manager
 from datetime import datetime
 
 
@@ -117,6 +119,7 @@ class UserRepository:
         user.updated_at = datetime.utcnow()
         self.db.commit()
         self.db.refresh(user)
+        invalidate_identity(user_id)
         return user
     
     def link_strava_token(self, user_id: int, strava_token_id: int) -> bool:
@@ -138,8 +141,13 @@ class UserRepository:
         if not user or not strava_token:
             return False
         
+        previous_user_id = strava_token.user_id
         strava_token.user_id = user_id
         self.db.commit()
+        # Le token d'accès en mémoire appartient peut-être à un autre athlète Strava
+        for changed_user_id in {user_id, previous_user_id}:
+            invalidate_identity(changed_user_id)
+            strava_token_manager.forget(changed_user_id)
         return True
     
     def get_all_users(self) -> List[User]:
@@ -167,4 +175,6 @@ class UserRepository:
         
         self.db.delete(user)
         self.db.commit()
+        invalidate_identity(user_id)
+        strava_token_manager.forget(user_id)
         return True 
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""
+Analyse d'un parcours GPX, calculée une seule fois par upload.
+Regroupe :
+- La trace parsée (GPXTrack)
+- Le profil distance / pente utilisé par la prédiction
+- Les statistiques d'élévation et la difficulté affichées dans la réponse
+- Le détail des temps de traitement de la requête
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from app.utils.gpx_tools import (
+    GPXTrack,
+    track_elevation_gain,
+    track_elevation_stats,
+    track_slope_profile,
+)
+
+
+class CourseAnalysis:
+    """
+    Parcours analysé : trace, profil de pente et statistiques d'élévation.
+
+    Attributes:
+        track: Trace GPX en tableaux NumPy
+        distances: Distances cumulées en mètres (N,)
+        slopes: Pentes en % (N-1,)
+        total_distance: Distance totale en mètres
+        elevation_gain: Dénivelé positif retenu pour l'affichage (ancres 30 m, seuil 1.5 m)
+        elevation_stats: Statistiques brutes (gain, perte, min, max)
+        timings: Durée de chaque étape de la requête, en millisecondes
+    """
+
+    def __init__(self, track: GPXTrack, timings: Optional[Dict[str, float]] = None):
+        self.track = track
+        self.timings = timings if timings is not None else {}
+
+        with self.step("profil"):
+            self.distances, self.slopes = track_slope_profile(track)
+            self.total_distance = float(self.distances[-1])
+
+        with self.step("denivele"):
+            self.elevation_gain = track_elevation_gain(track, min_distance=30.0, min_elevation_gain=1.5)
+            self.elevation_stats = track_elevation_stats(track)
+
+    @contextmanager
+    def step(self, name: str):
+        """Chronomètre une étape et l'ajoute à timings (cumulé si l'étape se répète)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    @property
+    def difficulty(self) -> str:
+        return course_difficulty(self.total_distance, self.elevation_gain)
+
+    def timing_summary(self) -> str:
+        """Résumé lisible des temps de traitement, ex. 'lecture=12.3ms profil=4.1ms ... total=...'."""
+        parts = [f"{name}={duration:.1f}ms" for name, duration in self.timings.items()]
+        parts.append(f"total={sum(self.timings.values()):.1f}ms")
+        return " ".join(parts)
+
+    def server_timing(self) -> str:
+        """Valeur de l'en-tête HTTP Server-Timing (visible dans les outils de développement du navigateur)."""
+        return ", ".join(f"{name};dur={duration:.1f}" for name, duration in self.timings.items())
+
+
+def course_difficulty(total_distance: float, elevation_gain: float) -> str:
+    """
+    Difficulté du parcours à partir de la distance (m) et du dénivelé positif (m).
+    """
+    difficulty = "Easy"
+    if total_distance > 20000:  # Plus de 20km
+        difficulty = "Difficult"
+    elif total_distance > 10000:  # Plus de 10km
+        difficulty = "Moderate"
+
+    # Ajuster la difficulté en fonction du dénivelé
+    if elevation_gain > 1000:  # Plus de 1000m de dénivelé
+        difficulty = "Very difficult"
+    elif elevation_gain > 500:  # Plus de 500m de dénivelé
+        if difficulty == "Easy":
+            difficulty = "Moderate"
+        elif difficulty == "Moderate":
+            difficulty = "Difficult"
+
+    return difficulty
@@ -0,0 +1,98 @@
+"""
+Cache des identités authentifiées.
+Gère :
+- L'utilisateur et l'athlete_id Strava lié, par user_id,
+  chargés en une seule requête au premier appel
+- Une durée de vie courte (AUTH_CACHE_TTL_SECONDS) : le cache est propre à chaque
+  processus, la durée de vie borne le décalage avec les modifications faites ailleurs
+- L'invalidation à la mise à jour du profil, à la liaison et au rafraîchissement du token
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.config import AUTH_CACHE_TTL_SECONDS, AUTH_CACHE_MAX_ENTRIES
+from app.models.strava_token import StravaToken
+from app.models.user import User
+
+_USER_COLUMNS = [attribute.key for attribute in User.__mapper__.column_attrs]
+
+# user_id -> (instant d'expiration, colonnes de l'utilisateur, athlete_id)
+_entries = OrderedDict()
+_lock = threading.Lock()
+# Incrémenté à chaque invalidation : une lecture commencée avant n'est pas mise en cache
+_generation = 0
+
+
+@dataclass(frozen=True)
+class Identity:
+    """Utilisateur connecté et athlete_id Strava lié (None sans compte lié)."""
+    user: User
+    athlete_id: Optional[int]
+
+
+def get_identity(db: Session, user_id: int) -> Optional[Identity]:
+    """
+    Identité d'un utilisateur, depuis le cache ou la base.
+    L'utilisateur renvoyé est attaché à la session db (sans requête si l'identité est en cache).
+
+    Returns:
+        Identity: ou None si l'utilisateur n'existe pas
+    """
+    now = time.monotonic()
+    with _lock:
+        entry = _entries.get(user_id)
+        if entry is not None and entry[0] <= now:
+            del _entries[user_id]
+            entry = None
+        generation = _generation
+
+    if entry is not None:
+        _, values, athlete_id = entry
+        return Identity(_attach(db, values), athlete_id)
+
+    row = db.query(User, StravaToken.athlete_id).outerjoin(
+        StravaToken, StravaToken.user_id == User.id
+    ).filter(User.id == user_id).first()
+    if row is None:
+        return None
+
+    user, athlete_id = row
+    values = {name: getattr(user, name) for name in _USER_COLUMNS}
+    with _lock:
+        if generation == _generation:
+            _entries[user_id] = (now + AUTH_CACHE_TTL_SECONDS, values, athlete_id)
+            _entries.move_to_end(user_id)
+            while len(_entries) > AUTH_CACHE_MAX_ENTRIES:
+                _entries.popitem(last=False)
+    return Identity(user, athlete_id)
+
+
+def _attach(db: Session, values: dict) -> User:
+    """Utilisateur reconstruit depuis le cache et rattaché à la session, sans requête."""
+    user = User(**values)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
+def invalidate_identity(user_id: Optional[int]):
+    """Retire un utilisateur du cache (profil modifié, token Strava lié ou rafraîchi)."""
+    global _generation
+    if user_id is None:
+        return
+    with _lock:
+        _generation += 1
+        _entries.pop(user_id, None)
+
+
+def clear_identity_cache():
+    """Vide le cache."""
+    global _generation
+    with _lock:
+        _generation += 1
+        _entries.clear()
@@ -0,0 +1,79 @@
+"""
+Exécution des prédictions de temps de course hors de la boucle d'événements.
+Gère :
+- Un pool de processus de calcul (KMeans, L-BFGS-B et pandas ne bloquent plus le serveur)
+- Des entrées sérialisables : profil du parcours en tableaux NumPy, paramètres du
+  modèle en cache ou données d'entraînement de l'athlète
+- Une file d'attente bornée : au-delà, PredictionBusyError (503 côté API)
+- La reconstruction du pool si un processus de calcul meurt
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from app.config import PREDICTION_WORKERS, PREDICTION_QUEUE_DEPTH
+
+_executor = None
+_lock = threading.Lock()
+# Prédictions en cours ou en attente d'un processus libre
+_slots = threading.BoundedSemaphore(max(1, PREDICTION_WORKERS) + max(0, PREDICTION_QUEUE_DEPTH))
+
+
+class PredictionBusyError(Exception):
+    """Tous les processus de calcul sont occupés et la file d'attente est pleine."""
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            if PREDICTION_WORKERS > 0:
+                # "spawn" : pas de fork d'un serveur multi-threadé (pool de connexions, threads de synchronisation)
+                _executor = ProcessPoolExecutor(max_workers=PREDICTION_WORKERS,
+                                                mp_context=multiprocessing.get_context("spawn"))
+            else:
+                _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prediction")
+        return _executor
+
+
+def _reset_executor(executor):
+    """Abandonne un pool cassé (processus de calcul tué) ; le suivant est créé à la demande."""
+    global _executor
+    with _lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_prediction(fn, *args):
+    """
+    Exécute fn(*args) dans un processus de calcul et attend son résultat sans bloquer
+    la boucle d'événements. fn et ses arguments doivent être sérialisables (pickle).
+
+    Raises:
+        PredictionBusyError: si la file d'attente est pleine (aucune attente)
+    """
+    if not _slots.acquire(blocking=False):
+        raise PredictionBusyError("Trop de prédictions en cours, réessayez dans quelques instants")
+    try:
+        executor = _get_executor()
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            _reset_executor(executor)
+            raise
+    finally:
+        _slots.release()
+
+
+def shutdown_prediction_executor():
+    """Arrêt de l'application : termine les processus de calcul."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -13,25 +13,347 @@ Utilise les modèles de prédiction de vitesse et de temps.
 """
 
 import os
-import json
-from app.utils.gpx_tools import parse_gpx, calculate_slope_profile
-from app.utils.predict_elev import elev_func_ml   
-from app.utils.model_time_pred import predicted_time, optimize_params, time_to_minutes
+import pickle
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Union
+from app.utils.gpx_tools import GPXTrack, parse_gpx_track
+from app.utils.predict_elev import elev_func_ml, slope_coefficients
+from app.utils.model_time_pred import predicted_time, optimize_params, time_to_minutes, course_time
 from app.utils.retrieval_performance import get_running_records_from_csv
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
 from sqlalchemy.orm import Session
-from app.utils.retrieval_performance import get_running_records_from_db
-from app.repositories.strava_activity import get_activities_for_prediction
+from app.repositories.best_effort import get_running_records
+from app.repositories.strava_activity import (
+    count_activities_for_prediction,
+    get_activities_for_prediction,
+    get_activity_set_version,
+)
+from app.repositories.athlete_model import get_athlete_model, upsert_athlete_model
+from app.models.athlete_model import AthleteModel
+from app.utils.activity_streams import load_activity_streams, legacy_payloads
+from app.services.course_analysis import CourseAnalysis
+from app.services.prediction_executor import run_prediction
+from app.config import PREDICTION_RECORDS_WINDOW_DAYS, EFFORT_MODEL_REFIT_DAYS, EFFORT_MODEL_REFIT_ACTIVITIES
+from fastapi.concurrency import run_in_threadpool
 
 
-def predict_race_time(gpx_path: str, db: Session, athlete_id: int) -> tuple:
+# Incrémenté quand l'entraînement change, pour invalider les modèles déjà en cache
+ATHLETE_MODEL_FORMAT = 1
+
+
+# Paramètres du modèle d'un athlète (colonnes de AthleteModel)
+MODEL_PARAMS = ("vm", "tc", "gamma_s", "gamma_l", "k1", "k2", "classifier")
+
+
+def records_window_start() -> Optional[datetime]:
+    """Début de la période des records d'entraînement (PREDICTION_RECORDS_WINDOW_DAYS), None pour tout l'historique."""
+    if PREDICTION_RECORDS_WINDOW_DAYS <= 0:
+        return None
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    return today - timedelta(days=PREDICTION_RECORDS_WINDOW_DAYS)
+
+
+def get_training_records(db: Session, athlete_id: int) -> Dict[str, str]:
+    """
+    Records utilisés pour entraîner le modèle : ceux de la période PREDICTION_RECORDS_WINDOW_DAYS,
+    ou de tout l'historique s'il n'y en a aucun sur la période (voir get_running_records).
+    """
+    since = records_window_start()
+    records = get_running_records(db, athlete_id, since)
+    if not records and since is not None:
+        print(f"Aucun record depuis le {since:%Y-%m-%d}, records de tout l'historique")
+        records = get_running_records(db, athlete_id)
+    return records
+
+
+def load_training_inputs(db: Session, athlete_id: int) -> dict:
+    """
+    Données d'entraînement d'un athlète, lues en base : records et streams des activités
+    (tableaux NumPy). Sérialisables, pour entraîner le modèle dans un autre processus.
+
+    Returns:
+        dict: {"records": {distance: temps}, "activities": [{"elevation_data", "pace_data", "heartrate_data"}],
+               "initial_params": paramètres du modèle de puissance précédent (point de départ de l'ajustement) ou None,
+               "previous_classifier": classifieur d'effort précédent sérialisé (labels conservés) ou None,
+               "last_activity_row_id": StravaActivity.id de la dernière activité chargée}
+    """
+    print(f"Recherche des records pour athlete_id={athlete_id}...")
+    records = get_training_records(db, athlete_id)
+    if not records:
+        return {"records": {}, "activities": [], "initial_params": None,
+                "previous_classifier": None, "last_activity_row_id": None}
+
+    previous = get_athlete_model(db, athlete_id)
+    initial_params = None
+    if previous is not None and previous.vm is not None:
+        initial_params = (previous.vm, previous.tc, previous.gamma_s, previous.gamma_l)
+
+    activities = get_activities_for_prediction(db, athlete_id)
+    print(f"Nombre d'activités trouvées: {len(activities) if activities else 0}")
+    return {
+        "records": records,
+        "activities": activity_payloads(activities),
+        "initial_params": initial_params,
+        "previous_classifier": previous.classifier if previous is not None else None,
+        "last_activity_row_id": activities[-1].id if activities else None,
+    }
+
+
+def activity_payloads(activities) -> list:
+    """Streams des activités au format du modèle d'élévation (elevation_data, pace_data, heartrate_data)."""
+    activity_data = []
+    for a in activities or []:
+        payloads = legacy_payloads(load_activity_streams(a))
+        activity_data.append({
+            "elevation_data": payloads["elevation_data"],
+            "pace_data": payloads["pace_data"],
+            "heartrate_data": payloads["heartrate_data"]
+        })
+    return activity_data
+
+
+def fit_records_model(records: Dict[str, str], initial_params: Optional[tuple] = None) -> dict:
+    """Paramètres du modèle de puissance (vm, tc, gamma_s, gamma_l) ajustés sur les records."""
+    records_times = [time_to_minutes(time) for time in records.values()]
+    records_distances = [float(distance.replace('m', '')) for distance in records.keys()]
+    vm, tc, gamma_s, gamma_l = optimize_params(records_distances, records_times, initial_params)
+    return {"vm": float(vm), "tc": float(tc), "gamma_s": float(gamma_s), "gamma_l": float(gamma_l)}
+
+
+def train_model_params(inputs: dict) -> dict:
+    """
+    Entraîne le modèle de prédiction à partir des données de load_training_inputs
+    (calcul seul, sans accès à la base).
+
+    Returns:
+        dict: Paramètres du modèle (vm, tc, gamma_s, gamma_l, k1, k2, classifier) et suivi des
+              mises à jour incrémentales (last_activity_row_id, fitted_at, incremental_activities).
+              vm vaut None sans records, k1/k2 valent None sans modèle pente-vitesse.
+    """
+    params = dict.fromkeys(MODEL_PARAMS)
+    params.update(last_activity_row_id=inputs.get("last_activity_row_id"),
+                  fitted_at=datetime.utcnow(), incremental_activities=0)
+
+    # 1. Records de l'athlète
+    records = inputs["records"]
+    if not records:
+        print("Aucun record trouvé")
+        return params
+
+    # 2. Modèle de puissance (ajusté à partir du modèle précédent de l'athlète s'il existe)
+    params.update(fit_records_model(records, inputs.get("initial_params")))
+
+    # 3. Entraîner le modèle de vitesse en fonction de la pente
+    vitesse_plat = (params["vm"]/60)
+
+    # Vérifier si on a des activités avec des données détaillées
+    activity_data = inputs["activities"]
+    if not activity_data:
+        print("No activity found, using base model")
+        return params
+
+    # Filtrer les activités qui ont des données valides
+    valid_activities = [a for a in activity_data if a["elevation_data"] is not None and a["pace_data"] is not None]
+    print(f"Activités avec données valides: {len(valid_activities)}")
+
+    if not valid_activities:
+        print("Aucune activité avec des données détaillées, utilisation du modèle de base")
+        return params
+
+    # Classifieur précédent : les niveaux d'effort gardent leurs labels
+    previous = None
+    if inputs.get("previous_classifier") is not None:
+        try:
+            previous = pickle.loads(inputs["previous_classifier"])
+        except Exception as e:
+            print(f"Classifieur précédent illisible, labels non conservés: {e}")
+
+    try:
+        print("Tentative d'appel à elev_func...")
+        k1, k2, classifier = elev_func_ml(valid_activities, vitesse_plat=vitesse_plat, previous=previous)
+    except Exception as e:
+        print(f"Erreur lors de l'entraînement du modèle pente-vitesse: {e}")
+        import traceback
+        print(f"Traceback: {traceback.format_exc()}")
+        return params
+
+    if k1 is None or k2 is None:
+        print("elev_func a retourné None, utilisation de valeurs par défaut")
+        k1, k2 = 0.1, 0.05  # Valeurs par défaut
+
+    params.update(k1=float(k1), k2=float(k2), classifier=pickle.dumps(classifier))
+    return params
+
+
+def train_athlete_model(db: Session, athlete_id: int) -> dict:
+    """
+    Entraîne le modèle de prédiction d'un athlète à partir de toutes ses activités.
+
+    Args:
+        db (Session): Session de base de données
+        athlete_id (int): ID de l'athlète
+
+    Returns:
+        dict: Paramètres du modèle (voir train_model_params)
+    """
+    return train_model_params(load_training_inputs(db, athlete_id))
+
+
+def effort_model_refit_due(model: AthleteModel, new_activities: int = 0) -> bool:
+    """
+    Réentraînement complet dû : dernier entraînement complet trop ancien (EFFORT_MODEL_REFIT_DAYS)
+    ou trop d'activités ajoutées depuis par mises à jour (EFFORT_MODEL_REFIT_ACTIVITIES),
+    en comptant new_activities, celles à ajouter.
+    """
+    if model.fitted_at is None:
+        return True
+    if datetime.utcnow() - model.fitted_at > timedelta(days=EFFORT_MODEL_REFIT_DAYS):
+        return True
+    return (model.incremental_activities or 0) + new_activities > EFFORT_MODEL_REFIT_ACTIVITIES
+
+
+def load_update_inputs(db: Session, athlete_id: int, cached: Optional[AthleteModel] = None) -> Optional[dict]:
+    """
+    Données de mise à jour incrémentale du modèle en cache, lues en base : activités
+    sauvegardées depuis son entraînement, records actuels et modèle précédent.
+    Sérialisables, pour calculer la mise à jour dans un autre processus (update_model_params).
+
+    Pas de mise à jour (réentraînement complet à la prochaine prédiction) si le modèle n'a
+    pas de classifieur incrémental ou si son réentraînement complet est dû
+    (effort_model_refit_due) : c'est ce qui corrige la dérive des mises à jour.
+
+    Returns:
+        dict: {"records", "activities" (nouvelles activités valides), "classifier",
+               "initial_params", "last_activity_row_id", "incremental_activities"},
+              ou None s'il faut réentraîner le modèle
+    """
+    cached = cached or get_athlete_model(db, athlete_id)
+    if cached is None or cached.classifier is None or cached.last_activity_row_id is None:
+        return None
+    if not cached.version.startswith(f"{ATHLETE_MODEL_FORMAT}:"):
+        return None  # Entraînement modifié depuis : réentraînement complet
+
+    new_activities = count_activities_for_prediction(db, athlete_id, cached.last_activity_row_id)
+    if effort_model_refit_due(cached, new_activities):
+        print(f"Réentraînement complet dû pour l'athlète {athlete_id}")
+        return None
+    records = get_training_records(db, athlete_id)
+    if not records:
+        return None
+
+    activities = get_activities_for_prediction(db, athlete_id, cached.last_activity_row_id)
+    valid_activities = [a for a in activity_payloads(activities)
+                        if a["elevation_data"] is not None and a["pace_data"] is not None]
+    print(f"Mise à jour du modèle de l'athlète {athlete_id} avec {len(valid_activities)} nouvelles activités")
+    return {
+        "records": records,
+        "activities": valid_activities,
+        "classifier": cached.classifier,
+        "initial_params": (cached.vm, cached.tc, cached.gamma_s, cached.gamma_l) if cached.vm is not None else None,
+        "last_activity_row_id": activities[-1].id if activities else cached.last_activity_row_id,
+        "incremental_activities": (cached.incremental_activities or 0) + len(activities),
+    }
+
+
+def update_model_params(inputs: dict) -> dict:
+    """
+    Met à jour le modèle à partir des données de load_update_inputs (calcul seul, sans
+    accès à la base) : EffortClassifier.partial_fit sur les nouvelles activités,
+    coefficients pente-vitesse et modèle de puissance ajusté sur les records actuels.
+
+    Returns:
+        dict: Paramètres du modèle (voir train_model_params), fitted_at excepté
+    """
+    classifier = pickle.loads(inputs["classifier"])
+    if inputs["activities"]:
+        classifier.partial_fit(inputs["activities"])
+    k1, k2 = slope_coefficients(classifier)
+    if k1 is None or k2 is None:
+        k1, k2 = 0.1, 0.05  # Valeurs par défaut, comme train_model_params
+
+    params = fit_records_model(inputs["records"], inputs["initial_params"])
+    params.update(k1=float(k1), k2=float(k2), classifier=pickle.dumps(classifier),
+                  last_activity_row_id=inputs["last_activity_row_id"],
+                  incremental_activities=inputs["incremental_activities"])
+    return params
+
+
+def update_athlete_model(db: Session, athlete_id: int, version: Optional[str] = None) -> Optional[AthleteModel]:
+    """
+    Met à jour le modèle en cache avec les seules activités sauvegardées depuis son
+    entraînement, sans réentraînement (load_update_inputs puis update_model_params,
+    dans le thread appelant). Appelé à la fin des synchronisations, hors des requêtes ;
+    les prédictions async passent par le processus de calcul (predict_course_async).
+
+    Returns:
+        AthleteModel: Modèle à jour, ou None s'il faut le réentraîner
+    """
+    version = version or athlete_model_version(db, athlete_id)
+    cached = get_athlete_model(db, athlete_id)
+    if cached is not None and cached.version == version:
+        return cached
+    inputs = load_update_inputs(db, athlete_id, cached)
+    if inputs is None:
+        return None
+    return upsert_athlete_model(db, athlete_id, version, **update_model_params(inputs))
+
+
+def athlete_model_version(db: Session, athlete_id: int) -> str:
+    """
+    Version attendue du modèle : format de l'entraînement, empreinte des activités et,
+    si les records sont pris sur une période, début de celle-ci (réentraînement quotidien).
+    """
+    version = f"{ATHLETE_MODEL_FORMAT}:{get_activity_set_version(db, athlete_id)}"
+    since = records_window_start()
+    if since is not None:
+        version += f":{since:%Y-%m-%d}"
+    return version
+
+
+def get_cached_model_params(db: Session, athlete_id: int) -> tuple:
+    """
+    Paramètres du modèle en cache s'il est à jour.
+
+    Returns:
+        tuple: (version attendue, paramètres ou None s'il faut réentraîner)
+    """
+    version = athlete_model_version(db, athlete_id)
+    cached = get_athlete_model(db, athlete_id)
+    if cached is not None and cached.version == version:
+        print(f"Modèle en cache pour l'athlète {athlete_id} (version {version})")
+        return version, {name: getattr(cached, name) for name in MODEL_PARAMS}
+    return version, None
+
+
+def get_or_train_athlete_model(db: Session, athlete_id: int) -> AthleteModel:
+    """
+    Renvoie le modèle de prédiction de l'athlète : mis à jour avec les activités
+    synchronisées depuis le dernier entraînement, réentraîné entièrement si
+    la mise à jour n'est pas possible (voir update_athlete_model).
+    """
+    version = athlete_model_version(db, athlete_id)
+    cached = get_athlete_model(db, athlete_id)
+    if cached is not None and cached.version == version:
+        print(f"Modèle en cache pour l'athlète {athlete_id} (version {version})")
+        return cached
+    updated = update_athlete_model(db, athlete_id, version)
+    if updated is not None:
+        return updated
+
+    print(f"Entraînement du modèle pour l'athlète {athlete_id} (version {version})")
+    params = train_athlete_model(db, athlete_id)
+    return upsert_athlete_model(db, athlete_id, version, **params)
+
+
+def predict_race_time(gpx_path: Union[str, GPXTrack, CourseAnalysis], db: Session, athlete_id: int) -> tuple:
     """
     Prédit le temps de course pour un parcours GPX donné en utilisant les données d'entraînement.
     
     Args:
-        gpx_path (str): Chemin vers le fichier GPX du parcours
+        gpx_path (str | GPXTrack | CourseAnalysis): Chemin vers le fichier GPX du parcours,
+            trace déjà parsée ou parcours déjà analysé (ses timings reçoivent alors
+            les étapes "modele" et "prediction")
         db (Session): Session de base de données
         athlete_id (int): ID de l'athlète
     
@@ -40,126 +362,107 @@ def predict_race_time(gpx_path: str, db: Session, athlete_id: int) -> tuple:
     """
     print(f"=== DÉBUT PRÉDICTION ===")
     print(f"Athlete ID: {athlete_id}")
-    print(f"Fichier GPX: {gpx_path}")
     
     # 1. Extraire les données du parcours GPX
-    points = parse_gpx(gpx_path)
-    if not points:
-        raise ValueError("Impossible de parser le fichier GPX")
-        
-    distances, slopes = calculate_slope_profile(points)
-    total_distance = distances[-1]  # Distance totale en mètres
+    if isinstance(gpx_path, CourseAnalysis):
+        course = gpx_path
+    else:
+        if isinstance(gpx_path, GPXTrack):
+            track = gpx_path
+        else:
+            print(f"Fichier GPX: {gpx_path}")
+            track = parse_gpx_track(gpx_path)
+        if not track:
+            raise ValueError("Impossible de parser le fichier GPX")
+        course = CourseAnalysis(track)
+
+    distances, slopes = course.distances, course.slopes
+    total_distance = course.total_distance  # Distance totale en mètres
     print(f"Distance totale: {total_distance/1000:.2f} km")
 
-    # 2. Récupération des records de l'athlète
-    print(f"Recherche des records pour athlete_id={athlete_id}...")
-    records = get_running_records_from_db(db, athlete_id)
-    
+    # 2. Modèle de l'athlète (en cache tant que ses activités n'ont pas changé)
+    with course.step("modele"):
+        model = get_or_train_athlete_model(db, athlete_id)
+    params = {name: getattr(model, name) for name in MODEL_PARAMS}
+
+    with course.step("prediction"):
+        result = predict_course_time(distances, slopes, total_distance, params)
+    return result, total_distance
+
+
+async def predict_course_async(course: CourseAnalysis, db: Session, athlete_id: int) -> tuple:
+    """
+    Équivalent de predict_race_time pour les routes async : les lectures et écritures en
+    base passent par le pool de threads, l'entraînement et la prédiction par un processus
+    de calcul (app/services/prediction_executor.py). La boucle d'événements n'est pas bloquée.
+
+    Raises:
+        PredictionBusyError: si tous les processus de calcul sont occupés et la file pleine
+
+    Returns:
+        tuple: (temps_prédit_en_minutes, distance_totale_en_mètres)
+    """
+    distances, slopes = course.distances, course.slopes
+    total_distance = course.total_distance
+
+    # Modèle en cache, ou données d'entraînement à envoyer au processus de calcul
+    with course.step("modele"):
+        version, params = await run_in_threadpool(get_cached_model_params, db, athlete_id)
+        training_inputs = update_inputs = None
+        if params is None:
+            update_inputs = await run_in_threadpool(load_update_inputs, db, athlete_id)
+        if params is None and update_inputs is None:
+            print(f"Entraînement du modèle pour l'athlète {athlete_id} (version {version})")
+            training_inputs = await run_in_threadpool(load_training_inputs, db, athlete_id)
+
+    output = await run_prediction(predict_course, distances, slopes, total_distance, params,
+                                  training_inputs, update_inputs)
+    for name, duration in output["timings"].items():
+        course.timings[name] = course.timings.get(name, 0.0) + duration
+
+    if output["trained"] is not None:
+        with course.step("modele"):
+            await run_in_threadpool(upsert_athlete_model, db, athlete_id, version, **output["trained"])
+    return output["minutes"], total_distance
+
+
+def predict_course_time(distances: np.ndarray, slopes: np.ndarray, total_distance: float, params: dict) -> float:
+    """
+    Temps de course prédit (minutes) pour un profil de parcours et les paramètres
+    du modèle d'un athlète (calcul seul, sans accès à la base).
+
+    Args:
+        distances, slopes: Profil du parcours (CourseAnalysis)
+        total_distance: Distance totale en mètres
+        params: Paramètres du modèle (MODEL_PARAMS)
+    """
     # Vérifier si on a des records
-    if not records:
+    if params["vm"] is None:
         # Si pas de records, utiliser des valeurs par défaut
         print("Aucun record trouvé, utilisation de valeurs par défaut")
-        result = total_distance / 1000 * 5  # 5 min/km par défaut
-        return result, total_distance
-    
-    records_times = [time_to_minutes(time) for time in records.values()]
-    records_distances = [float(distance.replace('m', '')) for distance in records.keys()]
+        return total_distance / 1000 * 5  # 5 min/km par défaut
 
     # 3. Prédiction du temps avec le modèle de puissance
-    vm, tc, gamma_s, gamma_l = optimize_params(records_distances, records_times)
-    result = predicted_time(total_distance, vm, tc, gamma_s, gamma_l)
+    vm = params["vm"]
+    result = predicted_time(total_distance, vm, params["tc"], params["gamma_s"], params["gamma_l"])
     print(f"Temps en heures et minutes : {int(result//60)}h{int(result%60)}min")
-    
-    # 4. Entraîner le modèle de vitesse en fonction de la pente
-    vitesse_plat = (vm/60)
-    
-    activities = get_activities_for_prediction(db, athlete_id)
-    print(f"Nombre d'activités trouvées: {len(activities) if activities else 0}")
-
-    # Vérifier si on a des activités avec des données détaillées
-    if not activities:
-        print("No activity found, using base model")
-        return result, total_distance
-
-    # Préparer les données pour le modèle d'élévation
-    activity_data = []
-    for a in activities:
-        # Parser les données JSON si elles existent
-        elevation_data = None
-        pace_data = None
-        heartrate_data = None
-        
-        if a.elevation_data:
-            try:
-                elevation_data = json.loads(a.elevation_data)
-                print(f"Activité {a.id}: elevation_data OK")
-            except (json.JSONDecodeError, TypeError):
-                elevation_data = None
-                print(f"Activité {a.id}: elevation_data invalide")
-                
-        if a.pace_data:
-            try:
-                pace_data = json.loads(a.pace_data)
-                print(f"Activité {a.id}: pace_data OK")
-            except (json.JSONDecodeError, TypeError):
-                pace_data = None
-                print(f"Activité {a.id}: pace_data invalide")
-                
-        if a.heartrate_data:
-            try:
-                heartrate_data = json.loads(a.heartrate_data)
-            except (json.JSONDecodeError, TypeError):
-                heartrate_data = None
-        
-        activity_data.append({
-            "elevation_data": elevation_data,
-            "pace_data": pace_data,
-            "heartrate_data": heartrate_data
-        })
 
-    # Filtrer les activités qui ont des données valides
-    valid_activities = [a for a in activity_data if a["elevation_data"] is not None and a["pace_data"] is not None]
-    print(f"Activités avec données valides: {len(valid_activities)}")
-    
-    if not valid_activities:
-        print("Aucune activité avec des données détaillées, utilisation du modèle de base")
-        return result, total_distance
+    # 4. Modèle pente-vitesse
+    if params["k1"] is None or params["k2"] is None:
+        print("Pas de modèle pente-vitesse, utilisation du modèle de base")
+        return result
 
-    df = pd.DataFrame(valid_activities)
-    print(f"DataFrame créé avec {len(df)} activités")
+    k1, k2 = params["k1"], params["k2"]
 
     try:
-        print("Tentative d'appel à elev_func...")
-        k1, k2, classifier = elev_func_ml(df, vitesse_plat=vitesse_plat)
-        
-        if k1 is None or k2 is None:
-            print("elev_func a retourné None, utilisation de valeurs par défaut")
-            k1, k2 = 0.1, 0.05  # Valeurs par défaut
-        
         print(f'k1 = {k1:.3f}, k2 = {k2:.3f}')
 
         alpha = 0.05 # coefficient de fatigue
         beta = 0.8 # vitesse minimale
 
         # 5. Calculer le temps total en tenant compte de la pente
-        time_total = 0.0
-        distance_total = 0.0
-
-        for i in range(1, len(distances)):
-            segment_length = distances[i] - distances[i-1]
-            slope = slopes[i-1]
-            
-            distance_total += segment_length
-            vitesse_fatigue = (vm / 60) * max(1 - alpha * distance_total, beta)
-            
-            if slope >= 0:
-                v_segment = vitesse_fatigue * np.exp(-k1 * slope)
-            else:
-                v_segment = vitesse_fatigue * (1 + k2 * slope)
-            
-            v_segment = max(v_segment, 0.1)
-            t_segment = segment_length / v_segment
-            time_total += t_segment
+        time_total, _ = course_time(distances, slopes, vm, k1, k2, alpha=alpha, beta=beta)
+        time_total = float(time_total)
 
         time_hours = int(time_total // 3600)
         time_minutes = int((time_total % 3600) // 60)
@@ -169,7 +472,7 @@ def predict_race_time(gpx_path: str, db: Session, athlete_id: int) -> tuple:
         print(f"Différence: {time_total/60 - result:.1f} minutes")
         
         # Retourner le temps corrigé en minutes
-        return time_total / 60, total_distance
+        return time_total / 60
         
     except Exception as e:
         print(f"Erreur dans le calcul avec dénivelé: {e}")
@@ -177,5 +480,37 @@ def predict_race_time(gpx_path: str, db: Session, athlete_id: int) -> tuple:
         import traceback
         print(f"Traceback: {traceback.format_exc()}")
         # En cas d'erreur, retourner le résultat de base
-        return result, total_distance
+        return result
+
+
+def predict_course(distances: np.ndarray, slopes: np.ndarray, total_distance: float,
+                   params: dict = None, training_inputs: dict = None, update_inputs: dict = None) -> dict:
+    """
+    Prédiction complète à partir d'entrées sérialisables, exécutée dans un processus
+    de l'exécuteur de prédictions (app/services/prediction_executor.py).
+
+    Args:
+        distances, slopes, total_distance: Profil du parcours
+        params: Paramètres du modèle en cache, ou None pour le mettre à jour ou l'entraîner
+        training_inputs: Données d'entraînement (load_training_inputs) si params est None
+        update_inputs: Données de mise à jour incrémentale (load_update_inputs), utilisées
+            à la place de training_inputs si params est None
+
+    Returns:
+        dict: "minutes" (temps prédit), "trained" (paramètres entraînés ou mis à jour, à mettre
+              en cache, ou None) et "timings" (durée des étapes "modele" et "prediction", en ms)
+    """
+    timings = {}
+    trained = None
+    if params is None:
+        start = time.perf_counter()
+        if update_inputs is not None:
+            params = trained = update_model_params(update_inputs)
+        else:
+            params = trained = train_model_params(training_inputs)
+        timings["modele"] = (time.perf_counter() - start) * 1000
 
+    start = time.perf_counter()
+    minutes = predict_course_time(distances, slopes, total_distance, params)
+    timings["prediction"] = (time.perf_counter() - start) * 1000
+    return {"minutes": minutes, "trained": trained, "timings": timings}
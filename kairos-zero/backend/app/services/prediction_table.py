@@ -0,0 +1,120 @@
+"""
+Table d'équivalences des temps de course d'un athlète.
+Gère :
+- L'ajustement du modèle de puissance sur ses records d'entraînement
+  (prediction_service.get_training_records), sans le modèle pente-vitesse
+- Les temps prédits sur toutes les distances en une passe (predicted_times) :
+  distances usuelles de 400 m à 100 km, et courbe continue pour les graphiques
+- Un cache par athlète, valable tant que ses records ne changent pas
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.config import PREDICTION_TABLE_CACHE_SIZE
+from app.services.prediction_service import get_training_records
+from app.utils.model_time_pred import minutes_to_time_str, optimize_params, predicted_times, time_to_minutes
+
+# Distances de la table (m) et leur libellé
+TABLE_DISTANCES = {
+    400: "400 m",
+    800: "800 m",
+    1000: "1 km",
+    1500: "1500 m",
+    1609.34: "1 mile",
+    3000: "3 km",
+    5000: "5 km",
+    10000: "10 km",
+    15000: "15 km",
+    16093.4: "10 miles",
+    21097.5: "Semi-marathon",
+    30000: "30 km",
+    42195: "Marathon",
+    50000: "50 km",
+    80467.2: "50 miles",
+    100000: "100 km",
+}
+# Étendue de la courbe (m), points répartis en échelle logarithmique
+CURVE_MIN_DISTANCE = 400
+CURVE_MAX_DISTANCE = 100000
+
+PARAM_NAMES = ("vm", "tc", "gamma_s", "gamma_l")
+
+# athlete_id -> (records, paramètres ajustés, lignes de la table)
+_entries = OrderedDict()
+_lock = threading.Lock()
+
+
+def _fit_table(records: Dict[str, str], previous_params: Optional[tuple]) -> tuple:
+    """Paramètres du modèle de puissance ajustés sur les records, et lignes de la table."""
+    distances = [float(distance.replace('m', '')) for distance in records.keys()]
+    times = [time_to_minutes(time) for time in records.values()]
+    params = tuple(float(p) for p in optimize_params(distances, times, previous_params))
+
+    table_distances = np.array(list(TABLE_DISTANCES))
+    table_times = predicted_times(table_distances, *params)
+    table = []
+    for distance, label, minutes in zip(table_distances, TABLE_DISTANCES.values(), table_times):
+        defined = bool(np.isfinite(minutes))
+        table.append({
+            "distance": float(distance),
+            "label": label,
+            "time_minutes": round(float(minutes), 2) if defined else None,
+            "time": minutes_to_time_str(minutes) if defined else None,
+            "pace": minutes_to_time_str(minutes / (distance / 1000)) if defined else None,  # par km
+        })
+    return params, table
+
+
+def get_prediction_table(db: Session, athlete_id: int, points: int = 200) -> Optional[dict]:
+    """
+    Table d'équivalences d'un athlète et courbe temps-distance de points points.
+    Le modèle n'est réajusté que si les records ont changé depuis le dernier appel,
+    à partir des paramètres précédents.
+
+    Returns:
+        dict: records, params (vm, tc, gamma_s, gamma_l), table (distance, label,
+        time_minutes, time, pace) et curve (distances, times en minutes) ;
+        None si l'athlète n'a aucun record. Temps à None là où le modèle n'est pas défini.
+    """
+    records = get_training_records(db, athlete_id)
+    if not records:
+        return None
+
+    key = tuple(sorted(records.items()))
+    with _lock:
+        entry = _entries.get(athlete_id)
+        if entry is not None:
+            _entries.move_to_end(athlete_id)
+
+    if entry is not None and entry[0] == key:
+        _, params, table = entry
+    else:
+        params, table = _fit_table(records, entry[1] if entry is not None else None)
+        with _lock:
+            _entries[athlete_id] = (key, params, table)
+            _entries.move_to_end(athlete_id)
+            while len(_entries) > PREDICTION_TABLE_CACHE_SIZE:
+                _entries.popitem(last=False)
+
+    curve_distances = np.geomspace(CURVE_MIN_DISTANCE, CURVE_MAX_DISTANCE, points)
+    curve_times = np.round(predicted_times(curve_distances, *params), 3)
+    return {
+        "records": records,
+        "params": dict(zip(PARAM_NAMES, params)),
+        "table": table,
+        "curve": {
+            "distances": np.round(curve_distances, 1).tolist(),
+            "times": [float(t) if np.isfinite(t) else None for t in curve_times],
+        },
+    }
+
+
+def clear_prediction_tables():
+    """Vide le cache."""
+    with _lock:
+        _entries.clear()
@@ -0,0 +1,141 @@
+"""
+Client HTTP partagé pour tout le trafic vers l'API Strava.
+Gère :
+- Le pool de connexions keep-alive (une seule poignée de main TLS par connexion)
+- Les timeouts sur chaque appel
+- Une politique unique de retry / backoff
+- Le respect du limiteur de débit partagé
+"""
+
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.config import (
+    STRAVA_CLIENT_ID, STRAVA_CLIENT_SECRET, STRAVA_API_URL, STRAVA_OAUTH_URL,
+    STRAVA_HTTP_TIMEOUT, STRAVA_HTTP_RETRIES, STRAVA_SYNC_MAX_WORKERS
+)
+from app.services.strava_fetcher import StravaRateLimiter, strava_rate_limiter
+
+
+class StravaClient:
+    """
+    Session HTTP unique et thread-safe vers Strava.
+
+    Les requêtes GET sont rejouées sur erreur réseau et sur 5xx avec un backoff
+    exponentiel. Les POST (OAuth) ne sont rejoués que si la connexion n'a pas
+    pu être établie, pour ne jamais consommer deux fois un refresh_token.
+    Les 429 ne sont pas rejoués par urllib3 : ils sont confiés au limiteur de
+    débit, qui attend la prochaine fenêtre Strava.
+    """
+
+    def __init__(
+        self,
+        base_url: str = STRAVA_API_URL,
+        oauth_url: str = STRAVA_OAUTH_URL,
+        timeout: float = STRAVA_HTTP_TIMEOUT,
+        retries: int = STRAVA_HTTP_RETRIES,
+        pool_maxsize: int = max(10, STRAVA_SYNC_MAX_WORKERS * 2),
+        rate_limiter: StravaRateLimiter = strava_rate_limiter
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.oauth_url = oauth_url
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=0.5,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_maxsize, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _url(self, path: str) -> str:
+        if path.startswith("http://") or path.startswith("https://"):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def get(
+        self,
+        path: str,
+        access_token: Optional[str] = None,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        max_rate_limit_retries: int = 2
+    ) -> requests.Response:
+        """
+        Requête GET vers l'API Strava.
+
+        Args:
+            path: Chemin relatif à l'API (ex: "/athlete") ou URL complète
+            access_token: Token OAuth ajouté en en-tête Authorization
+            params: Paramètres de la query string
+            headers: En-têtes supplémentaires
+            timeout: Timeout en secondes (par défaut celui du client)
+            max_rate_limit_retries: Nombre de tentatives après un 429
+
+        Returns:
+            requests.Response: Réponse Strava (le statut n'est pas vérifié)
+        """
+        request_headers = dict(headers or {})
+        if access_token:
+            request_headers["Authorization"] = f"Bearer {access_token}"
+
+        for attempt in range(max_rate_limit_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.get(
+                    self._url(path),
+                    headers=request_headers,
+                    params=params,
+                    timeout=timeout or self.timeout
+                )
+            except Exception:
+                self.rate_limiter.release()
+                raise
+            self.rate_limiter.release(response.headers)
+
+            if response.status_code == 429 and attempt < max_rate_limit_retries:
+                self.rate_limiter.exhaust_short_window()
+                continue
+            return response
+
+    def post_oauth(self, data: dict, timeout: Optional[float] = None) -> requests.Response:
+        """
+        Requête POST vers l'endpoint OAuth de Strava (identifiants client ajoutés).
+
+        Args:
+            data: Champs du formulaire (grant_type, code ou refresh_token...)
+            timeout: Timeout en secondes (par défaut celui du client)
+
+        Returns:
+            requests.Response: Réponse Strava (le statut n'est pas vérifié)
+        """
+        payload = {
+            "client_id": STRAVA_CLIENT_ID,
+            "client_secret": STRAVA_CLIENT_SECRET,
+            **data
+        }
+        return self.session.post(self.oauth_url, data=payload, timeout=timeout or self.timeout)
+
+    def exchange_code(self, code: str) -> requests.Response:
+        """Échange un code d'autorisation OAuth contre des tokens."""
+        return self.post_oauth({"code": code, "grant_type": "authorization_code"})
+
+    def refresh_token(self, refresh_token: str) -> requests.Response:
+        """Rafraîchit un access_token à partir d'un refresh_token."""
+        return self.post_oauth({"grant_type": "refresh_token", "refresh_token": refresh_token})
+
+
+# Client partagé par toute l'application
+strava_client = StravaClient()
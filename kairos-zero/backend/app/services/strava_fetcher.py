@@ -0,0 +1,202 @@
+"""
+Moteur de récupération concurrente des activités Strava.
+Gère :
+- La récupération des détails + streams de plusieurs activités en parallèle
+- Le respect des quotas Strava (fenêtre de 15 minutes et quota journalier)
+  à partir des en-têtes X-RateLimit-Usage / X-RateLimit-Limit
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from app.config import STRAVA_SYNC_MAX_WORKERS
+
+# Durée de la fenêtre courte Strava (les compteurs sont remis à zéro à 0, 15, 30 et 45 min)
+SHORT_WINDOW_SECONDS = 15 * 60
+DAILY_WINDOW_SECONDS = 24 * 60 * 60
+
+_NO_MORE_IDS = object()
+
+
+class StravaRateLimitExceeded(Exception):
+    """Levée lorsque le quota journalier Strava est épuisé."""
+
+    def __init__(self, message: str, retry_after: float = DAILY_WINDOW_SECONDS):
+        super().__init__(message)
+        self.retry_after = retry_after  # Secondes avant la remise à zéro du quota journalier
+
+
+class StravaRateLimiter:
+    """
+    Limiteur de débit partagé par tous les appels à l'API Strava.
+
+    Les quotas Strava sont globaux à l'application : l'état est donc partagé
+    entre toutes les synchronisations du processus. L'usage réel est relu dans
+    les en-têtes de chaque réponse, et les requêtes encore en vol sont comptées
+    localement pour ne pas dépasser le budget entre deux réponses.
+    """
+
+    def __init__(self, short_limit: int = 100, daily_limit: int = 1000, safety_margin: int = 5):
+        self.short_limit = short_limit
+        self.daily_limit = daily_limit
+        self.safety_margin = safety_margin
+        self.short_usage = 0
+        self.daily_usage = 0
+        self._in_flight = 0
+        self._short_window = None
+        self._daily_window = None
+        self._lock = threading.Lock()
+
+    def _roll_windows(self, now: float):
+        """Remet les compteurs à zéro lorsqu'une nouvelle fenêtre commence."""
+        short_window = int(now // SHORT_WINDOW_SECONDS)
+        daily_window = int(now // DAILY_WINDOW_SECONDS)
+        if short_window != self._short_window:
+            self._short_window = short_window
+            self.short_usage = 0
+        if daily_window != self._daily_window:
+            self._daily_window = daily_window
+            self.daily_usage = 0
+
+    def acquire(self):
+        """
+        Bloque jusqu'à ce qu'une requête puisse être envoyée.
+
+        Raises:
+            StravaRateLimitExceeded: Si le quota journalier est épuisé
+        """
+        while True:
+            with self._lock:
+                now = time.time()
+                self._roll_windows(now)
+
+                if self.daily_usage + self._in_flight >= self.daily_limit - self.safety_margin:
+                    raise StravaRateLimitExceeded(
+                        "Quota journalier Strava atteint",
+                        retry_after=(self._daily_window + 1) * DAILY_WINDOW_SECONDS - now
+                    )
+
+                if self.short_usage + self._in_flight < self.short_limit - self.safety_margin:
+                    self._in_flight += 1
+                    return
+
+                # Budget de la fenêtre épuisé : attendre la prochaine fenêtre
+                wait = (self._short_window + 1) * SHORT_WINDOW_SECONDS - now
+
+            print(f"Quota Strava de 15 minutes atteint, reprise dans {wait:.0f}s")
+            time.sleep(max(wait, 0.1))
+
+    def release(self, headers: Optional[Dict[str, str]] = None):
+        """
+        Libère une requête en vol et met à jour l'usage avec les en-têtes de la réponse.
+
+        Args:
+            headers: En-têtes HTTP de la réponse Strava (None si la requête a échoué)
+        """
+        with self._lock:
+            self._in_flight = max(self._in_flight - 1, 0)
+            self._roll_windows(time.time())
+            if headers is None:
+                self.short_usage += 1
+                self.daily_usage += 1
+                return
+            self._update_from_headers(headers)
+
+    def _update_from_headers(self, headers):
+        # Les limites de lecture (X-ReadRateLimit-*) sont plus strictes lorsqu'elles existent
+        for prefix in ("X-ReadRateLimit", "X-RateLimit"):
+            limit = _parse_pair(headers.get(f"{prefix}-Limit"))
+            usage = _parse_pair(headers.get(f"{prefix}-Usage"))
+            if limit and usage:
+                self.short_limit, self.daily_limit = limit
+                self.short_usage, self.daily_usage = usage
+                return
+        self.short_usage += 1
+        self.daily_usage += 1
+
+    def exhaust_short_window(self):
+        """Marque la fenêtre courante comme épuisée (réponse 429 de Strava)."""
+        with self._lock:
+            self._roll_windows(time.time())
+            self.short_usage = self.short_limit
+
+
+def _parse_pair(value: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Parse un en-tête Strava de la forme '100,1000'."""
+    if not value:
+        return None
+    try:
+        short_value, daily_value = (int(v) for v in value.split(","))
+    except ValueError:
+        return None
+    return short_value, daily_value
+
+
+# Instance partagée : les quotas Strava sont propres à l'application
+strava_rate_limiter = StravaRateLimiter()
+
+
+def fetch_activities_details(
+    access_token: str,
+    activity_ids: Iterable[int],
+    max_workers: int = STRAVA_SYNC_MAX_WORKERS,
+    client=None
+) -> Iterator[Tuple[int, Optional[dict], Optional[Exception]]]:
+    """
+    Récupère les détails et streams de plusieurs activités en parallèle.
+
+    Les résultats sont produits dans l'ordre des identifiants fournis, avec au
+    plus 2 * max_workers requêtes en attente, ce qui permet de sauvegarder et de
+    suivre la progression au fil de l'eau.
+
+    Args:
+        access_token (str): Token d'accès OAuth Strava
+        activity_ids (Iterable[int]): Identifiants des activités à récupérer
+        max_workers (int): Nombre maximal de récupérations simultanées
+        client (StravaClient): Client HTTP Strava (par défaut le client partagé,
+            qui applique le limiteur de débit)
+
+    Yields:
+        tuple: (activity_id, données complètes ou None, exception ou None)
+
+    Raises:
+        StravaRateLimitExceeded: Si le quota journalier est épuisé en cours de route
+    """
+    # Imports locaux pour éviter un import circulaire (le client dépend du limiteur)
+    from app.repositories.strava_activity import fetch_full_activity_details
+    from app.services.strava_client import strava_client
+
+    client = client or strava_client
+
+    ids = iter(activity_ids)
+    window = max(1, max_workers) * 2
+    pool = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    pending = deque()
+
+    def submit_next():
+        activity_id = next(ids, _NO_MORE_IDS)
+        if activity_id is _NO_MORE_IDS:
+            return False
+        pending.append((activity_id, pool.submit(fetch_full_activity_details, access_token, activity_id, client)))
+        return True
+
+    try:
+        while len(pending) < window and submit_next():
+            pass
+
+        while pending:
+            activity_id, future = pending.popleft()
+            try:
+                result, error = future.result(), None
+            except StravaRateLimitExceeded:
+                # Inutile de continuer : toutes les requêtes suivantes seraient refusées
+                raise
+            except Exception as e:
+                result, error = None, e
+            submit_next()
+            yield activity_id, result, error
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
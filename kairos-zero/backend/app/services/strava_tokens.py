@@ -0,0 +1,171 @@
+"""
+Gestion des tokens d'accès Strava.
+Gère :
+- Le token d'accès valide de chaque utilisateur en mémoire (pas de requête StravaToken
+  tant qu'il n'approche pas de son expiration)
+- Le rafraîchissement en un seul vol : les requêtes simultanées d'un même utilisateur
+  attendent le même appel à Strava au lieu de rafraîchir chacune le token
+- Le renouvellement anticipé en tâche de fond, avant que le token n'expire
+- La relecture verrouillée de la ligne avant rafraîchissement (SELECT ... FOR UPDATE sur
+  PostgreSQL), pour ne pas rafraîchir deux fois depuis deux processus
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import STRAVA_TOKEN_REFRESH_MARGIN_SECONDS, STRAVA_TOKEN_REFRESH_AHEAD_SECONDS
+from app.models.strava_token import StravaToken
+from app.services.identity_cache import invalidate_identity
+from app.services.strava_client import StravaClient, strava_client
+
+
+class StravaTokenError(Exception):
+    """Pas de token Strava pour l'utilisateur, ou rafraîchissement refusé par Strava."""
+
+
+class StravaTokenManager:
+    """
+    Tokens d'accès Strava des utilisateurs, partagés par les threads du processus.
+
+    Un token est rafraîchi avant usage s'il expire dans moins de refresh_margin secondes,
+    et en tâche de fond (la requête utilise encore l'ancien) s'il expire dans moins
+    de refresh_ahead secondes. Strava ne renouvelle un token que dans sa dernière heure.
+    """
+
+    def __init__(
+        self,
+        client: StravaClient = strava_client,
+        refresh_margin: float = STRAVA_TOKEN_REFRESH_MARGIN_SECONDS,
+        refresh_ahead: float = STRAVA_TOKEN_REFRESH_AHEAD_SECONDS
+    ):
+        self.client = client
+        self.refresh_margin = refresh_margin
+        self.refresh_ahead = max(refresh_ahead, refresh_margin)
+        # user_id -> (access_token, expires_at)
+        self._tokens = {}
+        # user_id -> Future du rafraîchissement en cours
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def get_access_token(self, db: Session, user_id: int) -> str:
+        """
+        Token d'accès valide de l'utilisateur, rafraîchi si nécessaire.
+
+        Raises:
+            StravaTokenError: si l'utilisateur n'a pas de token ou si le rafraîchissement échoue
+        """
+        now = time.time()
+        with self._lock:
+            cached = self._tokens.get(user_id)
+        if cached is None:
+            token_entry = db.query(StravaToken).filter_by(user_id=user_id).first()
+            if not token_entry:
+                raise StravaTokenError("Aucun token Strava trouvé pour cet utilisateur. Veuillez vous reconnecter.")
+            cached = self._remember(user_id, token_entry.access_token, token_entry.expires_at)
+
+        access_token, expires_at = cached
+        if now >= expires_at - self.refresh_margin:
+            # Expiré ou presque : la requête attend le nouveau token
+            return self._refresh(db.get_bind(), user_id).result()[0]
+        if now >= expires_at - self.refresh_ahead:
+            self._refresh_in_background(db, user_id)
+        return access_token
+
+    def forget(self, user_id: Optional[int]):
+        """Oublie le token en mémoire d'un utilisateur (nouvelle autorisation OAuth)."""
+        if user_id is None:
+            return
+        with self._lock:
+            self._tokens.pop(user_id, None)
+
+    def shutdown(self):
+        """Arrêt de l'application : abandonne les renouvellements anticipés en attente."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _remember(self, user_id: int, access_token: str, expires_at: int) -> tuple:
+        entry = (access_token, expires_at)
+        with self._lock:
+            self._tokens[user_id] = entry
+        return entry
+
+    def _refresh(self, engine, user_id: int) -> Future:
+        """
+        Rafraîchit le token dans le thread appelant, ou renvoie le rafraîchissement déjà
+        en cours pour cet utilisateur. Le rafraîchissement a sa propre session sur la base
+        de l'appelant : la transaction de la requête n'est ni validée ni annulée.
+
+        Returns:
+            Future: (access_token, expires_at)
+        """
+        with self._lock:
+            future = self._inflight.get(user_id)
+            if future is not None:
+                return future
+            future = self._inflight[user_id] = Future()
+
+        db = Session(bind=engine)
+        try:
+            future.set_result(self._refresh_token(db, user_id))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            db.close()
+            with self._lock:
+                self._inflight.pop(user_id, None)
+        return future
+
+    def _refresh_in_background(self, db: Session, user_id: int):
+        with self._lock:
+            if user_id in self._inflight:
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="strava-token")
+            executor = self._executor
+        executor.submit(self._refresh_in_thread, db.get_bind(), user_id)
+
+    def _refresh_in_thread(self, engine, user_id: int):
+        try:
+            self._refresh(engine, user_id).result()
+        except Exception as e:
+            print(f"Erreur lors du renouvellement anticipé du token Strava de l'utilisateur {user_id}: {e}")
+
+    def _refresh_token(self, db: Session, user_id: int) -> tuple:
+        # Relecture verrouillée : un autre processus a pu rafraîchir le token entre-temps
+        token_entry = db.query(StravaToken).filter_by(user_id=user_id).with_for_update().first()
+        if not token_entry:
+            db.rollback()
+            self.forget(user_id)
+            raise StravaTokenError("Aucun token Strava trouvé pour cet utilisateur. Veuillez vous reconnecter.")
+        if time.time() < token_entry.expires_at - self.refresh_ahead:
+            db.commit()
+            return self._remember(user_id, token_entry.access_token, token_entry.expires_at)
+
+        try:
+            response = self.client.refresh_token(token_entry.refresh_token)
+        except Exception as e:
+            db.rollback()
+            raise StravaTokenError(f"Erreur lors du rafraîchissement du token: {str(e)}")
+        if response.status_code != 200:
+            db.rollback()
+            raise StravaTokenError("Impossible de rafraîchir le token Strava. Veuillez vous reconnecter.")
+
+        new_token_data = response.json()
+        token_entry.access_token = new_token_data["access_token"]
+        token_entry.refresh_token = new_token_data["refresh_token"]
+        token_entry.expires_at = new_token_data["expires_at"]
+        db.commit()
+        invalidate_identity(user_id)
+        print(f"Token Strava rafraîchi pour l'utilisateur {user_id}")
+        return self._remember(user_id, new_token_data["access_token"], new_token_data["expires_at"])
+
+
+# Gestionnaire partagé par toute l'application
+strava_token_manager = StravaTokenManager()
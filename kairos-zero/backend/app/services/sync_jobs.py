@@ -0,0 +1,290 @@
+"""
+Synchronisations Strava en tâche de fond.
+Gère :
+- L'exécution des synchronisations dans un pool de threads, hors des requêtes HTTP
+- La sauvegarde des activités par lots (upsert en bloc)
+- Le suivi de l'avancement en base (table sync_jobs), consulté par polling
+- L'annulation à la demande
+- La reprise après un redémarrage, à partir de la dernière activité sauvegardée
+- La mise à jour du modèle de prédiction de l'athlète avec les nouvelles activités
+"""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import List
+
+from sqlalchemy.orm import Session
+
+from app.config import SYNC_JOB_WORKERS, SYNC_JOB_STALE_SECONDS, SYNC_SAVE_BATCH_SIZE
+from app.database import SessionLocal
+from app.models.sync_job import SyncJob, SYNC_JOB_COMPLETED, SYNC_JOB_FAILED, SYNC_JOB_CANCELLED
+from app.repositories.sync_job import (
+    claim_sync_job,
+    finish_sync_job,
+    get_sync_job,
+    is_sync_job_cancel_requested,
+    release_sync_job,
+    requeue_stale_sync_jobs,
+)
+from app.repositories.strava_activity import upsert_activities, get_latest_activity_date, min_date
+from app.repositories.training_load import refresh_training_load
+from app.services.prediction_service import update_athlete_model
+from app.services.strava_client import strava_client
+from app.services.strava_fetcher import fetch_activities_details
+
+# Intervalle de vérification des synchronisations abandonnées (secondes)
+WATCHDOG_INTERVAL = 60
+
+_executor = None
+_submitted = set()
+_lock = threading.Lock()
+_stopping = threading.Event()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max(1, SYNC_JOB_WORKERS), thread_name_prefix="strava-sync")
+        return _executor
+
+
+def submit_sync_job(job_id: int, session_factory=SessionLocal, client=None) -> bool:
+    """
+    Place une synchronisation dans la file d'exécution du processus.
+
+    Returns:
+        bool: False si elle y était déjà
+    """
+    with _lock:
+        if job_id in _submitted:
+            return False
+        _submitted.add(job_id)
+    _get_executor().submit(_run_submitted, job_id, session_factory, client)
+    return True
+
+
+def _run_submitted(job_id: int, session_factory, client):
+    try:
+        run_sync_job(job_id, session_factory, client)
+    finally:
+        with _lock:
+            _submitted.discard(job_id)
+
+
+def run_sync_job(job_id: int, session_factory=SessionLocal, client=None):
+    """
+    Exécute une synchronisation (dans le thread appelant).
+    Ne fait rien si la synchronisation n'est plus en attente (déjà réclamée ou annulée).
+    """
+    db = session_factory()
+    try:
+        job = claim_sync_job(db, job_id)
+        if job is None:
+            return
+        print(f"Synchronisation {job.id} démarrée pour l'athlète {job.athlete_id} ({job.mode})")
+        try:
+            _sync(db, job, client or strava_client)
+        except Exception as e:
+            db.rollback()
+            error = getattr(e, "detail", None) or str(e)
+            print(f"Synchronisation {job_id} en échec: {error}")
+            job = get_sync_job(db, job_id)
+            if job is not None:
+                finish_sync_job(db, job, SYNC_JOB_FAILED, message="Échec de la synchronisation", error=error)
+    finally:
+        db.close()
+
+
+def _list_activity_ids(db: Session, job: SyncJob, token: str, client) -> List[int]:
+    """
+    Liste les activités à récupérer : toutes (mode "full") ou seulement celles
+    postérieures à la dernière activité en base (mode "intelligent").
+    """
+    response = client.get("/athlete/activities", access_token=token, params={"per_page": 200})
+    response.raise_for_status()
+    base_activities = response.json()
+    if not isinstance(base_activities, list):
+        raise ValueError("Réponse inattendue de Strava")
+
+    if job.mode == "intelligent":
+        latest_date = get_latest_activity_date(db, job.athlete_id)
+        if latest_date:
+            base_activities = [
+                act for act in base_activities
+                # Date Strava sans fuseau horaire, pour la comparaison avec la date de la base
+                if datetime.fromisoformat(act["start_date"].replace("Z", "+00:00")).replace(tzinfo=None) > latest_date
+            ]
+
+    return [act["id"] for act in base_activities if act.get("id")]
+
+
+def _sync(db: Session, job: SyncJob, client):
+    # Import local : strava_auth dépend de FastAPI (dépendances de routes)
+    from app.utils.strava_auth import refresh_strava_token_if_needed
+
+    token = refresh_strava_token_if_needed(db, job.user_id)
+
+    # Liste figée au premier démarrage pour pouvoir reprendre au même endroit
+    if job.activity_ids is None:
+        activity_ids = _list_activity_ids(db, job, token, client)
+        job.activity_ids = json.dumps(activity_ids)
+        job.total_activities = len(activity_ids)
+        job.message = f"{len(activity_ids)} activités à synchroniser"
+        db.commit()
+    else:
+        activity_ids = json.loads(job.activity_ids)
+        if job.processed:
+            print(f"Synchronisation {job.id} reprise à l'activité {job.processed + 1}/{len(activity_ids)}")
+
+    total = len(activity_ids)
+    # Après une reprise, les jours touchés avant l'interruption ne sont pas connus : recalcul complet
+    resumed = job.processed > 0
+    earliest_date = None
+    # Activités récupérées, sauvegardées par lots de SYNC_SAVE_BATCH_SIZE (un upsert et un commit) ;
+    # l'avancement n'est compté qu'une fois le lot sauvegardé, pour reprendre sans rien perdre
+    pending = []
+
+    def flush():
+        nonlocal earliest_date
+        if not pending:
+            return
+        fetched = [full_data for _, full_data, error in pending if not error and full_data]
+        failed = sum(1 for _, _, error in pending if error)
+        if fetched:
+            try:
+                result = upsert_activities(db, job.athlete_id, fetched, update_training_load=False)
+                job.new_activities += result["new_activities"]
+                job.updated_activities += result["updated_activities"]
+                failed += result["failed_activities"]
+                earliest_date = min_date(earliest_date, result["earliest_date"])
+            except Exception as e:
+                db.rollback()
+                print(f"Erreur lors de la sauvegarde de {len(fetched)} activités: {str(e)}")
+                failed += len(fetched)
+        job.failed_activities += failed
+        job.processed += len(pending)
+        job.last_activity_id = pending[-1][0]
+        job.message = f"Chargement de l'activité {job.processed}/{total}"
+        db.commit()
+        pending.clear()
+
+    results = fetch_activities_details(token, activity_ids[job.processed:], client=client)
+    try:
+        for activity_id, full_data, error in results:
+            if _stopping.is_set():
+                # Arrêt du serveur : la synchronisation reprendra au prochain démarrage
+                flush()
+                _refresh_training_load(db, job, earliest_date, resumed)
+                release_sync_job(db, job)
+                return
+            if is_sync_job_cancel_requested(db, job.id):
+                flush()
+                _refresh_training_load(db, job, earliest_date, resumed)
+                _update_prediction_model(db, job)
+                finish_sync_job(db, job, SYNC_JOB_CANCELLED,
+                                message=f"Synchronisation annulée après {job.processed}/{total} activités")
+                return
+
+            if error:
+                print(f"Erreur sur l'activité {activity_id}: {str(error)}")
+            pending.append((activity_id, full_data, error))
+            if len(pending) >= SYNC_SAVE_BATCH_SIZE:
+                flush()
+        flush()
+    finally:
+        results.close()
+
+    _refresh_training_load(db, job, earliest_date, resumed)
+    _update_prediction_model(db, job)
+    finish_sync_job(
+        db, job, SYNC_JOB_COMPLETED,
+        message=f"Synchronisation terminée ! {job.new_activities} nouvelles activités, "
+                f"{job.updated_activities} mises à jour."
+    )
+
+
+def _refresh_training_load(db: Session, job: SyncJob, earliest_date, full: bool):
+    """
+    Recalcule la charge d'entraînement une seule fois pour toute la synchronisation,
+    à partir du premier jour touché (ou entièrement si full).
+    Un échec n'interrompt pas la synchronisation : la charge sera recalculée à la prochaine.
+    """
+    if earliest_date is None and not full:
+        return
+    try:
+        refresh_training_load(db, job.athlete_id, None if full else earliest_date)
+    except Exception as e:
+        db.rollback()
+        print(f"Erreur lors du recalcul de la charge d'entraînement de l'athlète {job.athlete_id}: {e}")
+
+
+def _update_prediction_model(db: Session, job: SyncJob):
+    """
+    Ajoute les nouvelles activités au modèle de prédiction en cache de l'athlète
+    (update_athlete_model), pour que sa prochaine prédiction n'ait pas à le réentraîner.
+    Un échec n'interrompt pas la synchronisation : le modèle sera réentraîné à la prédiction.
+    """
+    if not job.new_activities:
+        return
+    try:
+        update_athlete_model(db, job.athlete_id)
+    except Exception as e:
+        db.rollback()
+        print(f"Erreur lors de la mise à jour du modèle de prédiction de l'athlète {job.athlete_id}: {e}")
+
+
+def resume_sync_jobs(session_factory=SessionLocal) -> List[int]:
+    """
+    Relance les synchronisations en attente et celles abandonnées par un worker
+    (aucune progression depuis SYNC_JOB_STALE_SECONDS).
+
+    Returns:
+        Liste des synchronisations relancées
+    """
+    db = session_factory()
+    try:
+        stale_before = datetime.utcnow() - timedelta(seconds=SYNC_JOB_STALE_SECONDS)
+        job_ids = requeue_stale_sync_jobs(db, stale_before)
+    finally:
+        db.close()
+    resumed = [job_id for job_id in job_ids if submit_sync_job(job_id, session_factory)]
+    if resumed:
+        print(f"Synchronisations relancées: {resumed}")
+    return resumed
+
+
+def _watchdog():
+    while not _stopping.wait(WATCHDOG_INTERVAL):
+        try:
+            resume_sync_jobs()
+        except Exception as e:
+            print(f"Erreur lors de la reprise des synchronisations: {e}")
+
+
+def start_sync_workers():
+    """
+    Démarrage de l'application : reprend les synchronisations interrompues
+    et surveille ensuite périodiquement les synchronisations abandonnées.
+    """
+    _stopping.clear()
+    try:
+        resume_sync_jobs()
+    except Exception as e:
+        print(f"Erreur lors de la reprise des synchronisations: {e}")
+    threading.Thread(target=_watchdog, name="strava-sync-watchdog", daemon=True).start()
+
+
+def stop_sync_workers():
+    """
+    Arrêt de l'application : les synchronisations en cours s'arrêtent après l'activité
+    en cours et sont remises en attente, pour être reprises au prochain démarrage.
+    """
+    global _executor
+    _stopping.set()
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
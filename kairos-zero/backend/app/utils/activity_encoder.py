@@ -0,0 +1,74 @@
+"""
+Encodage des streams d'une activité Strava pour la base.
+
+Une seule étape, partagée par la synchronisation (repositories/strava_activity.py)
+et le recalcul des activités existantes (utils/update_existing_activities.py) :
+- conversion de chaque canal en tableau typé, une seule fois
+- blob binaire des streams (app/utils/activity_streams.py)
+- temps par zone cardiaque et score d'effort calculés sur ces mêmes tableaux
+
+Les fonctions ne dépendent que de leurs arguments (dictionnaires, tableaux NumPy,
+bytes) et peuvent donc s'exécuter dans un processus de travail.
+"""
+
+import json
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+
+from app.config import STREAM_COMPRESSION
+from app.utils.activity_streams import pack_streams, strava_stream_arrays
+from app.utils.heart_rate_zones import ZONE_NAMES, calculate_effort_score, calculate_heart_rate_zones
+
+# Colonne de StravaActivity pour chaque zone (temps en minutes)
+ZONE_COLUMNS = {zone: f"{zone}_time" for zone in ZONE_NAMES}
+
+
+def activity_metrics(arrays: Mapping[str, np.ndarray], max_hr: Optional[int] = None) -> Dict:
+    """
+    Temps par zone cardiaque (minutes) et score d'effort d'une activité.
+
+    Args:
+        arrays: Streams décodés (au moins "time" et "heartrate" pour des zones non nulles)
+        max_hr: Fréquence cardiaque maximale (valeur par défaut de calculate_heart_rate_zones si None)
+
+    Returns:
+        dict: Colonnes zone_1_time ... above_zone_5_time et effort_score
+    """
+    metrics = {column: 0.0 for column in ZONE_COLUMNS.values()}
+    metrics["effort_score"] = 0.0
+
+    time_s = arrays.get("time")
+    heartrate = arrays.get("heartrate")
+    if time_s is None or heartrate is None or len(time_s) == 0 or len(heartrate) == 0:
+        return metrics
+    if any(values.dtype.kind == "f" and np.isnan(values).any() for values in (time_s, heartrate)):
+        # Trous dans les streams (None dans l'API) : pas de zones
+        return metrics
+
+    zone_data = calculate_heart_rate_zones({"time": time_s, "heartrate": heartrate}, max_hr)
+    if not zone_data.get("zones"):
+        return metrics
+    for zone, column in ZONE_COLUMNS.items():
+        if zone in zone_data["zones"]:
+            metrics[column] = zone_data["zones"][zone]["time_minutes"]
+    metrics["effort_score"] = calculate_effort_score(zone_data)
+    return metrics
+
+
+def encode_activity_streams(streams: Mapping[str, Mapping], compress: bool = STREAM_COMPRESSION) -> Dict:
+    """
+    Représentation stockée des streams Strava d'une activité (API, key_by_type=True)
+    et métriques dérivées, en une passe.
+
+    Returns:
+        dict: Colonnes streams (blob), segments (JSON), zone_1_time ... above_zone_5_time
+        et effort_score de StravaActivity
+    """
+    arrays = strava_stream_arrays(streams)
+    segments = streams.get("segments", {}).get("data", [])
+    return {
+        "streams": pack_streams(arrays, compress=compress),
+        "segments": json.dumps(segments) if segments else None,
+        **activity_metrics(arrays),
+    }
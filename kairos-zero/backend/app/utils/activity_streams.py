@@ -0,0 +1,274 @@
+"""
+Stockage binaire colonnaire des streams d'activité Strava.
+
+Chaque activité stocke tous ses streams dans un seul blob (colonne `streams`) :
+un tableau typé par canal (time, distance, altitude...), écrit une seule fois,
+éventuellement compressé par zlib, et relu directement par np.frombuffer.
+
+Format du blob (little-endian) :
+    en-tête : magic b"KZS1", flags (uint8), nombre de canaux (uint8), 2 octets nuls
+    table   : par canal, nom (16 octets ASCII), dtype NumPy (4 octets, ex. b"<f4"), longueur (uint32)
+    données : tableaux concaténés, chacun aligné sur 8 octets
+              (compressés d'un bloc par zlib si le flag STREAM_FLAG_ZLIB est posé)
+
+Les anciennes activités stockent encore leurs streams en JSON dans
+`elevation_data`, `pace_data`, `heartrate_data` et `power_data` :
+load_activity_streams lit les deux formats.
+"""
+
+import json
+import struct
+import zlib
+from typing import Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+from app.config import STREAM_COMPRESSION
+
+STREAM_MAGIC = b"KZS1"
+STREAM_FLAG_ZLIB = 0x01
+
+# Canaux stockés et leur type (unités Strava : secondes, mètres, m/s, bpm, rpm, watts)
+STREAM_DTYPES = {
+    "time": "<i4",
+    "distance": "<f4",
+    "altitude": "<f4",
+    "velocity_smooth": "<f4",
+    "heartrate": "<i2",
+    "cadence": "<i2",
+    "watts": "<i2",
+}
+
+_HEADER = struct.Struct("<4sBB2x")
+_CHANNEL = struct.Struct("<16s4sI")
+_ALIGNMENT = 8
+
+
+class StreamDecodeError(ValueError):
+    """Levée lorsqu'un blob de streams est illisible."""
+
+
+def _to_array(name: str, values) -> np.ndarray:
+    """Convertit un stream en tableau typé ; les canaux entiers avec trous passent en float32 (NaN)."""
+    dtype = np.dtype(STREAM_DTYPES.get(name, "<f4"))
+    arr = np.asarray(values)
+    if arr.dtype == dtype:
+        return arr
+    if arr.dtype == object:
+        # None dans le stream (ex. velocity_smooth à l'arrêt)
+        arr = np.array(values, dtype=np.float64)
+    if dtype.kind == "i" and arr.dtype.kind == "f":
+        if not np.all(np.isfinite(arr)) or np.any(arr != np.round(arr)):
+            dtype = np.dtype("<f4")
+    return arr.astype(dtype)
+
+
+def encode_streams(streams: Mapping[str, Sequence], compress: bool = STREAM_COMPRESSION) -> Optional[bytes]:
+    """
+    Encode des streams en blob binaire.
+
+    Args:
+        streams: Dictionnaire canal -> valeurs (liste ou tableau NumPy)
+        compress: Compresse le bloc de données avec zlib
+
+    Returns:
+        bytes: Blob à stocker dans StravaActivity.streams, ou None si aucun canal n'est rempli
+    """
+    return pack_streams(stream_arrays(streams), compress=compress)
+
+
+def stream_arrays(streams: Mapping[str, Sequence]) -> Dict[str, np.ndarray]:
+    """
+    Convertit des streams en tableaux typés (STREAM_DTYPES), canaux vides ignorés.
+    """
+    arrays = {}
+    for name, values in streams.items():
+        if values is None or len(values) == 0:
+            continue
+        arrays[name] = _to_array(name, values)
+    return arrays
+
+
+def pack_streams(arrays: Mapping[str, np.ndarray], compress: bool = STREAM_COMPRESSION) -> Optional[bytes]:
+    """
+    Écrit des tableaux déjà typés (stream_arrays) dans un blob binaire, ou None s'il n'y en a aucun.
+    """
+    if not arrays:
+        return None
+
+    table = []
+    chunks = []
+    for name, arr in arrays.items():
+        table.append(_CHANNEL.pack(name.encode("ascii"), arr.dtype.str.encode("ascii"), len(arr)))
+        raw = arr.tobytes()
+        padding = -len(raw) % _ALIGNMENT
+        chunks.append(raw + b"\x00" * padding)
+
+    payload = b"".join(chunks)
+    flags = 0
+    if compress:
+        payload = zlib.compress(payload, 1)
+        flags |= STREAM_FLAG_ZLIB
+
+    return _HEADER.pack(STREAM_MAGIC, flags, len(arrays)) + b"".join(table) + payload
+
+
+def strava_stream_arrays(streams: Mapping[str, Mapping]) -> Dict[str, np.ndarray]:
+    """
+    Tableaux typés des canaux stockés, depuis les streams de l'API Strava (key_by_type=True).
+    """
+    return stream_arrays({name: streams.get(name, {}).get("data", []) for name in STREAM_DTYPES})
+
+
+def encode_strava_streams(streams: Mapping[str, Mapping], compress: bool = STREAM_COMPRESSION) -> Optional[bytes]:
+    """
+    Encode les streams tels que renvoyés par l'API Strava (key_by_type=True).
+    """
+    return pack_streams(strava_stream_arrays(streams), compress=compress)
+
+
+def decode_streams(blob: bytes) -> Dict[str, np.ndarray]:
+    """
+    Décode un blob de streams.
+
+    Les tableaux sont des vues en lecture seule sur le buffer (aucune copie
+    par canal) ; les copier avant de les modifier.
+
+    Raises:
+        StreamDecodeError: Si le blob n'est pas au format attendu
+    """
+    blob = bytes(blob)
+    try:
+        magic, flags, n_channels = _HEADER.unpack_from(blob, 0)
+    except struct.error as e:
+        raise StreamDecodeError(f"En-tête de streams invalide: {e}")
+    if magic != STREAM_MAGIC:
+        raise StreamDecodeError(f"Signature de streams inconnue: {magic!r}")
+
+    table_end = _HEADER.size + n_channels * _CHANNEL.size
+    try:
+        channels = [_CHANNEL.unpack_from(blob, _HEADER.size + i * _CHANNEL.size) for i in range(n_channels)]
+    except struct.error as e:
+        raise StreamDecodeError(f"Table des canaux invalide: {e}")
+
+    payload = memoryview(blob)[table_end:]
+    if flags & STREAM_FLAG_ZLIB:
+        try:
+            payload = zlib.decompress(payload)
+        except zlib.error as e:
+            raise StreamDecodeError(f"Données de streams corrompues: {e}")
+
+    streams = {}
+    offset = 0
+    for raw_name, raw_dtype, length in channels:
+        dtype = np.dtype(raw_dtype.rstrip(b"\x00").decode("ascii"))
+        try:
+            streams[raw_name.rstrip(b"\x00").decode("ascii")] = np.frombuffer(
+                payload, dtype=dtype, count=length, offset=offset
+            )
+        except ValueError as e:
+            raise StreamDecodeError(f"Canal tronqué: {e}")
+        nbytes = length * dtype.itemsize
+        offset += nbytes + (-nbytes % _ALIGNMENT)
+    return streams
+
+
+def _load_json(value) -> Optional[dict]:
+    if not value:
+        return None
+    try:
+        data = json.loads(value)
+    except (json.JSONDecodeError, TypeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def streams_from_legacy_json(elevation_data: Optional[str], pace_data: Optional[str],
+                             heartrate_data: Optional[str], power_data: Optional[str]) -> Dict[str, np.ndarray]:
+    """
+    Reconstruit les streams (unités Strava) depuis les anciennes colonnes JSON.
+
+    Les distances étaient stockées en km et la vitesse en km/h.
+    """
+    elevation = _load_json(elevation_data) or {}
+    pace = _load_json(pace_data) or {}
+    heartrate = _load_json(heartrate_data) or {}
+    power = _load_json(power_data) or {}
+
+    raw = {
+        "time": pace.get("time") or heartrate.get("time") or power.get("time"),
+        "distance": pace.get("distance") or elevation.get("distance"),
+        "altitude": elevation.get("altitude"),
+        "velocity_smooth": pace.get("velocity"),
+        "heartrate": heartrate.get("heartrate"),
+        "cadence": power.get("cadence"),
+        "watts": power.get("watts"),
+    }
+
+    streams = {}
+    for name, values in raw.items():
+        if not values:
+            continue
+        arr = np.array(values, dtype=np.float64)
+        if name == "distance":
+            arr *= 1000
+        elif name == "velocity_smooth":
+            arr /= 3.6
+        streams[name] = arr
+    return streams
+
+
+def load_activity_streams(activity) -> Dict[str, np.ndarray]:
+    """
+    Charge les streams d'une activité, quel que soit son format de stockage.
+
+    Args:
+        activity: StravaActivity (ou tout objet avec les mêmes attributs)
+
+    Returns:
+        Dict canal -> tableau NumPy, vide si l'activité n'a pas de streams lisibles
+    """
+    blob = getattr(activity, "streams", None)
+    if blob:
+        try:
+            return decode_streams(blob)
+        except StreamDecodeError as e:
+            print(f"Activité {getattr(activity, 'id', '?')}: streams illisibles ({e})")
+            return {}
+    return streams_from_legacy_json(
+        activity.elevation_data, activity.pace_data, activity.heartrate_data, activity.power_data
+    )
+
+
+def legacy_payloads(streams: Mapping[str, np.ndarray]) -> Dict[str, Optional[dict]]:
+    """
+    Présente des streams sous la forme des anciennes colonnes JSON (distance en km,
+    vitesse en km/h), attendue par les modèles de prédiction.
+
+    Returns:
+        Dict avec les clés elevation_data, pace_data, heartrate_data et power_data
+        (None lorsque les canaux correspondants manquent)
+    """
+    time_s = streams.get("time")
+    distance_km = np.divide(streams["distance"], 1000, dtype=np.float64) if "distance" in streams else None
+    altitude = streams.get("altitude")
+    velocity = streams.get("velocity_smooth")
+    heartrate = streams.get("heartrate")
+    watts = streams.get("watts")
+    cadence = streams.get("cadence")
+
+    def payload(**channels):
+        return {name: values for name, values in channels.items() if values is not None}
+
+    return {
+        "elevation_data": payload(distance=distance_km, altitude=altitude)
+        if distance_km is not None or altitude is not None else None,
+        "pace_data": payload(time=time_s, distance=distance_km,
+                             velocity=np.round(velocity * 3.6, 2) if velocity is not None else None)
+        if time_s is not None or distance_km is not None or velocity is not None else None,
+        "heartrate_data": payload(time=time_s, heartrate=heartrate)
+        if time_s is not None or heartrate is not None else None,
+        "power_data": payload(watts=watts, cadence=cadence, time=time_s)
+        if watts is not None or cadence is not None else None,
+    }
+
@@ -94,5 +94,9 @@ def get_user_id_from_token(token: str) -> Optional[int]:
     """
     payload = verify_token(token)
     if payload:
-        return payload.get("sub")
+        # "sub" est une chaîne dans le JWT : converti pour servir de clé (cache des identités)
+        try:
+            return int(payload.get("sub"))
+        except (TypeError, ValueError):
+            return None
     return None 
\ No newline at end of file
@@ -1,7 +1,6 @@
 import sys
 import os
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
 
 # Ajouter le répertoire backend au PYTHONPATH
@@ -25,21 +24,39 @@ def clean_nan_values(data_list):
             cleaned.append(float(value))
     return cleaned
 
-def ACWR(df):
-    df = df.sort_values("start_date")
-    df["Charge_aigue"] = df["effort_score"].rolling(window=7, min_periods=1).mean()
-    df["Charge_chronique"] = df["effort_score"].rolling(window=28, min_periods=1).mean()
-    df["Ratio_AC"] = df["Charge_aigue"] / df["Charge_chronique"]
-    return df
+def ACWR(df, method="rolling"):
+    """
+    Ratio charge aiguë / charge chronique sur des jours calendaires.
+    Les scores d'effort sont additionnés par jour (jours de repos à 0) avant les
+    fenêtres de 7 et 28 jours ; voir calendar_acwr (app/utils/training_load.py).
 
-def fatigue(fatigue_pre, effort):
-    tau = 15
+    Args:
+        df: Colonnes start_date et effort_score (l'ordre des lignes est indifférent)
+        method: "rolling" (moyennes glissantes) ou "ewma" (moyennes exponentielles)
+
+    Returns:
+        DataFrame avec une ligne par jour : start_date, effort_score, Charge_aigue, Charge_chronique, Ratio_AC
+    """
+    # Import local : training_load dépend de ce module (calcul_ffm)
+    from app.utils.training_load import calendar_acwr
+    daily = calendar_acwr(df[["start_date", "effort_score"]], method=method)
+    return daily.rename(columns={
+        "date": "start_date",
+        "effort": "effort_score",
+        "acute_load": "Charge_aigue",
+        "chronic_load": "Charge_chronique",
+        "acwr": "Ratio_AC",
+    })
+
+# Constantes de temps par défaut du modèle fitness-fatigue (jours)
+TAU_FATIGUE = 15
+TAU_FITNESS = 45
+
+def fatigue(fatigue_pre, effort, tau=TAU_FATIGUE):
     fatigue_post = (effort + np.exp(-1/tau)*fatigue_pre) 
     return fatigue_post
 
-def fitness(fitness_pre, effort):
-    tau = 45
-    tau_prime = 5
+def fitness(fitness_pre, effort, tau=TAU_FITNESS):
     fitness_post = effort + (np.exp(-1/tau)) * fitness_pre
     return fitness_post
 
@@ -65,25 +82,68 @@ def rapport(fatigue_pre, performance):
         rapport = 150
     return rapport
 
-def courbe_ffm(df):
-    courbe_fatigue = []
-    courbe_fitness = []
-    courbe_performance = []
-    courbe_forme = []
-    courbe_rapport = []
-    fatigue_pre = 0
-    fitness_pre = 0
-    for i in range(len(df)):
-        instant_fatigue = fatigue(fatigue_pre, df.iloc[i]['effort_score'])
-        instant_fitness = fitness(fitness_pre, df.iloc[i]['effort_score'])
-        instant_performance = performance(fitness_pre, fatigue_pre, df.iloc[i]['effort_score'])
-        instant_forme = forme(fitness_pre, fatigue_pre, df.iloc[i]['effort_score'])
-        instant_rapport = rapport(fatigue_pre, instant_performance)
-        fatigue_pre, fitness_pre = fatigue_fitness(instant_fatigue, instant_fitness, df.iloc[i]['effort_score'])
-        courbe_fatigue.append(instant_fatigue)
-        courbe_fitness.append(instant_fitness)
-        courbe_performance.append(instant_performance)
-        courbe_forme.append(instant_forme)
-        courbe_rapport.append(instant_rapport)
-    return courbe_fatigue, courbe_fitness, courbe_performance, courbe_forme, courbe_rapport, fatigue_pre, fitness_pre
+def _etats_avant_seance(effort, tau, etat_initial=0.0):
+    """
+    État (fatigue ou fitness) avant et après chaque séance.
+
+    Comme courbe_ffm applique la décroissance deux fois par séance (valeur instantanée
+    puis mise à jour de l'état), l'état suit la récurrence du premier ordre
+        etat[i+1] = (1 + d) * effort[i] + d² * etat[i],  avec d = exp(-1/tau)
+    calculée d'un bloc par un filtre récursif.
+    """
+    from scipy.signal import lfilter  # import différé : scipy n'est chargé qu'au premier calcul
+
+    decay = np.exp(-1/tau)
+    if len(effort) == 0:
+        return np.zeros(0), np.zeros(0)
+    apres, _ = lfilter([1 + decay], [1, -decay**2], effort, zi=[decay**2 * etat_initial])
+    avant = np.empty(len(effort))
+    avant[0] = etat_initial
+    avant[1:] = apres[:-1]
+    return avant, apres
+
+def calcul_ffm(effort, tau_fatigue=TAU_FATIGUE, tau_fitness=TAU_FITNESS, fatigue_initiale=0.0, fitness_initiale=0.0):
+    """
+    Modèle fitness-fatigue (Banister) sur tout l'historique, en opérations sur tableaux.
+
+    Args:
+        effort: Scores d'effort des séances, dans l'ordre chronologique
+        tau_fatigue, tau_fitness: Constantes de temps de l'athlète (jours)
+        fatigue_initiale, fitness_initiale: État avant la première séance
+            (permet de reprendre un calcul déjà fait)
+
+    Returns:
+        dict: Courbes "fatigue", "fitness", "performance", "forme" et "rapport" (tableaux NumPy),
+              états après chaque séance "fatigue_etat" / "fitness_etat"
+              et états finaux "fatigue_pre" / "fitness_pre"
+    """
+    effort = np.asarray(effort, dtype=np.float64)
+    fatigue_avant, fatigue_apres = _etats_avant_seance(effort, tau_fatigue, fatigue_initiale)
+    fitness_avant, fitness_apres = _etats_avant_seance(effort, tau_fitness, fitness_initiale)
+
+    courbe_fatigue = effort + np.exp(-1/tau_fatigue) * fatigue_avant
+    courbe_fitness = effort + np.exp(-1/tau_fitness) * fitness_avant
+    courbe_performance = (courbe_fitness - courbe_fatigue)/2
+    courbe_forme = courbe_fitness - 2*courbe_fatigue
+
+    # Même règle que rapport() : 150 si la performance est nulle, négative ou NaN
+    positive = courbe_performance > 0
+    courbe_rapport = np.full(len(effort), 150.0)
+    courbe_rapport[positive] = (fatigue_avant[positive]/courbe_performance[positive])*100
+
+    return {
+        "fatigue": courbe_fatigue,
+        "fitness": courbe_fitness,
+        "performance": courbe_performance,
+        "forme": courbe_forme,
+        "rapport": courbe_rapport,
+        "fatigue_etat": fatigue_apres,
+        "fitness_etat": fitness_apres,
+        "fatigue_pre": float(fatigue_apres[-1]) if len(effort) else float(fatigue_initiale),
+        "fitness_pre": float(fitness_apres[-1]) if len(effort) else float(fitness_initiale),
+    }
 
+def courbe_ffm(df, tau_fatigue=TAU_FATIGUE, tau_fitness=TAU_FITNESS):
+    ffm = calcul_ffm(df['effort_score'].to_numpy(dtype=np.float64), tau_fatigue, tau_fitness)
+    return (ffm["fatigue"].tolist(), ffm["fitness"].tolist(), ffm["performance"].tolist(),
+            ffm["forme"].tolist(), ffm["rapport"].tolist(), ffm["fatigue_pre"], ffm["fitness_pre"])
@@ -7,11 +7,24 @@ Fonctionnalités :
 - Nettoyage et normalisation des données
 """
 
+import io
 import gpxpy
-from typing import List
+import numpy as np
+from array import array
+from datetime import datetime, timezone
+from typing import BinaryIO, List, Optional, Tuple, Union
+from xml.etree import ElementTree
 from gpxpy.gpx import GPXTrackPoint
 from math import sin, cos, atan2, sqrt, radians
 
+# Rayon de la Terre en mètres
+EARTH_RADIUS = 6371000
+
+# Points suivants examinés en bloc pour trouver le prochain point d'ancrage ;
+# au-delà, seuls les points restants sont traités par fenêtres de ANCHOR_BLOCK_SIZE lignes
+ANCHOR_LOOKAHEAD = 16
+ANCHOR_BLOCK_SIZE = 4096
+
 def parse_gpx(file_path: str) -> List[GPXTrackPoint]:
     """Lit et analyse un fichier GPX pour extraire les points de trajectoire."""
     try:
@@ -234,4 +247,326 @@ def calculate_elevation_stats(points: List[GPXTrackPoint]) -> dict:
         'min_elevation': min_elevation,
         'max_elevation': max_elevation,
         'total_elevation_change': max_elevation - min_elevation
-    }
\ No newline at end of file
+    }
+
+
+class GPXTrack:
+    """
+    Trace GPX stockée en tableaux NumPy contigus (float64).
+
+    Attributes:
+        latitude, longitude: Coordonnées en degrés
+        elevation: Altitude en mètres (0 si absente, comme parse_gpx)
+        time: Horodatage en secondes depuis l'epoch (NaN si absent)
+    """
+
+    def __init__(self, latitude, longitude, elevation, time=None):
+        self.latitude = np.ascontiguousarray(latitude, dtype=np.float64)
+        self.longitude = np.ascontiguousarray(longitude, dtype=np.float64)
+        self.elevation = np.ascontiguousarray(elevation, dtype=np.float64)
+        if time is None:
+            time = np.full(len(self.latitude), np.nan)
+        self.time = np.ascontiguousarray(time, dtype=np.float64)
+        self._radians = None
+        self._segment_distances = None
+
+    def __len__(self):
+        return len(self.latitude)
+
+    def radians(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(latitude, longitude) en radians et cosinus des latitudes, calculés une seule fois par trace."""
+        if self._radians is None:
+            lat, lon = np.radians(self.latitude), np.radians(self.longitude)
+            self._radians = (lat, lon, np.cos(lat))
+        return self._radians
+
+    def with_elevation(self, elevation) -> "GPXTrack":
+        """Même trace avec d'autres altitudes (la géométrie en cache est partagée)."""
+        track = GPXTrack(self.latitude, self.longitude, elevation, self.time)
+        track._radians = self._radians
+        track._segment_distances = self._segment_distances
+        return track
+
+    @classmethod
+    def from_points(cls, points) -> "GPXTrack":
+        """Construit une trace à partir de points gpxpy (ou de tout objet latitude/longitude/elevation/time)."""
+        n = len(points)
+        return cls(
+            np.fromiter((p.latitude for p in points), dtype=np.float64, count=n),
+            np.fromiter((p.longitude for p in points), dtype=np.float64, count=n),
+            np.fromiter((p.elevation or 0 for p in points), dtype=np.float64, count=n),
+            np.fromiter((p.time.timestamp() if getattr(p, "time", None) else np.nan for p in points),
+                        dtype=np.float64, count=n)
+        )
+
+
+def _local_name(tag: str) -> str:
+    """Nom de balise sans espace de noms ('{http://www.topografix.com/GPX/1/1}trkpt' -> 'trkpt')."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _parse_gpx_time(text: str) -> float:
+    """Horodatage GPX (ISO 8601) en secondes depuis l'epoch, NaN si illisible ; UTC si sans fuseau."""
+    try:
+        value = datetime.fromisoformat(text.strip().replace('Z', '+00:00'))
+    except ValueError:
+        return np.nan
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def parse_gpx_stream(source: Union[str, bytes, BinaryIO]) -> Optional[GPXTrack]:
+    """
+    Lit les points de trace d'un GPX de façon incrémentale, sans construire l'arbre gpxpy.
+
+    Chaque <trkpt> est lu dans des tableaux numériques extensibles puis supprimé
+    de l'arbre XML : la mémoire reste proportionnelle au nombre de points.
+
+    Args:
+        source: Chemin du fichier, contenu du fichier (bytes) ou objet fichier binaire
+
+    Returns:
+        GPXTrack, ou None si le GPX est illisible ou ne contient aucun point de trace
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+
+    latitude, longitude = array('d'), array('d')
+    elevation, time = array('d'), array('d')
+
+    try:
+        parents = []
+        point_elevation, point_time = 0.0, np.nan
+        for event, elem in ElementTree.iterparse(source, events=('start', 'end')):
+            name = _local_name(elem.tag)
+            if event == 'start':
+                parents.append(elem)
+                if name == 'trkpt':
+                    point_elevation, point_time = 0.0, np.nan
+                continue
+
+            parents.pop()
+            if name == 'ele' and elem.text:
+                point_elevation = float(elem.text)
+            elif name == 'time' and elem.text:
+                point_time = _parse_gpx_time(elem.text)
+            elif name == 'trkpt':
+                latitude.append(float(elem.get('lat')))
+                longitude.append(float(elem.get('lon')))
+                elevation.append(point_elevation)
+                time.append(point_time)
+                # Libère le point : le segment parent ne garde aucun enfant
+                elem.clear()
+                if parents:
+                    parents[-1].remove(elem)
+
+        if not latitude:
+            raise ValueError("Aucun point trouvé dans le fichier GPX")
+
+        return GPXTrack(
+            np.frombuffer(latitude, dtype=np.float64),
+            np.frombuffer(longitude, dtype=np.float64),
+            np.frombuffer(elevation, dtype=np.float64),
+            np.frombuffer(time, dtype=np.float64)
+        )
+    except Exception as e:
+        print(f"Error in parse_gpx_stream: {e}")
+        return None
+
+
+def parse_gpx_track(file_path: str) -> Optional[GPXTrack]:
+    """
+    Lit un fichier GPX et renvoie sa trace en tableaux NumPy (voir parse_gpx_stream).
+
+    Returns:
+        GPXTrack, ou None si le fichier est illisible ou ne contient aucun point
+    """
+    return parse_gpx_stream(file_path)
+
+
+def haversine_distances(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Version vectorisée de haversine_distance : distances en mètres entre
+    des tableaux de coordonnées en degrés (diffusion NumPy).
+    """
+    lat1, lon1 = np.radians(lat1), np.radians(lon1)
+    lat2, lon2 = np.radians(lat2), np.radians(lon2)
+    return _haversine_radians(lat1, lon1, np.cos(lat1), lat2, lon2, np.cos(lat2))
+
+
+def _haversine_radians(lat1, lon1, cos_lat1, lat2, lon2, cos_lat2) -> np.ndarray:
+    """Formule de Haversine sur des coordonnées déjà en radians, cosinus des latitudes précalculés."""
+    a = np.sin((lat2 - lat1)/2)**2 + cos_lat1 * cos_lat2 * np.sin((lon2 - lon1)/2)**2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
+    return EARTH_RADIUS * c
+
+
+def track_segment_distances(track: GPXTrack) -> np.ndarray:
+    """Distances en mètres entre points consécutifs (N-1 valeurs), en cache sur la trace."""
+    if track._segment_distances is None:
+        lat, lon, cos_lat = track.radians()
+        distances = _haversine_radians(lat[:-1], lon[:-1], cos_lat[:-1], lat[1:], lon[1:], cos_lat[1:])
+        distances.setflags(write=False)
+        track._segment_distances = distances
+    return track._segment_distances
+
+
+def track_slope_profile(track: GPXTrack) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Version vectorisée de calculate_slope_profile.
+
+    Returns:
+        tuple: (distances cumulées en mètres (N,), pentes en % (N-1,))
+    """
+    segment_distances = track_segment_distances(track)
+    elevation_change = np.diff(track.elevation)
+
+    slopes = np.zeros_like(segment_distances)
+    moving = segment_distances > 0
+    slopes[moving] = (elevation_change[moving] / segment_distances[moving]) * 100
+
+    distances = np.concatenate(([0.0], np.cumsum(segment_distances)))
+    return distances, slopes
+
+
+def _anchor_walk(track: GPXTrack, min_distance: float) -> Tuple[np.ndarray, bool]:
+    """
+    Reproduit le parcours par points d'ancrage de calculate_elevation_gain : depuis
+    l'ancre courante, on cumule les distances ancre -> point jusqu'à atteindre
+    min_distance, et ce point devient la nouvelle ancre.
+
+    Le prochain point d'ancrage de chaque point est calculé en bloc sur une fenêtre
+    de points suivants, élargie seulement pour les points qui ne l'atteignent pas ;
+    seule la chaîne des ancres est ensuite suivie en Python.
+
+    Returns:
+        tuple: (indices des ancres, True si un segment partiel reste après la dernière ancre)
+    """
+    n = len(track)
+    lat, lon, cos_lat = track.radians()
+
+    def distances_from(rows, cols):
+        return _haversine_radians(lat[rows], lon[rows], cos_lat[rows], lat[cols], lon[cols], cos_lat[cols])
+
+    # next_anchor[i] : prochaine ancre depuis i, -1 si la fin de la trace est atteinte avant
+    next_anchor = np.full(n, -1, dtype=np.int64)
+    rows = np.arange(n - 1)
+
+    # Décalages 1..ANCHOR_LOOKAHEAD : distances i -> i+k sur des tranches contiguës
+    cumulative = np.zeros(n - 1)
+    for k in range(1, min(ANCHOR_LOOKAHEAD, n - 1) + 1):
+        m = n - k
+        if k == 1:
+            cumulative += track_segment_distances(track)
+        else:
+            cumulative[:m] += _haversine_radians(lat[:m], lon[:m], cos_lat[:m], lat[k:], lon[k:], cos_lat[k:])
+        reached = (cumulative[:m] >= min_distance) & (next_anchor[:m] == -1)
+        next_anchor[:m][reached] = rows[:m][reached] + k
+        if not np.any(next_anchor[:m - 1] == -1):
+            break
+
+    # Points encore sans ancre loin de la fin (arrêts, points dupliqués) : fenêtre élargie
+    lookahead = 2 * ANCHOR_LOOKAHEAD
+    pending = rows[(next_anchor[:-1] == -1) & (rows + ANCHOR_LOOKAHEAD < n - 1)]
+    while len(pending):
+        for start in range(0, len(pending), ANCHOR_BLOCK_SIZE):
+            block = pending[start:start + ANCHOR_BLOCK_SIZE, np.newaxis]
+            cols = block + np.arange(1, lookahead + 1)
+            in_track = cols < n
+            window = np.cumsum(distances_from(block, np.minimum(cols, n - 1)) * in_track, axis=1)
+            hit = (window >= min_distance) & in_track
+            found = hit.any(axis=1)
+            next_anchor[block[found, 0]] = block[found, 0] + hit[found].argmax(axis=1) + 1
+        pending = pending[(next_anchor[pending] == -1) & (pending + lookahead < n - 1)]
+        lookahead *= 2
+
+    next_anchor = next_anchor.tolist()
+    anchors = [0]
+    anchor = 0
+    while next_anchor[anchor] != -1:
+        anchor = next_anchor[anchor]
+        anchors.append(anchor)
+
+    tail = anchor < n - 1 and bool(np.any(distances_from(anchor, np.arange(anchor + 1, n)) > 0))
+    return np.asarray(anchors), tail
+
+
+def track_elevation_gain(track: GPXTrack, min_distance: float = 50.0, min_elevation_gain: float = 2.0) -> float:
+    """
+    Version vectorisée de calculate_elevation_gain (mêmes paramètres, même résultat).
+    """
+    if track is None or len(track) < 2:
+        return 0.0
+
+    anchors, tail = _anchor_walk(track, min_distance)
+    diffs = np.diff(track.elevation[anchors])
+    # Somme séquentielle, dans le même ordre que la boucle d'origine
+    elevation_gain = sum(diffs[diffs >= min_elevation_gain].tolist(), 0.0)
+
+    # Dernier segment éventuel
+    if tail:
+        last_diff = track.elevation[-1] - track.elevation[anchors[-1]]
+        if last_diff >= min_elevation_gain:
+            elevation_gain += last_diff
+
+    return elevation_gain
+
+
+def smooth_elevations(elevation: np.ndarray, smoothing_factor: float = 0.1) -> np.ndarray:
+    """Moyenne pondérée sur 3 points (extrémités inchangées), comme calculate_elevation_gain_smoothed."""
+    smoothed = elevation.copy()
+    smoothed[1:-1] = (elevation[:-2] * smoothing_factor + elevation[1:-1] * (1 - 2*smoothing_factor)
+                      + elevation[2:] * smoothing_factor)
+    return smoothed
+
+
+def track_elevation_gain_smoothed(track: GPXTrack, min_distance: float = 100.0, smoothing_factor: float = 0.1) -> float:
+    """
+    Version vectorisée de calculate_elevation_gain_smoothed.
+    """
+    if track is None or len(track) < 3:
+        return 0.0
+
+    smoothed = track.with_elevation(smooth_elevations(track.elevation, smoothing_factor))
+    return track_elevation_gain(smoothed, min_distance)
+
+
+def track_elevation_stats(track: GPXTrack) -> dict:
+    """
+    Version vectorisée de calculate_elevation_stats.
+    """
+    if track is None or len(track) == 0:
+        return {
+            'elevation_gain': 0.0,
+            'elevation_loss': 0.0,
+            'min_elevation': 0.0,
+            'max_elevation': 0.0,
+            'total_elevation_change': 0.0
+        }
+
+    min_elevation = float(np.min(track.elevation))
+    max_elevation = float(np.max(track.elevation))
+
+    elevation_gain = track_elevation_gain(track)
+
+    # Dénivelé négatif (descentes), ancres tous les 10 m minimum
+    elevation_loss = 0.0
+    if len(track) >= 2:
+        anchors, tail = _anchor_walk(track, 10.0)
+        diffs = np.diff(track.elevation[anchors])
+        elevation_loss = sum(np.abs(diffs[diffs < 0]).tolist(), 0.0)
+
+        # Dernier segment
+        if tail:
+            elevation_diff = track.elevation[-1] - track.elevation[anchors[-1]]
+            if elevation_diff < 0:
+                elevation_loss += abs(elevation_diff)
+
+    return {
+        'elevation_gain': elevation_gain,
+        'elevation_loss': elevation_loss,
+        'min_elevation': min_elevation,
+        'max_elevation': max_elevation,
+        'total_elevation_change': max_elevation - min_elevation
+    }
@@ -4,16 +4,81 @@ Calcule le temps passé dans chaque zone cardiaque à partir des données de str
 """
 
 import json
-from typing import Dict, List, Tuple
+from typing import Dict, List, Mapping, Sequence, Tuple, Union
 from datetime import timedelta
 
+import numpy as np
 
-def calculate_heart_rate_zones(heartrate_data: str, max_hr: int = None) -> Dict:
+# Zones dans l'ordre du résumé renvoyé par calculate_heart_rate_zones
+ZONE_NAMES = ("zone_1", "zone_2", "zone_3", "zone_4", "zone_5", "below_zone_1", "above_zone_5")
+
+# Bornes des zones 1 à 5 en % de FCMax
+ZONE_FRACTIONS = (0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+
+def zone_limits(max_hr: float) -> Dict[str, Tuple[float, float]]:
+    """
+    Bornes [min, max[ des zones 1 à 5 en bpm.
+    """
+    return {
+        "zone_1": (0.5 * max_hr, 0.6 * max_hr),      # Récupération
+        "zone_2": (0.6 * max_hr, 0.7 * max_hr),      # Endurance
+        "zone_3": (0.7 * max_hr, 0.8 * max_hr),      # Aérobie
+        "zone_4": (0.8 * max_hr, 0.9 * max_hr),      # Seuil
+        "zone_5": (0.9 * max_hr, max_hr)             # Anaérobie
+    }
+
+
+def _as_numeric(values) -> np.ndarray:
+    arr = np.asarray(values)
+    if arr.dtype == object:
+        # Valeurs manquantes (None) : même échec que la comparaison en Python
+        raise TypeError("Valeurs non numériques dans le stream")
+    return arr
+
+
+def heart_rate_zone_times(time_values: Sequence, heartrate_values: Sequence, max_hr: float) -> List:
+    """
+    Temps (secondes) passé dans chaque zone, dans l'ordre de ZONE_NAMES.
+
+    Chaque échantillon i compte pour la durée jusqu'à l'échantillon suivant
+    (time[i + 1] - time[i]) ; le dernier échantillon ne compte pas.
+
+    Args:
+        time_values: Temps en secondes (liste ou tableau NumPy)
+        heartrate_values: Fréquence cardiaque en bpm (liste ou tableau NumPy)
+        max_hr: Fréquence cardiaque maximale
+
+    Returns:
+        Liste de 7 durées (entiers si les temps sont entiers)
+    """
+    time_arr = _as_numeric(time_values)
+    hr = _as_numeric(heartrate_values)[:-1]
+
+    # Durée de chaque échantillon (0 si le stream de temps est plus court)
+    dt = np.zeros(len(hr), dtype=np.result_type(time_arr.dtype, np.int64))
+    n_dt = min(len(hr), len(time_arr) - 1)
+    if n_dt > 0:
+        dt[:n_dt] = np.diff(time_arr[:n_dt + 1])
+
+    # 0 : sous la zone 1, 1 à 5 : zones, 6 : au-dessus de la zone 5 (et NaN)
+    edges = np.array([fraction * max_hr for fraction in ZONE_FRACTIONS])
+    bins = np.digitize(hr, edges)
+    totals = np.bincount(bins, weights=dt, minlength=len(edges) + 1)
+
+    ordered = np.concatenate((totals[1:6], totals[:1], totals[6:]))
+    if dt.dtype.kind in "iu":
+        return [int(t) for t in ordered]
+    return ordered.tolist()
+
+
+def calculate_heart_rate_zones(heartrate_data: Union[str, Mapping], max_hr: int = None) -> Dict:
     """
     Calcule le temps passé dans chaque zone cardiaque.
     
     Args:
-        heartrate_data: Données JSON des streams de fréquence cardiaque
+        heartrate_data: Streams de fréquence cardiaque {"time": [...], "heartrate": [...]},
+            en dictionnaire (listes ou tableaux NumPy) ou en JSON (anciennes activités)
         max_hr: Fréquence cardiaque maximale (si None, utilise la formule 220-âge)
         
     Returns:
@@ -28,12 +93,12 @@ def calculate_heart_rate_zones(heartrate_data: str, max_hr: int = None) -> Dict:
         }
     
     try:
-        # Parse les données JSON
-        data = json.loads(heartrate_data)
-        heartrate_values = data.get("heartrate", [])
-        time_values = data.get("time", [])
+        # Parse les données JSON des anciennes activités
+        data = json.loads(heartrate_data) if isinstance(heartrate_data, str) else heartrate_data
+        heartrate_values = data.get("heartrate")
+        time_values = data.get("time")
         
-        if not heartrate_values or not time_values:
+        if heartrate_values is None or time_values is None or len(heartrate_values) == 0 or len(time_values) == 0:
             return {
                 "zones": {},
                 "total_time": 0,
@@ -46,37 +111,11 @@ def calculate_heart_rate_zones(heartrate_data: str, max_hr: int = None) -> Dict:
             max_hr = 194
         
         # Définition des zones (en % de FCMax)
-        zones = {
-            "zone_1": (0.5 * max_hr, 0.6 * max_hr),      # Récupération
-            "zone_2": (0.6 * max_hr, 0.7 * max_hr),      # Endurance
-            "zone_3": (0.7 * max_hr, 0.8 * max_hr),      # Aérobie
-            "zone_4": (0.8 * max_hr, 0.9 * max_hr),      # Seuil
-            "zone_5": (0.9 * max_hr, max_hr)             # Anaérobie
-        }
-        
-        # Initialisation des compteurs
-        zone_times = {zone: 0 for zone in zones.keys()}
-        zone_times["below_zone_1"] = 0  # En dessous de la zone 1
-        zone_times["above_zone_5"] = 0  # Au-dessus de la zone 5
+        zones = zone_limits(max_hr)
         
         # Calcul du temps dans chaque zone
-        for i in range(len(heartrate_values) - 1):
-            hr = heartrate_values[i]
-            time_diff = time_values[i + 1] - time_values[i] if i + 1 < len(time_values) else 0
-            
-            # Détermination de la zone
-            zone_found = False
-            for zone_name, (min_hr, max_hr_zone) in zones.items():
-                if min_hr <= hr < max_hr_zone:
-                    zone_times[zone_name] += time_diff
-                    zone_found = True
-                    break
-            
-            if not zone_found:
-                if hr < zones["zone_1"][0]:
-                    zone_times["below_zone_1"] += time_diff
-                else:
-                    zone_times["above_zone_5"] += time_diff
+        times = heart_rate_zone_times(time_values, heartrate_values, max_hr)
+        zone_times = dict(zip(ZONE_NAMES, times))
         
         # Conversion en minutes et formatage
         zone_summary = {}
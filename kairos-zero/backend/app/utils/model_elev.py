@@ -39,11 +39,11 @@ def extract_arrays(row):
         if not all(k in pace for k in ("time", "distance")): return None
         if not all(k in hr for k in ("time", "heartrate")): return None
 
-        d_alt = np.array(elev["distance"])
-        alt = np.array(elev["altitude"])
-        d_pace = np.array(pace["distance"])
-        t_pace = np.array(pace["time"])
-        heart_rate = np.array(hr["heartrate"])
+        d_alt = np.asarray(elev["distance"])
+        alt = np.asarray(elev["altitude"])
+        d_pace = np.asarray(pace["distance"])
+        t_pace = np.asarray(pace["time"])
+        heart_rate = np.asarray(hr["heartrate"])
 
         if len(d_alt) < 2 or len(d_pace) < 2 or len(t_pace) < 2 or len(heart_rate) < 2:
             return None
@@ -1,5 +1,3 @@
-from scipy.optimize import minimize
-from scipy.special import lambertw
 import numpy as np
 
 # Fonction pour convertir un temps au format hh:mm:ss en minutes
@@ -53,17 +51,243 @@ def predicted_time(d, vm, tc, gamma_s, gamma_l):
     
     return T
 
+
+def predicted_times(distances, vm, tc, gamma_s, gamma_l):
+    """
+    Version tableau de predicted_time : temps prédits (minutes) sur un tableau de
+    distances (m) en une passe. NaN là où le modèle n'est pas défini
+    (1 - gamma * ln(d / dc) <= 0, aux très longues distances).
+    """
+    distances = np.asarray(distances, dtype=np.float64)
+    critical_distance = vm * tc
+    gamma = np.where(distances <= critical_distance, gamma_s, gamma_l)
+    denominator = 1 - gamma * np.log(distances / critical_distance)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, distances / (vm * denominator), np.nan)
+
+# Paramètres du modèle de puissance (vm en m/min, tc en min, gamma_s, gamma_l) :
+# point de départ par défaut et bornes de l'optimisation
+INITIAL_PARAMS = (200, 10, 0.1, 0.05)
+PARAM_BOUNDS = [(150, 250), (5, 20), (0.01, 1), (0.01, 1)]
+
+
+def _power_law_residuals(params, distances, real_times, mask):
+    """
+    Écarts relatifs du modèle de puissance et leur jacobienne analytique, pour P athlètes à la fois.
+
+    T(d) = d / (vm * (1 - gamma * ln(d / (vm * tc)))), gamma = gamma_s si d <= vm * tc,
+    gamma_l sinon (voir predicted_time).
+
+    Args:
+        params: Tableau (P, 4) de (vm, tc, gamma_s, gamma_l)
+        distances, real_times: Tableaux (P, N), records complétés par des 1 au-delà du nombre de records
+        mask: Tableau (P, N), 1 pour un record, 0 pour un complément
+
+    Returns:
+        tuple: (écarts (réel - prédit) / réel (P, N), jacobienne par rapport aux paramètres (P, N, 4))
+    """
+    vm, tc, gamma_s, gamma_l = (params[:, [i]] for i in range(4))
+    critical_distance = vm * tc
+    short = distances <= critical_distance
+    log_ratio = np.log(distances / critical_distance)
+    gamma = np.where(short, gamma_s, gamma_l)
+    denominator = 1 - gamma * log_ratio
+    predicted = distances / (vm * denominator)
+
+    residuals = mask * (real_times - predicted) / real_times
+    # d(écart)/dT, puis dT/dparamètre ; dT/dgamma s'applique à gamma_s ou gamma_l selon la distance
+    scale = -mask / real_times
+    gamma_term = predicted * log_ratio / denominator
+    jacobian = np.stack([
+        -scale * predicted / vm * (1 + gamma / denominator),
+        -scale * predicted * gamma / (denominator * tc),
+        scale * np.where(short, gamma_term, 0.0),
+        scale * np.where(short, 0.0, gamma_term),
+    ], axis=2)
+    return residuals, jacobian
+
+
+def _power_law_error(params, distances, real_times, mask):
+    """Erreur relative quadratique de chaque athlète (P,) et son gradient (P, 4) (voir _power_law_residuals)."""
+    residuals, jacobian = _power_law_residuals(params, distances, real_times, mask)
+    return (residuals ** 2).sum(axis=1), 2 * np.einsum("pnk,pn->pk", jacobian, residuals)
+
+
+def _records_arrays(distances_list, times_list):
+    """Records de P athlètes en tableaux (P, N) complétés, avec leur masque (voir _power_law_residuals)."""
+    size = max((len(distances) for distances in distances_list), default=0)
+    distances = np.ones((len(distances_list), size))
+    real_times = np.ones((len(distances_list), size))
+    mask = np.zeros((len(distances_list), size))
+    for i, (athlete_distances, athlete_times) in enumerate(zip(distances_list, times_list)):
+        distances[i, :len(athlete_distances)] = athlete_distances
+        real_times[i, :len(athlete_times)] = athlete_times
+        mask[i, :len(athlete_distances)] = 1.0
+    return distances, real_times, mask
+
+
+def _starting_point(initial_params):
+    """Point de départ dans les bornes : paramètres précédents de l'athlète, ou INITIAL_PARAMS."""
+    if initial_params is None or any(p is None for p in initial_params):
+        return np.array(INITIAL_PARAMS, dtype=np.float64)
+    lower, upper = np.array(PARAM_BOUNDS, dtype=np.float64).T
+    return np.clip(np.asarray(initial_params, dtype=np.float64), lower, upper)
+
+
 # Fonction d'erreur à minimiser
 def error_function(params, distances, real_times):
-    vm, tc, gamma_s, gamma_l = params
-    predicted_times = [predicted_time(d, vm, tc, gamma_s, gamma_l) for d in distances]
-    error = sum(((real - pred) / real) ** 2 for real, pred in zip(real_times, predicted_times))
-    return error
+    arrays = _records_arrays([distances], [real_times])
+    error, _ = _power_law_error(np.asarray(params, dtype=np.float64).reshape(1, 4), *arrays)
+    return float(error[0])
+
+
+def fit_power_law(distances, real_times, initial_params=None):
+    """
+    Ajuste le modèle de puissance sur les records d'un athlète (L-BFGS-B, gradient analytique).
+
+    Args:
+        distances: Distances des records en mètres
+        real_times: Temps des records en minutes
+        initial_params: Paramètres précédents de l'athlète (vm, tc, gamma_s, gamma_l) comme
+            point de départ, ramenés dans les bornes ; INITIAL_PARAMS si None
+
+    Returns:
+        OptimizeResult: x = (vm, tc, gamma_s, gamma_l), nfev = nombre d'évaluations
+    """
+    from scipy.optimize import minimize  # import différé : scipy n'est chargé qu'au premier entraînement
+
+    arrays = _records_arrays([distances], [real_times])
+
+    def objective(params):
+        error, gradient = _power_law_error(params.reshape(1, 4), *arrays)
+        return error[0], gradient[0]
+
+    return minimize(objective, _starting_point(initial_params), jac=True, method='L-BFGS-B', bounds=PARAM_BOUNDS)
+
+
+def optimize_params(distances, real_times, initial_params=None):
+    return fit_power_law(distances, real_times, initial_params).x
+
+
+def optimize_params_batch(distances_list, times_list, initial_params=None, max_iterations=200):
+    """
+    Ajuste le modèle de puissance de plusieurs athlètes à la fois, par exemple pour le
+    recalcul nocturne de tous les modèles.
+
+    Levenberg-Marquardt borné, vectorisé sur les athlètes : chaque itération évalue les
+    écarts et jacobiennes de tous les athlètes pas encore convergés en une passe, puis
+    résout leurs systèmes 4x4 ensemble. Les paramètres arrivés sur une borne avec un
+    gradient sortant sont fixés pour l'itération.
+
+    Args:
+        distances_list, times_list: Records de chaque athlète (mètres, minutes), au moins un par athlète
+        initial_params: Paramètres précédents de chaque athlète (ou None par athlète), voir fit_power_law
+        max_iterations: Nombre maximal d'itérations
+
+    Returns:
+        np.ndarray: Tableau (P, 4) de (vm, tc, gamma_s, gamma_l)
+    """
+    n_athletes = len(distances_list)
+    if n_athletes == 0:
+        return np.empty((0, 4))
+    distances, real_times, mask = _records_arrays(distances_list, times_list)
+    lower, upper = np.array(PARAM_BOUNDS, dtype=np.float64).T
+    params = np.stack([_starting_point(p) for p in (initial_params or [None] * n_athletes)])
+
+    residuals, jacobian = _power_law_residuals(params, distances, real_times, mask)
+    error = (residuals ** 2).sum(axis=1)
+    damping = np.full(n_athletes, 1e-3)
+    remaining = np.arange(n_athletes)
+    for _ in range(max_iterations):
+        if len(remaining) == 0:
+            break
+        p, r, J = params[remaining], residuals[remaining], jacobian[remaining]
+        half_gradient = np.einsum("pnk,pn->pk", J, r)
+        normal = np.einsum("pnk,pnl->pkl", J, J)
+
+        # Système amorti (JtJ + lambda * diag(JtJ)) pas = -Jt r, sur les paramètres libres
+        fixed = ((p <= lower) & (half_gradient > 0)) | ((p >= upper) & (half_gradient < 0))
+        free = ~fixed
+        diagonal = np.maximum(np.einsum("pkk->pk", normal), 1e-12)
+        system = normal + (damping[remaining, None] * diagonal)[:, :, None] * np.eye(4)
+        system = system * free[:, :, None] * free[:, None, :] + np.eye(4) * fixed[:, :, None]
+        step = np.linalg.solve(system, np.where(free, -half_gradient, 0.0)[..., None])[..., 0]
+
+        candidate = np.clip(p + step, lower, upper)
+        candidate_residuals, candidate_jacobian = _power_law_residuals(
+            candidate, distances[remaining], real_times[remaining], mask[remaining]
+        )
+        candidate_error = (candidate_residuals ** 2).sum(axis=1)
+        current_error = error[remaining]
+        accepted = np.isfinite(candidate_error) & (candidate_error < current_error)
+
+        # Convergé : diminution relative négligeable, ou aucun pas accepté malgré l'amortissement
+        converged = accepted & (current_error - candidate_error <= 1e-12 * current_error)
+        converged |= ~accepted & (damping[remaining] > 1e10)
+
+        improved = remaining[accepted]
+        params[improved] = candidate[accepted]
+        residuals[improved] = candidate_residuals[accepted]
+        jacobian[improved] = candidate_jacobian[accepted]
+        error[improved] = candidate_error[accepted]
+        damping[remaining] = np.where(accepted, damping[remaining] * 0.3, damping[remaining] * 10)
+        remaining = remaining[~converged]
+    return params
+
+
+# Fonction pour intégrer le temps de course le long d'un profil de pente
+def course_time(distances, slopes, vm, k1, k2, alpha=0.05, beta=0.8, split_distance=1000.0):
+    """
+    Intègre le temps de parcours segment par segment, en vectoriel.
+
+    Pour chaque segment : v = (vm/60) * max(1 - alpha * d, beta), multipliée par
+    exp(-k1 * pente) en montée ou (1 + k2 * pente) en descente, bornée à 0.1 m/s.
+
+    Les paramètres (vm, k1, k2, alpha, beta) peuvent être des scalaires ou des
+    tableaux de même forme (P,) pour évaluer P jeux de paramètres en une passe,
+    par exemple pour balayer alpha et beta.
+
+    Args:
+        distances: Distances cumulées en mètres, N points
+        slopes: Pente de chaque segment, au moins N-1 valeurs
+        vm: Vitesse critique en m/min
+        k1, k2: Coefficients de montée et de descente
+        alpha: Coefficient de fatigue
+        beta: Fraction minimale de la vitesse
+        split_distance: Longueur des splits en mètres
+
+    Returns:
+        tuple: (temps_total, temps_par_split) en secondes ; temps_total est de forme ()
+               ou (P,), temps_par_split de forme (S,) ou (P, S)
+    """
+    distances = np.asarray(distances, dtype=np.float64)
+    segment_lengths = np.diff(distances)
+    slopes = np.asarray(slopes, dtype=np.float64)[:len(segment_lengths)]
+    distance_covered = np.cumsum(segment_lengths)
+
+    # Paramètres en colonne pour diffuser sur les segments : (P, 1) ou scalaires
+    vm, k1, k2, alpha, beta = np.broadcast_arrays(
+        *(np.asarray(p, dtype=np.float64)[..., np.newaxis] for p in (vm, k1, k2, alpha, beta))
+    )
 
-def optimize_params(distances, real_times):
-    initial_params = [200, 10, 0.1, 0.05]  # vm en m/min, tc en min, gamma_s, gamma_l
-    result = minimize(error_function, initial_params, args=(distances, real_times), method='L-BFGS-B',
-                    bounds=[(150, 250), (5, 20), (0.01, 1), (0.01, 1)])
-    return result.x
+    vitesse_fatigue = (vm / 60) * np.maximum(1 - alpha * distance_covered, beta)
+    uphill = slopes >= 0
+    v_segment = np.where(
+        uphill,
+        vitesse_fatigue * np.exp(-k1 * np.where(uphill, slopes, 0.0)),
+        vitesse_fatigue * (1 + k2 * slopes)
+    )
+    t_segment = segment_lengths / np.maximum(v_segment, 0.1)
+    elapsed = np.cumsum(t_segment, axis=-1)
+    if len(distance_covered) == 0:
+        return np.zeros(vm.shape[:-1]), np.zeros(vm.shape[:-1] + (0,))
 
+    # Splits : temps cumulé au premier point qui atteint chaque borne
+    n_splits = max(int(np.ceil(distance_covered[-1] / split_distance)), 1)
+    bounds = np.minimum(
+        np.searchsorted(distance_covered, np.arange(1, n_splits + 1) * split_distance),
+        len(distance_covered) - 1
+    )
+    split_times = np.diff(elapsed[..., bounds], prepend=0.0, axis=-1)
 
+    return elapsed[..., -1], split_times
@@ -0,0 +1,68 @@
+"""
+Graphiques d'analyse (développement et notebooks).
+Dépendance optionnelle : matplotlib n'est importé que par ce module,
+jamais au démarrage de l'API.
+"""
+
+import matplotlib.pyplot as plt
+from sklearn.decomposition import PCA
+
+
+def plot_effort_analysis(classifier):
+    """Plot effort level analysis of a fitted EffortClassifier (app/utils/predict_elev.py)"""
+    fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+    
+    # Plot 1: PCA visualization of effort levels
+    if classifier.features_scaled.shape[1] > 2:
+        pca = PCA(n_components=2)
+        features_pca = pca.fit_transform(classifier.features_scaled)
+        
+        scatter = axes[0, 0].scatter(features_pca[:, 0], features_pca[:, 1], 
+                                   c=classifier.labels, cmap='viridis', alpha=0.6)
+        axes[0, 0].set_title('Effort Levels (PCA Visualization)')
+        axes[0, 0].set_xlabel(f'PC1 ({pca.explained_variance_ratio_[0]:.1%} variance)')
+        axes[0, 0].set_ylabel(f'PC2 ({pca.explained_variance_ratio_[1]:.1%} variance)')
+        plt.colorbar(scatter, ax=axes[0, 0])
+    
+    # Plot 2: HR vs Speed by effort level
+    for level in range(classifier.n_clusters):
+        mask = classifier.labels == level
+        level_metadata = classifier.metadata[mask]
+        axes[0, 1].scatter(level_metadata[:, 2], level_metadata[:, 3], 
+                         label=f'Effort {level}', alpha=0.6)
+    
+    axes[0, 1].set_xlabel('Speed (m/s)')
+    axes[0, 1].set_ylabel('Heart Rate (bpm)')
+    axes[0, 1].set_title('Heart Rate vs Speed by Effort Level')
+    axes[0, 1].legend()
+    
+    # Plot 3: Slope vs Speed by effort level
+    for level in range(classifier.n_clusters):
+        mask = classifier.labels == level
+        level_metadata = classifier.metadata[mask]
+        axes[1, 0].scatter(level_metadata[:, 1], level_metadata[:, 2], 
+                         label=f'Effort {level}', alpha=0.6)
+    
+    axes[1, 0].set_xlabel('Slope (%)')
+    axes[1, 0].set_ylabel('Speed (m/s)')
+    axes[1, 0].set_title('Speed vs Slope by Effort Level')
+    axes[1, 0].legend()
+    
+    # Plot 4: Effort level statistics
+    levels = list(range(classifier.n_clusters))
+    avg_hrs = [classifier.effort_stats[i]['avg_hr'] for i in levels]
+    counts = [classifier.effort_stats[i]['count'] for i in levels]
+    
+    bars = axes[1, 1].bar(levels, avg_hrs, alpha=0.7)
+    axes[1, 1].set_xlabel('Effort Level')
+    axes[1, 1].set_ylabel('Average Heart Rate (bpm)')
+    axes[1, 1].set_title('Average HR by Effort Level')
+    
+    # Add count labels on bars
+    for bar, count in zip(bars, counts):
+        height = bar.get_height()
+        axes[1, 1].text(bar.get_x() + bar.get_width()/2., height,
+                       f'n={count}', ha='center', va='bottom')
+    
+    plt.tight_layout()
+    plt.show()
@@ -1,24 +1,24 @@
 """
 Machine Learning Effort Classification for Running Performance Analysis
 Replaces simple HR zone filtering with intelligent effort level detection
+
+scikit-learn is imported on first use (training), not at module import, to keep
+the API start-up fast. Plotting lives in app/utils/plots.py (matplotlib, optional).
 """
 
 import pandas as pd
 import numpy as np
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
-from sklearn.mixture import GaussianMixture
-from sklearn.metrics import silhouette_score
-from sklearn.decomposition import PCA
-import matplotlib.pyplot as plt
-from sklearn.linear_model import LinearRegression
 import json
+from app.utils.activity_streams import load_activity_streams, legacy_payloads
 # from app.repositories.strava_activity import get_activities_for_prediction
 
 # Constants
 MIN_SPEED_MPS = 0.5  # 0.5 m/s = 1.8 km/h
 MAX_SPEED_MPS = 10.0  # 10 m/s = 36 km/h
 OUTLIER_Z_SCORE_THRESHOLD = 3
+N_EFFORT_FEATURES = 9  # Columns of calculate_effort_features
+FEATURE_CHUNK_ROWS = 65536  # Rows processed at once when removing outliers and scaling
+MAX_REALISTIC_SLOPE = 30  # Steeper points (%) are left out of the slope-speed regressions
 
 def extract_arrays_enhanced(row):
     """Enhanced version of extract_arrays with additional features"""
@@ -38,11 +38,11 @@ def extract_arrays_enhanced(row):
         if not all(k in pace for k in ("time", "distance")): return None
         if hr is None or not all(k in hr for k in ("time", "heartrate")): return None
 
-        d_alt = np.array(elev["distance"])
-        alt = np.array(elev["altitude"])
-        d_pace = np.array(pace["distance"])
-        t_pace = np.array(pace["time"])
-        heart_rate = np.array(hr["heartrate"])
+        d_alt = np.asarray(elev["distance"])
+        alt = np.asarray(elev["altitude"])
+        d_pace = np.asarray(pace["distance"])
+        t_pace = np.asarray(pace["time"])
+        heart_rate = np.asarray(hr["heartrate"])
 
         if len(d_alt) < 2 or len(d_pace) < 2 or len(t_pace) < 2 or len(heart_rate) < 2:
             return None
@@ -135,6 +135,133 @@ def calculate_effort_features(data_dict):
         pace_variability        # Pace variability
     ])
 
+def _stream_length(payload, key):
+    """Length of one channel of a stream payload (dict of arrays or legacy JSON string)"""
+    if isinstance(payload, str):
+        payload = json.loads(payload)
+    if not payload or key not in payload:
+        return 0
+    return len(payload[key])
+
+
+def effort_feature_capacity(row):
+    """Upper bound of the points extract_arrays_enhanced keeps for one run (one point per
+    resampled distance), read from the stream lengths without interpolating"""
+    try:
+        return min(_stream_length(row["elevation_data"], "distance"), _stream_length(row["pace_data"], "distance"))
+    except (TypeError, ValueError):
+        return 0
+
+
+def iter_effort_features(activities):
+    """
+    Effort features of each run, one run at a time.
+
+    Yields:
+        tuple: (features (n, N_EFFORT_FEATURES), metadata (n, 4): run index, slope, speed, HR)
+        for the finite points of each run; runs are numbered among those whose
+        streams could be extracted, as before
+    """
+    run_index = 0
+    for row in activities:
+        data_dict = extract_arrays_enhanced(row)
+        if data_dict is None:
+            continue
+        features = calculate_effort_features(data_dict)
+        valid_mask = np.all(np.isfinite(features), axis=1)
+        if np.any(valid_mask):
+            metadata = np.column_stack([
+                np.full(np.count_nonzero(valid_mask), run_index),
+                data_dict['pente'][valid_mask],
+                data_dict['vitesse'][valid_mask],
+                data_dict['hr'][valid_mask]
+            ])
+            yield features[valid_mask], metadata
+        run_index += 1
+
+
+class RunningMoments:
+    """Per-column mean and variance in one pass over blocks of rows (Welford, Chan's block update)"""
+
+    def __init__(self, n_columns):
+        self.count = 0
+        self.mean = np.zeros(n_columns)
+        self.m2 = np.zeros(n_columns)
+
+    def update(self, block):
+        n = len(block)
+        if n == 0:
+            return
+        block_mean = block.mean(axis=0)
+        block_m2 = ((block - block_mean) ** 2).sum(axis=0)
+        delta = block_mean - self.mean
+        total = self.count + n
+        self.mean += delta * n / total
+        self.m2 += block_m2 + delta ** 2 * self.count * n / total
+        self.count = total
+
+    @property
+    def std(self):
+        """Population standard deviation (as np.std)"""
+        return np.sqrt(self.m2 / self.count)
+
+
+class SlopeSpeedMoments:
+    """
+    Per effort level moments of the slope-speed regressions (ln(speed) against slope,
+    uphill and downhill), updated block by block as RunningMoments, so that k1/k2
+    follow new runs without keeping the points of the previous ones
+    """
+
+    def __init__(self, n_clusters):
+        self.realistic = np.zeros(n_clusters, dtype=np.int64)  # Points with a realistic slope
+        shape = (n_clusters, 2)  # Side 0: uphill, 1: downhill
+        self.count = np.zeros(shape)
+        self.mean_slope = np.zeros(shape)
+        self.mean_log_speed = np.zeros(shape)
+        self.m2_slope = np.zeros(shape)
+        self.co_moment = np.zeros(shape)
+
+    def update(self, labels, metadata):
+        """Add points (effort level, metadata rows as in iter_effort_features)"""
+        n_clusters = len(self.realistic)
+        slope, speed = metadata[:, 1], metadata[:, 2]
+        realistic = np.abs(slope) <= MAX_REALISTIC_SLOPE
+        self.realistic += np.bincount(labels[realistic], minlength=n_clusters)
+
+        for side, direction in enumerate((slope > 0, slope < 0)):
+            mask = direction & realistic & (speed > 0)
+            level, x, y = labels[mask], slope[mask], np.log(speed[mask])
+            n = np.bincount(level, minlength=n_clusters).astype(float)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                mean_x = np.nan_to_num(np.bincount(level, x, n_clusters) / n)
+                mean_y = np.nan_to_num(np.bincount(level, y, n_clusters) / n)
+            dx, dy = x - mean_x[level], y - mean_y[level]
+            self._merge(side, n, mean_x, mean_y,
+                        np.bincount(level, dx * dx, n_clusters), np.bincount(level, dx * dy, n_clusters))
+
+    def _merge(self, side, n, mean_x, mean_y, m2, co_moment):
+        count = self.count[:, side]
+        total = count + n
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weight = np.where(total > 0, n / total, 0.0)
+        delta_x = mean_x - self.mean_slope[:, side]
+        delta_y = mean_y - self.mean_log_speed[:, side]
+        self.mean_slope[:, side] += delta_x * weight
+        self.mean_log_speed[:, side] += delta_y * weight
+        self.m2_slope[:, side] += m2 + delta_x ** 2 * count * weight
+        self.co_moment[:, side] += co_moment + delta_x * delta_y * count * weight
+        self.count[:, side] = total
+
+    def coefficient(self, level, side):
+        """Minus the slope of the least squares line, None without points"""
+        if self.count[level, side] == 0:
+            return None
+        if self.m2_slope[level, side] <= 0:
+            return 0.0  # Single slope value: flat line, as LinearRegression
+        return float(-self.co_moment[level, side] / self.m2_slope[level, side])
+
+
 class EffortClassifier:
     def __init__(self, n_clusters=5, method='gmm'):
         """
@@ -144,6 +271,8 @@ class EffortClassifier:
             n_clusters: Number of effort levels (typically 3-7)
             method: 'kmeans', 'gmm' (Gaussian Mixture Model), or 'auto'
         """
+        from sklearn.preprocessing import StandardScaler
+
         self.n_clusters = n_clusters
         self.method = method
         self.scaler = StandardScaler()
@@ -154,8 +283,19 @@ class EffortClassifier:
             'HR Variability', 'Metabolic Load', 'Pace Variability'
         ]
         
+    def __getstate__(self):
+        """Pickle only the fitted model, not the training data (kept in cache per athlete)"""
+        state = self.__dict__.copy()
+        for name in ('metadata', 'features_scaled', 'labels', 'labels_sample'):
+            state.pop(name, None)
+        return state
+
     def find_optimal_clusters(self, features, max_clusters=10):
         """Find optimal number of clusters using silhouette score"""
+        from sklearn.cluster import KMeans
+        from sklearn.metrics import silhouette_score
+        from sklearn.mixture import GaussianMixture
+
         print(f"🔍 Test de {max_clusters} nombres de clusters différents...")
         scores = []
         cluster_range = range(2, min(max_clusters + 1, len(features) // 50 + 1))
@@ -176,74 +316,88 @@ class EffortClassifier:
         print(f"✅ Nombre optimal de clusters trouvé: {optimal_clusters} (score: {max(scores):.4f})")
         return optimal_clusters, scores
     
-    def fit(self, df):
-        """Fit the effort classifier on training data"""
+    def _prepare_features(self, activities):
+        """
+        Effort features of all runs, without outliers and scaled, in a single array.
+
+        Each run's features are written into an array preallocated from the stream
+        lengths (iter_effort_features), with the outlier statistics updated on the fly;
+        outliers are then removed in place and the features scaled in place, chunk by
+        chunk, so that memory stays close to one copy of the features.
+        Sets self.metadata (run index, slope, speed, HR of each kept point) and the
+        outlier statistics reused by partial_fit.
+
+        Args:
+            activities: DataFrame or list of runs (elevation_data, pace_data, heartrate_data)
+        """
+        from sklearn.base import clone
+
+        if isinstance(activities, pd.DataFrame):
+            activities = activities.to_dict("records")
+        # Fitted chunk by chunk (partial_fit) : restart from an unfitted scaler
+        self.scaler = clone(self.scaler)
+
         print("🔍 Extraction des caractéristiques des données de course...")
-        
-        # Extract data from all runs
-        print("📊 Extraction des données de toutes les courses...")
-        extracted = df.apply(extract_arrays_enhanced, axis=1)
-        extracted = extracted.dropna()
-        
-        if len(extracted) == 0:
-            raise ValueError("No valid data extracted")
-        
-        print(f"✅ Données extraites de {len(extracted)} courses")
-        
-        # Combine all features
-        print("🔧 Combinaison de toutes les caractéristiques...")
-        all_features = []
-        all_metadata = []
-        
-        for i, data_dict in enumerate(extracted):
-            if data_dict is None:
-                continue
-                
-            if i % 10 == 0:  # Log tous les 10 éléments
-                print(f"📈 Traitement de la course {i+1}/{len(extracted)}...")
-                
-            features = calculate_effort_features(data_dict)
-            
-            # Remove any invalid features
-            valid_mask = np.all(np.isfinite(features), axis=1)
-            features_clean = features[valid_mask]
-            
-            if len(features_clean) > 0:
-                all_features.append(features_clean)
-                
-                # Store metadata for each point
-                metadata = np.column_stack([
-                    np.full(len(features_clean), i),  # Run index
-                    data_dict['pente'][valid_mask],
-                    data_dict['vitesse'][valid_mask],
-                    data_dict['hr'][valid_mask]
-                ])
-                all_metadata.append(metadata)
-        
-        if not all_features:
+        capacity = sum(effort_feature_capacity(row) for row in activities)
+        features = np.empty((capacity, N_EFFORT_FEATURES))
+        metadata = np.empty((capacity, 4))
+        moments = RunningMoments(N_EFFORT_FEATURES)
+
+        n_points = 0
+        n_runs = 0
+        for block, block_metadata in iter_effort_features(activities):
+            if n_runs % 10 == 0:  # Log tous les 10 éléments
+                print(f"📈 Traitement de la course {n_runs + 1}/{len(activities)}...")
+            end = n_points + len(block)
+            features[n_points:end] = block
+            metadata[n_points:end] = block_metadata
+            moments.update(block)
+            n_points = end
+            n_runs += 1
+
+        if n_points == 0:
             raise ValueError("No valid features extracted")
-        
-        print("📊 Combinaison des caractéristiques...")
-        # Combine all features
-        features_combined = np.vstack(all_features)
-        metadata_combined = np.vstack(all_metadata)
-        
-        print(f"📈 Total de points de données: {len(features_combined)}")
-        
-        # Remove outliers
+        print(f"✅ {n_points} points de données extraits de {n_runs} courses")
+
+        # Remove outliers (z-score on all points), compacting the array in place,
+        # and fit the scaler on the kept points
         print("🧹 Suppression des valeurs aberrantes...")
-        z_scores = np.abs((features_combined - np.mean(features_combined, axis=0)) / 
-                         np.std(features_combined, axis=0))
-        outlier_mask = np.all(z_scores < OUTLIER_Z_SCORE_THRESHOLD, axis=1)
-        
-        features_clean = features_combined[outlier_mask]
-        self.metadata = metadata_combined[outlier_mask]
-        
-        print(f"✅ Après suppression des valeurs aberrantes: {len(features_clean)} points de données")
-        
-        # Scale features
+        mean, std = moments.mean, moments.std
+        self.outlier_mean, self.outlier_std = mean, std
+        kept = 0
+        for start in range(0, n_points, FEATURE_CHUNK_ROWS):
+            end = min(start + FEATURE_CHUNK_ROWS, n_points)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                z_scores = np.abs((features[start:end] - mean) / std)
+            keep = np.all(z_scores < OUTLIER_Z_SCORE_THRESHOLD, axis=1)
+            size = np.count_nonzero(keep)
+            # Kept rows only move towards the start, behind the rows still to be read
+            features[kept:kept + size] = features[start:end][keep]
+            metadata[kept:kept + size] = metadata[start:end][keep]
+            if size:
+                self.scaler.partial_fit(features[kept:kept + size])
+            kept += size
+
+        if kept == 0:
+            raise ValueError("No data left after outlier removal")
+        self.metadata = metadata[:kept]
+        print(f"✅ Après suppression des valeurs aberrantes: {kept} points de données")
+
+        # Scale features (in place)
         print("📏 Normalisation des caractéristiques...")
-        features_scaled = self.scaler.fit_transform(features_clean)
+        return self.scaler.transform(features[:kept], copy=False)
+
+    def fit(self, df, previous=None):
+        """
+        Fit the effort classifier on training data (DataFrame or list of runs, see _prepare_features)
+
+        Args:
+            previous: Classifier previously fitted for the same athlete; its effort levels
+                keep their labels (see _align_labels)
+        """
+        from sklearn.cluster import KMeans
+
+        features_scaled = self._prepare_features(df)
         
         # Optimisation : échantillonnage pour accélérer le clustering
         print("⚡ Optimisation : échantillonnage des données pour accélérer le clustering...")
@@ -273,11 +427,16 @@ class EffortClassifier:
         print("🎯 Prédiction des labels...")
         # Entraîner sur l'échantillon
         self.labels_sample = self.model.fit_predict(features_sample)
+        if previous is not None:
+            self._align_labels(previous)
         
         # Prédire les labels pour toutes les données
         print("🎯 Prédiction des labels pour toutes les données...")
         self.labels = self.model.predict(features_scaled)
         self.features_scaled = features_scaled
+        self.cluster_counts = np.bincount(self.labels, minlength=self.n_clusters)
+        self.slope_moments = SlopeSpeedMoments(self.n_clusters)
+        self.slope_moments.update(self.labels, self.metadata)
         
         # Calculate effort level statistics
         print("📊 Calcul des statistiques par niveau d'effort...")
@@ -288,6 +447,72 @@ class EffortClassifier:
         
         return self
     
+    def _align_labels(self, previous):
+        """
+        Renumber the clusters so that each one takes the label of the closest cluster of
+        the previous classifier (optimal one-to-one matching of the centers, compared in
+        the current feature scale): a refit does not shuffle the effort levels
+        """
+        from scipy.optimize import linear_sum_assignment
+
+        previous_centers = getattr(getattr(previous, "model", None), "cluster_centers_", None)
+        if previous_centers is None or len(previous_centers) != self.n_clusters:
+            return
+        previous_centers = self.scaler.transform(previous.scaler.inverse_transform(previous_centers))
+        centers = self.model.cluster_centers_
+        distances = ((previous_centers[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        _, order = linear_sum_assignment(distances)  # order[label] = current cluster
+        new_labels = np.empty(self.n_clusters, dtype=int)
+        new_labels[order] = np.arange(self.n_clusters)
+
+        self.model.cluster_centers_ = centers[order]
+        self.model.labels_ = new_labels[self.model.labels_]
+        self.labels_sample = new_labels[self.labels_sample]
+
+    def partial_fit(self, activities):
+        """
+        Update the fitted classifier with new runs only (list of runs, see _prepare_features).
+
+        The scaler and outlier statistics of the last full fit are kept. Each center moves
+        towards the mean of its new points, weighted by the points it already holds (the
+        MiniBatchKMeans update, without random reassignment of small clusters), so labels
+        keep their meaning between updates; cluster counts and slope-speed moments are
+        updated, effort_stats (which need every point) are not.
+
+        Returns:
+            int: Number of points added
+        """
+        blocks = list(iter_effort_features(activities))
+        if not blocks:
+            return 0
+        features = np.concatenate([block for block, _ in blocks])
+        metadata = np.concatenate([block_metadata for _, block_metadata in blocks])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z_scores = np.abs((features - self.outlier_mean) / self.outlier_std)
+        keep = np.all(z_scores < OUTLIER_Z_SCORE_THRESHOLD, axis=1)
+        if not np.any(keep):
+            return 0
+        features_scaled = self.scaler.transform(features[keep])
+        metadata = metadata[keep]
+
+        labels = self.model.predict(features_scaled)
+        new_counts = np.bincount(labels, minlength=self.n_clusters)
+        sums = np.zeros_like(self.model.cluster_centers_)
+        np.add.at(sums, labels, features_scaled)
+        counts = self.cluster_counts + new_counts
+        moved = new_counts > 0
+        centers = self.model.cluster_centers_
+        centers[moved] += (sums[moved] - new_counts[moved, None] * centers[moved]) / counts[moved, None]
+
+        self.cluster_counts = counts
+        self.slope_moments.update(labels, metadata)
+        print(f"📈 {len(labels)} nouveaux points, distribution des niveaux d'effort: {counts}")
+        return len(labels)
+
+    def target_effort_level(self):
+        """Effort level with most data points"""
+        return int(np.argmax(self.cluster_counts))
+
     def _calculate_effort_stats(self):
         """Calculate statistics for each effort level"""
         self.effort_stats = {}
@@ -333,67 +558,60 @@ class EffortClassifier:
         return pente, vitesse, hr, target_effort_level
     
     def plot_effort_analysis(self):
-        """Plot effort level analysis"""
-        fig, axes = plt.subplots(2, 2, figsize=(15, 10))
-        
-        # Plot 1: PCA visualization of effort levels
-        if self.features_scaled.shape[1] > 2:
-            pca = PCA(n_components=2)
-            features_pca = pca.fit_transform(self.features_scaled)
-            
-            scatter = axes[0, 0].scatter(features_pca[:, 0], features_pca[:, 1], 
-                                       c=self.labels, cmap='viridis', alpha=0.6)
-            axes[0, 0].set_title('Effort Levels (PCA Visualization)')
-            axes[0, 0].set_xlabel(f'PC1 ({pca.explained_variance_ratio_[0]:.1%} variance)')
-            axes[0, 0].set_ylabel(f'PC2 ({pca.explained_variance_ratio_[1]:.1%} variance)')
-            plt.colorbar(scatter, ax=axes[0, 0])
-        
-        # Plot 2: HR vs Speed by effort level
-        for level in range(self.n_clusters):
-            mask = self.labels == level
-            level_metadata = self.metadata[mask]
-            axes[0, 1].scatter(level_metadata[:, 2], level_metadata[:, 3], 
-                             label=f'Effort {level}', alpha=0.6)
-        
-        axes[0, 1].set_xlabel('Speed (m/s)')
-        axes[0, 1].set_ylabel('Heart Rate (bpm)')
-        axes[0, 1].set_title('Heart Rate vs Speed by Effort Level')
-        axes[0, 1].legend()
-        
-        # Plot 3: Slope vs Speed by effort level
-        for level in range(self.n_clusters):
-            mask = self.labels == level
-            level_metadata = self.metadata[mask]
-            axes[1, 0].scatter(level_metadata[:, 1], level_metadata[:, 2], 
-                             label=f'Effort {level}', alpha=0.6)
-        
-        axes[1, 0].set_xlabel('Slope (%)')
-        axes[1, 0].set_ylabel('Speed (m/s)')
-        axes[1, 0].set_title('Speed vs Slope by Effort Level')
-        axes[1, 0].legend()
-        
-        # Plot 4: Effort level statistics
-        levels = list(range(self.n_clusters))
-        avg_hrs = [self.effort_stats[i]['avg_hr'] for i in levels]
-        counts = [self.effort_stats[i]['count'] for i in levels]
-        
-        bars = axes[1, 1].bar(levels, avg_hrs, alpha=0.7)
-        axes[1, 1].set_xlabel('Effort Level')
-        axes[1, 1].set_ylabel('Average Heart Rate (bpm)')
-        axes[1, 1].set_title('Average HR by Effort Level')
-        
-        # Add count labels on bars
-        for bar, count in zip(bars, counts):
-            height = bar.get_height()
-            axes[1, 1].text(bar.get_x() + bar.get_width()/2., height,
-                           f'n={count}', ha='center', va='bottom')
-        
-        plt.tight_layout()
-        plt.show()
+        """Plot effort level analysis (requires matplotlib, see app/utils/plots.py)"""
+        from app.utils.plots import plot_effort_analysis
+        plot_effort_analysis(self)
+
+def slope_coefficients(classifier, target_effort=None):
+    """
+    Slope-speed coefficients of one effort level: minus the slope of ln(speed) against
+    slope, uphill (k1) and downhill (k2), from the moments kept by the classifier.
+    The flat speed only shifts ln(speed), so it does not change the coefficients.
+
+    Returns:
+        tuple: (k1, k2), or (None, None) with fewer than 3 points of realistic slope
+    """
+    if target_effort is None:
+        target_effort = classifier.target_effort_level()
+    moments = classifier.slope_moments
+    print(f"📈 Niveau d'effort cible: {target_effort}")
+
+    n_realistic = int(moments.realistic[target_effort])
+    print(f"📊 Points de pente réaliste: {n_realistic}")
+    if n_realistic < 3:
+        print(f"❌ Pas assez de données pour l'apprentissage: {n_realistic} points")
+        return None, None
+
+    print("⛰️ Régression pour les montées...")
+    print(f"📊 Données de montée valides: {int(moments.count[target_effort, 0])} points")
+    k1 = moments.coefficient(target_effort, 0)
+    if k1 is None:
+        print("⚠️ Aucune donnée de montée valide")
+        k1 = 0.1
+    else:
+        print(f"✅ Coefficient de montée calculé: k1 = {k1:.4f}")
+
+    print("🏔️ Régression pour les descentes...")
+    print(f"📊 Données de descente valides: {int(moments.count[target_effort, 1])} points")
+    k2 = moments.coefficient(target_effort, 1)
+    if k2 is None:
+        print("⚠️ Aucune donnée de descente valide")
+        k2 = 0.05
+    else:
+        print(f"✅ Coefficient de descente calculé: k2 = {k2:.4f}")
+
+    print(f"🎯 Coefficients finaux - Montée (k1): {k1:.4f}, Descente (k2): {k2:.4f}")
+    return k1, k2
 
-def elev_func_ml(df, vitesse_plat, target_effort=None):
+
+def elev_func_ml(df, vitesse_plat, target_effort=None, previous=None):
     """
     Enhanced elevation function using ML effort classification
+
+    Args:
+        df: DataFrame or list of runs (elevation_data, pace_data, heartrate_data)
+        vitesse_plat: Flat speed (m/s), not needed by the coefficients (see slope_coefficients)
+        previous: Previous classifier of the athlete, whose effort level labels are kept
     """
     print("🚀 Début de elev_func_ml...")
     print(f"📊 Données d'entrée: {len(df)} activités")
@@ -403,84 +621,10 @@ def elev_func_ml(df, vitesse_plat, target_effort=None):
     classifier = EffortClassifier(n_clusters=5, method='auto')
     
     print("🎯 Entraînement du classifieur d'effort...")
-    classifier.fit(df)
+    classifier.fit(df, previous=previous)
     print("✅ Classifieur d'effort entraîné avec succès!")
     
-    # Get data for target effort level
-    print("📈 Récupération des données pour le niveau d'effort cible...")
-    pente, vitesse, hr, effort_level = classifier.get_target_effort_data(target_effort)
-    print(f"📊 Données récupérées: {len(pente)} points de données")
-    
-    # Convert to arrays and normalize
-    print("🔄 Conversion en arrays et normalisation...")
-    p_hr = pente.reshape(-1, 1)
-    v_hr = vitesse.reshape(-1, 1)
-    
-    # Filter realistic slopes
-    print("🔍 Filtrage des pentes réalistes...")
-    mask_p_realiste = (np.abs(p_hr) <= 30)
-    p_hr = p_hr[mask_p_realiste].reshape(-1, 1)
-    v_hr = v_hr[mask_p_realiste].reshape(-1, 1)
-    print(f"📊 Après filtrage des pentes: {len(p_hr)} points")
-    
-    if len(p_hr) < 3:
-        print(f"❌ Pas assez de données pour l'apprentissage: {len(p_hr)} points")
-        return None, None, classifier
-    
-    print("📏 Normalisation de la vitesse...")
-    normalized_speed = v_hr / vitesse_plat
-    
-    # Uphill regression
-    print("⛰️ Régression pour les montées...")
-    uphill = pd.DataFrame({'pente': p_hr.flatten(), 'vitesse': normalized_speed.flatten()})
-    uphill = uphill[uphill['pente'] > 0]
-    montees_valid = uphill[uphill['vitesse'] > 0]
-    print(f"📊 Données de montée valides: {len(montees_valid)} points")
-    
-    if len(montees_valid) == 0:
-        print("⚠️ Aucune donnée de montée valide")
-        k1 = 0.1
-    else:
-        # Filter out zero or negative speeds before taking log
-        montees_valid = montees_valid[montees_valid['vitesse'] > 0]
-        if len(montees_valid) > 0:
-            print("📈 Calcul du coefficient de montée...")
-            montees_valid['ln_vitesse_norm'] = np.log(montees_valid['vitesse'])
-            X_montee = montees_valid[['pente']]
-            y_montee = montees_valid['ln_vitesse_norm']
-            reg_montee = LinearRegression().fit(X_montee, y_montee)
-            k1 = -reg_montee.coef_[0]
-            print(f"✅ Coefficient de montée calculé: k1 = {k1:.4f}")
-        else:
-            k1 = 0.1
-            print("⚠️ Utilisation de la valeur par défaut pour k1")
-    
-    # Downhill regression
-    print("🏔️ Régression pour les descentes...")
-    downhill = pd.DataFrame({'pente': p_hr.flatten(), 'vitesse': normalized_speed.flatten()})
-    downhill = downhill[downhill['pente'] < 0]
-    descentes_valid = downhill[downhill['vitesse'] > 0]
-    print(f"📊 Données de descente valides: {len(descentes_valid)} points")
-    
-    if len(descentes_valid) == 0:
-        print("⚠️ Aucune donnée de descente valide")
-        k2 = 0.05
-    else:
-        # Filter out zero or negative speeds before taking log
-        descentes_valid = descentes_valid[descentes_valid['vitesse'] > 0]
-        if len(descentes_valid) > 0:
-            print("📉 Calcul du coefficient de descente...")
-            descentes_valid['ln_vitesse_norm'] = np.log(descentes_valid['vitesse'])
-            X_descente = descentes_valid[['pente']]
-            y_descente = descentes_valid['ln_vitesse_norm']
-            reg_descente = LinearRegression().fit(X_descente, y_descente)
-            k2 = -reg_descente.coef_[0]
-            print(f"✅ Coefficient de descente calculé: k2 = {k2:.4f}")
-        else:
-            k2 = 0.05
-            print("⚠️ Utilisation de la valeur par défaut pour k2")
-    
-    print(f"🎯 Coefficients finaux - Montée (k1): {k1:.4f}, Descente (k2): {k2:.4f}")
+    k1, k2 = slope_coefficients(classifier, target_effort)
     print("✅ elev_func_ml terminé avec succès!")
     
     return k1, k2, classifier
@@ -506,37 +650,11 @@ def process_activities_for_prediction(activities, db, athlete_id):
     # Prepare data for elevation model
     activity_data = []
     for a in activities:
-        # Parse JSON if it exists
-        elevation_data = None
-        pace_data = None
-        heartrate_data = None
-            
-        if a.elevation_data:
-            try:
-                elevation_data = json.loads(a.elevation_data)
-                print(f"Activity {a.id}: elevation_data OK")
-            except (json.JSONDecodeError, TypeError):
-                elevation_data = None
-                print(f"Activity {a.id}: elevation_data invalide")
-                    
-        if a.pace_data:
-            try:
-                pace_data = json.loads(a.pace_data)
-                print(f"Activity {a.id}: pace_data OK")
-            except (json.JSONDecodeError, TypeError):
-                pace_data = None
-                print(f"Activity {a.id}: pace_data invalide")
-                    
-        if a.heartrate_data:
-            try:
-                heartrate_data = json.loads(a.heartrate_data)
-            except (json.JSONDecodeError, TypeError):
-                heartrate_data = None
-        
+        payloads = legacy_payloads(load_activity_streams(a))
         activity_data.append({
-            "elevation_data": elevation_data,
-            "pace_data": pace_data,
-            "heartrate_data": heartrate_data
+            "elevation_data": payloads["elevation_data"],
+            "pace_data": payloads["pace_data"],
+            "heartrate_data": payloads["heartrate_data"]
         })
 
     # Filter activities with valid data
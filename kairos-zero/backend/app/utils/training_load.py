@@ -0,0 +1,255 @@
+"""
+Calcul de la charge d'entraînement quotidienne (ACWR et modèle fitness-fatigue).
+
+Les scores d'effort des activités sont additionnés par jour calendaire (jours de
+repos à 0), puis :
+- ACWR : moyennes glissantes sur 7 jours (aiguë) et 28 jours (chronique) calendaires,
+  ou moyennes mobiles exponentielles (EWMA) de mêmes périodes
+- Fitness-fatigue : calcul_ffm (app/utils/ffm.py) sur la série quotidienne
+
+Le calcul peut reprendre à n'importe quel jour à partir de l'état de la veille,
+ce qui permet de ne recalculer que les jours touchés par une nouvelle activité.
+
+Les calculs ACWR acceptent une série (un athlète) ou un DataFrame jours × athlètes,
+pour calculer plusieurs athlètes en une seule passe.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Iterable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from app.utils.ffm import calcul_ffm, clean_nan_values
+
+ACUTE_DAYS = 7
+CHRONIC_DAYS = 28
+# Période renvoyée par la route /analytics (jours), et bornes acceptées : fin au plus
+# ANALYTICS_END_MARGIN_DAYS jours après aujourd'hui (UTC, l'athlète peut être en avance
+# sur UTC), période d'au plus ANALYTICS_MAX_DAYS jours
+ANALYTICS_DAYS = 30
+ANALYTICS_END_MARGIN_DAYS = 1
+ANALYTICS_MAX_DAYS = 3 * 366
+
+ACWR_ROLLING = "rolling"
+ACWR_EWMA = "ewma"
+ACWR_METHODS = (ACWR_ROLLING, ACWR_EWMA)
+
+Loads = Union[pd.Series, pd.DataFrame]
+
+
+def daily_efforts(activities: Iterable[Tuple], start: date, end: date) -> pd.Series:
+    """
+    Somme des scores d'effort par jour, de start à end inclus (0 les jours sans activité).
+
+    Args:
+        activities: Couples (start_date, effort_score)
+    """
+    days = pd.date_range(start, end, freq="D")
+    frame = pd.DataFrame(list(activities), columns=["start_date", "effort_score"])
+    if frame.empty:
+        return pd.Series(0.0, index=days)
+    frame["day"] = pd.to_datetime(frame["start_date"]).dt.normalize()
+    sums = frame.groupby("day")["effort_score"].sum()
+    return sums.reindex(days, fill_value=0.0).astype(np.float64)
+
+
+def acute_chronic_loads(efforts: Loads, method: str = ACWR_ROLLING) -> Tuple[Loads, Loads, Loads]:
+    """
+    Charges aiguë et chronique et ratio ACWR d'une charge quotidienne.
+
+    Args:
+        efforts: Charge quotidienne indexée par jours consécutifs (série, ou DataFrame
+            avec une colonne par athlète). NaN avant le premier jour d'activité d'un athlète :
+            les fenêtres sont tronquées à ce jour.
+        method: "rolling" (moyennes sur 7 et 28 jours calendaires) ou
+            "ewma" (moyennes exponentielles, lambda = 2 / (N + 1))
+
+    Returns:
+        tuple: (charge aiguë, charge chronique, ratio ; NaN si la charge chronique est nulle)
+    """
+    if method == ACWR_ROLLING:
+        acute = efforts.rolling(f"{ACUTE_DAYS}D", min_periods=1).mean()
+        chronic = efforts.rolling(f"{CHRONIC_DAYS}D", min_periods=1).mean()
+    elif method == ACWR_EWMA:
+        acute = efforts.ewm(span=ACUTE_DAYS, adjust=False).mean()
+        chronic = efforts.ewm(span=CHRONIC_DAYS, adjust=False).mean()
+    else:
+        raise ValueError(f"Méthode ACWR inconnue: {method} (attendu: {', '.join(ACWR_METHODS)})")
+    ratio = (acute / chronic).where(chronic > 0)
+    return acute, chronic, ratio
+
+
+def daily_efforts_by_athlete(daily: pd.DataFrame, start: date, end: date,
+                             first_days: Optional[pd.Series] = None) -> pd.DataFrame:
+    """
+    Charge quotidienne de plusieurs athlètes : DataFrame jours (start à end) × athlètes.
+
+    Args:
+        daily: Sommes quotidiennes (colonnes athlete_id, day, effort), ex. issues d'un GROUP BY
+        first_days: Premier jour d'activité de chaque athlète (indexé par athlete_id) ;
+            par défaut le premier jour présent dans daily. Les jours antérieurs valent NaN,
+            les jours de repos suivants 0.
+    """
+    days = pd.date_range(start, end, freq="D")
+    frame = daily.assign(day=pd.to_datetime(daily["day"]).dt.normalize())
+    wide = frame.pivot_table(index="day", columns="athlete_id", values="effort", aggfunc="sum")
+    wide = wide.reindex(days).astype(np.float64)
+    if first_days is None:
+        first_days = frame.groupby("athlete_id")["day"].min()
+    first_days = pd.to_datetime(first_days).dt.normalize().reindex(wide.columns)
+    started = days.to_numpy()[:, None] >= first_days.to_numpy()[None, :]
+    return wide.fillna(0.0).where(started)
+
+
+def calendar_acwr(activities: pd.DataFrame, start: Optional[date] = None, end: Optional[date] = None,
+                  method: str = ACWR_ROLLING) -> pd.DataFrame:
+    """
+    ACWR calendaire d'une ou plusieurs séries d'activités.
+
+    Args:
+        activities: Colonnes start_date, effort_score, et athlete_id pour plusieurs athlètes
+        start, end: Période renvoyée (par défaut du premier au dernier jour d'activité) ;
+            l'historique antérieur à start est utilisé pour les fenêtres
+        method: "rolling" ou "ewma" (voir acute_chronic_loads)
+
+    Returns:
+        DataFrame (athlete_id si fourni), date, effort, acute_load, chronic_load, acwr ;
+        une ligne par jour, jours de repos compris
+    """
+    columns = ["date", "effort", "acute_load", "chronic_load", "acwr"]
+    by_athlete = "athlete_id" in activities.columns
+    if by_athlete:
+        columns.insert(0, "athlete_id")
+    frame = activities.dropna(subset=["effort_score"])
+    if frame.empty:
+        return pd.DataFrame(columns=columns)
+
+    frame = pd.DataFrame({
+        "athlete_id": frame["athlete_id"] if by_athlete else 0,
+        "day": pd.to_datetime(frame["start_date"]).dt.normalize(),
+        "effort": frame["effort_score"],
+    })
+    first_day = frame["day"].min()
+    end = pd.Timestamp(end) if end is not None else frame["day"].max()
+    efforts = daily_efforts_by_athlete(frame[frame["day"] <= end], first_day, end)
+    return acwr_table(efforts, start, method)[columns]
+
+
+def acwr_table(efforts: pd.DataFrame, start: Optional[date] = None, method: str = ACWR_ROLLING) -> pd.DataFrame:
+    """
+    ACWR au format long à partir d'une charge quotidienne jours × athlètes (daily_efforts_by_athlete).
+
+    Returns:
+        DataFrame athlete_id, date, effort, acute_load, chronic_load, acwr, trié par athlète
+        puis par jour, à partir de start et du premier jour d'activité de chaque athlète
+    """
+    acute, chronic, ratio = acute_chronic_loads(efforts, method)
+
+    # Une ligne par (jour, athlète) à partir du premier jour d'activité
+    selected = efforts.notna().to_numpy()
+    if start is not None:
+        selected = selected & (efforts.index >= pd.Timestamp(start))[:, None]
+    day_index, athlete_index = np.nonzero(selected)
+    result = pd.DataFrame({
+        "athlete_id": efforts.columns.to_numpy()[athlete_index],
+        "date": efforts.index[day_index],
+        "effort": efforts.to_numpy()[selected],
+        "acute_load": acute.to_numpy()[selected],
+        "chronic_load": chronic.to_numpy()[selected],
+        "acwr": ratio.to_numpy()[selected],
+    })
+    return result.sort_values(["athlete_id", "date"], kind="stable").reset_index(drop=True)
+
+
+def compute_training_load(efforts: pd.Series, from_date: date,
+                          fatigue_state: float = 0.0, fitness_state: float = 0.0) -> pd.DataFrame:
+    """
+    Charge d'entraînement des jours >= from_date.
+
+    Args:
+        efforts: Charge quotidienne (index de jours consécutifs), commençant au plus tôt
+            CHRONIC_DAYS - 1 jours avant from_date, ou au premier jour d'activité de l'athlète
+        from_date: Premier jour à calculer
+        fatigue_state, fitness_state: État fitness-fatigue à la fin de la veille de from_date
+
+    Returns:
+        DataFrame indexé par jour : effort, acute_load, chronic_load, acwr, fatigue, fitness,
+        performance, form, ratio, fatigue_state, fitness_state
+    """
+    acute, chronic, acwr = acute_chronic_loads(efforts)
+
+    days = efforts.index >= pd.Timestamp(from_date)
+    effort = efforts.to_numpy()[days]
+    acute = acute.to_numpy()[days]
+    chronic = chronic.to_numpy()[days]
+    acwr = acwr.to_numpy()[days]
+
+    ffm = calcul_ffm(effort, fatigue_initiale=fatigue_state, fitness_initiale=fitness_state)
+
+    return pd.DataFrame({
+        "effort": effort,
+        "acute_load": acute,
+        "chronic_load": chronic,
+        "acwr": acwr,
+        "fatigue": ffm["fatigue"],
+        "fitness": ffm["fitness"],
+        "performance": ffm["performance"],
+        "form": ffm["forme"],
+        "ratio": ffm["rapport"],
+        "fatigue_state": ffm["fatigue_etat"],
+        "fitness_state": ffm["fitness_etat"],
+    }, index=efforts.index[days])
+
+
+def window_start(from_date: date, first_day: date) -> date:
+    """Premier jour de charge nécessaire pour recalculer à partir de from_date."""
+    return max(first_day, from_date - timedelta(days=CHRONIC_DAYS - 1))
+
+
+def analytics_period(start: Optional[date], end: Optional[date],
+                     today: Optional[date] = None) -> Tuple[date, date]:
+    """
+    Période demandée à la route /analytics, par défaut les ANALYTICS_DAYS jours précédant end
+    (par défaut aujourd'hui, UTC).
+
+    Raises:
+        ValueError: Si start suit end, si end dépasse aujourd'hui de plus de
+            ANALYTICS_END_MARGIN_DAYS jours ou si la période dépasse ANALYTICS_MAX_DAYS jours
+    """
+    today = today or datetime.utcnow().date()
+    end = end or today
+    start = start or end - timedelta(days=ANALYTICS_DAYS)
+    if start > end:
+        raise ValueError("start doit précéder end")
+    if end > today + timedelta(days=ANALYTICS_END_MARGIN_DAYS):
+        raise ValueError(f"end ne peut pas dépasser {today + timedelta(days=ANALYTICS_END_MARGIN_DAYS)}")
+    if (end - start).days >= ANALYTICS_MAX_DAYS:
+        raise ValueError(f"La période ne peut pas dépasser {ANALYTICS_MAX_DAYS} jours")
+    return start, end
+
+
+def analytics_payload(loads: pd.DataFrame) -> dict:
+    """
+    Courbes ACWR et fitness-fatigue au format attendu par le frontend (route /analytics).
+
+    Args:
+        loads: Charge quotidienne (get_training_load)
+    """
+    dates = loads.index.strftime('%Y-%m-%d').tolist()
+    return {
+        "acwr": {
+            "dates": dates,
+            "charge_aigue": clean_nan_values(loads["acute_load"].tolist()),
+            "charge_chronique": clean_nan_values(loads["chronic_load"].tolist()),
+            "ratio_ac": clean_nan_values(loads["acwr"].tolist()),
+        },
+        "ffm": {
+            "dates": dates,
+            "fatigue": clean_nan_values(loads["fatigue"].tolist()),
+            "fitness": clean_nan_values(loads["fitness"].tolist()),
+            "performance": clean_nan_values(loads["performance"].tolist()),
+            "forme": clean_nan_values(loads["form"].tolist()),
+            "rapport": clean_nan_values(loads["ratio"].tolist()),
+        },
+    }
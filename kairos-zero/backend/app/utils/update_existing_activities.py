@@ -6,30 +6,33 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
+from sqlalchemy.orm import undefer_group
+
 from app.database import SessionLocal
-from app.models.strava_activity import StravaActivity
-from app.utils.heart_rate_zones import calculate_heart_rate_zones, calculate_effort_score
+from app.models.strava_activity import StravaActivity, STREAMS_GROUP
+from app.utils.activity_encoder import activity_metrics
+from app.utils.activity_streams import load_activity_streams
+from app.repositories.training_load import refresh_training_load
 
 def update_all_effort_scores():
     db = SessionLocal()
     try:
-        activities = db.query(StravaActivity).all()
+        activities = db.query(StravaActivity).options(undefer_group(STREAMS_GROUP)).all()
         print(f"Nombre d'activités à mettre à jour : {len(activities)}")
         updated = 0
         for act in activities:
-            if not act.heartrate_data:
+            streams = load_activity_streams(act)
+            if "heartrate" not in streams or "time" not in streams:
                 continue
-            zone_data = calculate_heart_rate_zones(act.heartrate_data)
-            if zone_data and 'zones' in zone_data:
-                act.effort_score = calculate_effort_score(zone_data)
-                # Mettre à jour les temps par zone aussi
-                for zone in ['zone_1_time', 'zone_2_time', 'zone_3_time', 'zone_4_time', 'zone_5_time', 'below_zone_1_time', 'above_zone_5_time']:
-                    zone_key = zone.replace('_time', '')
-                    if zone_key in zone_data['zones']:
-                        setattr(act, zone, zone_data['zones'][zone_key]['time_minutes'])
-                updated += 1
+            # Temps par zone et score d'effort, calculés comme à la synchronisation
+            for column, value in activity_metrics(streams).items():
+                setattr(act, column, value)
+            updated += 1
         db.commit()
         print(f"{updated} activités mises à jour.")
+        # Scores d'effort modifiés : charge d'entraînement recalculée entièrement
+        for athlete_id in {act.athlete_id for act in activities}:
+            refresh_training_load(db, athlete_id)
     finally:
         db.close()
 
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark du stockage des streams d'activité : anciennes colonnes JSON
+contre blob binaire colonnaire (brut et compressé zlib).
+
+Mesure les octets stockés par activité et le temps de chargement en tableaux
+NumPy pour un lot d'activités synthétiques d'une heure (un point par seconde).
+
+Usage :
+    python benchmarks/bench_activity_streams.py [nombre_activites] [points_par_activite]
+"""
+
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# Ajouter le répertoire backend au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.activity_streams import decode_streams, encode_strava_streams, streams_from_legacy_json
+
+
+def synthetic_streams(rng, n_points):
+    """Streams Strava réalistes (clés et types de l'API, key_by_type=True)."""
+    time_s = np.cumsum(rng.integers(1, 3, n_points)) - 1
+    velocity = np.clip(3.0 + np.cumsum(rng.normal(0, 0.05, n_points)), 1.0, 6.0)
+    distance = np.cumsum(velocity * np.diff(time_s, prepend=0))
+    altitude = 200 + np.cumsum(rng.normal(0, 0.3, n_points))
+    heartrate = np.clip(140 + np.cumsum(rng.normal(0, 0.5, n_points)), 90, 195).astype(int)
+    cadence = rng.integers(84, 92, n_points)
+    return {
+        "time": {"data": time_s.tolist()},
+        "distance": {"data": np.round(distance, 1).tolist()},
+        "velocity_smooth": {"data": np.round(velocity, 3).tolist()},
+        "altitude": {"data": np.round(altitude, 1).tolist()},
+        "heartrate": {"data": heartrate.tolist()},
+        "cadence": {"data": cadence.tolist()},
+    }
+
+
+def legacy_columns(streams):
+    """Reproduit l'ancienne sérialisation de save_activities (4 colonnes JSON)."""
+    distance_data = streams["distance"]["data"]
+    time_data = streams["time"]["data"]
+    velocity_data = streams["velocity_smooth"]["data"]
+    return (
+        json.dumps({"distance": [d / 1000 for d in distance_data], "altitude": streams["altitude"]["data"]}),
+        json.dumps({
+            "time": time_data,
+            "distance": [d / 1000 for d in distance_data],
+            "velocity": [round(v * 3.6, 2) if v is not None else None for v in velocity_data]
+        }),
+        json.dumps({"time": time_data, "heartrate": streams["heartrate"]["data"]}),
+        json.dumps({"watts": [], "cadence": streams["cadence"]["data"], "time": time_data}),
+    )
+
+
+def bench(label, rows, encode, load):
+    start = time.perf_counter()
+    stored = [encode(row) for row in rows]
+    encode_time = time.perf_counter() - start
+
+    size = sum(sum(len(col) for col in cols) if isinstance(cols, tuple) else len(cols) for cols in stored)
+
+    start = time.perf_counter()
+    for cols in stored:
+        load(cols)
+    load_time = time.perf_counter() - start
+
+    print(f"{label:<28} {size / len(rows) / 1024:8.1f} Ko/activité  "
+          f"encodage {encode_time:6.2f}s  chargement {load_time:6.3f}s")
+    return size, load_time
+
+
+def main():
+    n_activities = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    n_points = int(sys.argv[2]) if len(sys.argv) > 2 else 3600
+
+    rng = np.random.default_rng(42)
+    rows = [synthetic_streams(rng, n_points) for _ in range(n_activities)]
+    print(f"{n_activities} activités de {n_points} points\n")
+
+    def load_legacy(cols):
+        # Ancien chemin des lecteurs : json.loads puis np.array par canal
+        elevation, pace, heartrate, power = (json.loads(c) for c in cols)
+        return [np.array(v) for payload in (elevation, pace, heartrate, power) for v in payload.values()]
+
+    json_size, json_load = bench("JSON (avant)", rows, legacy_columns, load_legacy)
+    compat_size, compat_load = bench("JSON via lecteur compatible", rows, legacy_columns,
+                                     lambda cols: streams_from_legacy_json(*cols))
+    raw_size, raw_load = bench("binaire brut", rows, lambda s: encode_strava_streams(s, compress=False),
+                               decode_streams)
+    zlib_size, zlib_load = bench("binaire zlib", rows, lambda s: encode_strava_streams(s, compress=True),
+                                 decode_streams)
+
+    print(f"\nTaille : x{json_size / raw_size:.1f} (brut), x{json_size / zlib_size:.1f} (zlib) plus petit que JSON")
+    print(f"Chargement : x{json_load / raw_load:.0f} (brut), x{json_load / zlib_load:.0f} (zlib) plus rapide que JSON")
+
+
+if __name__ == "__main__":
+    main()
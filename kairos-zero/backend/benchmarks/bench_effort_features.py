@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la préparation des caractéristiques d'effort (EffortClassifier.fit,
+avant le clustering) : ancien chemin (df.apply, listes de blocs, np.vstack, z-scores
+et normalisation sur des copies) contre l'extraction course par course dans un
+tableau préalloué (EffortClassifier._prepare_features).
+
+Mesure le temps et le pic de mémoire (tracemalloc) de chaque chemin, sur des
+streams synthétiques au format des modèles de prédiction (legacy_payloads), et
+vérifie que les points gardés et normalisés sont les mêmes.
+
+Usage :
+    python benchmarks/bench_effort_features.py [nombre_courses] [points_par_course]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+# Ajouter le répertoire backend au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_activity_streams import synthetic_streams
+
+from app.utils.activity_streams import legacy_payloads, strava_stream_arrays
+from app.utils.predict_elev import (
+    OUTLIER_Z_SCORE_THRESHOLD,
+    EffortClassifier,
+    calculate_effort_features,
+    extract_arrays_enhanced,
+)
+
+
+def legacy_prepare_features(classifier, df):
+    """Ancienne préparation des caractéristiques de EffortClassifier.fit."""
+    extracted = df.apply(extract_arrays_enhanced, axis=1).dropna()
+    all_features, all_metadata = [], []
+    for i, data_dict in enumerate(extracted):
+        features = calculate_effort_features(data_dict)
+        valid_mask = np.all(np.isfinite(features), axis=1)
+        features_clean = features[valid_mask]
+        if len(features_clean) > 0:
+            all_features.append(features_clean)
+            all_metadata.append(np.column_stack([
+                np.full(len(features_clean), i),
+                data_dict['pente'][valid_mask],
+                data_dict['vitesse'][valid_mask],
+                data_dict['hr'][valid_mask]
+            ]))
+    features_combined = np.vstack(all_features)
+    metadata_combined = np.vstack(all_metadata)
+    z_scores = np.abs((features_combined - np.mean(features_combined, axis=0)) /
+                      np.std(features_combined, axis=0))
+    outlier_mask = np.all(z_scores < OUTLIER_Z_SCORE_THRESHOLD, axis=1)
+    classifier.metadata = metadata_combined[outlier_mask]
+    return classifier.scaler.fit_transform(features_combined[outlier_mask])
+
+
+def measure(fn):
+    """Temps et pic de mémoire allouée pendant fn (Mo)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, duration, peak / 1e6
+
+
+def main():
+    n_runs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    n_points = int(sys.argv[2]) if len(sys.argv) > 2 else 3600
+
+    rng = np.random.default_rng(0)
+    runs = []
+    for _ in range(n_runs):
+        payloads = legacy_payloads(strava_stream_arrays(synthetic_streams(rng, n_points)))
+        runs.append({name: payloads[name] for name in ("elevation_data", "pace_data", "heartrate_data")})
+    size_mb = sum(v.nbytes for run in runs for payload in run.values() for v in payload.values()) / 1e6
+    print(f"{n_runs} courses de {n_points} points ({size_mb:.0f} Mo de streams)\n")
+
+    stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+    try:
+        legacy = EffortClassifier(method='auto')
+        df = pd.DataFrame(runs)
+        old, t_old, peak_old = measure(lambda: legacy_prepare_features(legacy, df))
+        streaming = EffortClassifier(method='auto')
+        new, t_new, peak_new = measure(lambda: streaming._prepare_features(runs))
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    features_mb = new.nbytes / 1e6
+    print(f"{'':<28} {'temps':>9} {'pic mémoire':>12}")
+    print(f"{'ancien (apply + vstack)':<28} {t_old * 1000:7.0f}ms {peak_old:9.1f} Mo")
+    print(f"{'tableau préalloué':<28} {t_new * 1000:7.0f}ms {peak_new:9.1f} Mo")
+    print(f"\nCaractéristiques normalisées : {len(new)} points, {features_mb:.1f} Mo "
+          f"(pic x{peak_old / features_mb:.1f} avant, x{peak_new / features_mb:.1f} après)")
+
+    assert old.shape == new.shape, "Nombre de points différent"
+    assert np.array_equal(legacy.metadata, streaming.metadata), "Métadonnées différentes"
+    print(f"Points identiques ; écart max des caractéristiques normalisées {np.max(np.abs(old - new)):.1e}")
+
+
+if __name__ == "__main__":
+    main()
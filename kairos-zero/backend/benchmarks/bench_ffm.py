@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark du modèle fitness-fatigue : ancienne boucle df.iloc par séance
+contre le filtre récursif sur tout l'historique (calcul_ffm / courbe_ffm).
+
+Historique synthétique d'une séance par jour sur plusieurs années (10 ans par
+défaut), avec jours de repos ; vérifie que les courbes sont identiques à
+l'arrondi flottant près.
+
+Usage :
+    python benchmarks/bench_ffm.py [annees]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Ajouter le répertoire backend au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.ffm import fatigue, fitness, performance, forme, rapport, fatigue_fitness, courbe_ffm, calcul_ffm
+
+
+def legacy_courbe_ffm(df):
+    """Ancienne version de courbe_ffm (cinq df.iloc et deux recalculs par séance)."""
+    courbe_fatigue, courbe_fitness, courbe_performance, courbe_forme, courbe_rapport = [], [], [], [], []
+    fatigue_pre = 0
+    fitness_pre = 0
+    for i in range(len(df)):
+        instant_fatigue = fatigue(fatigue_pre, df.iloc[i]['effort_score'])
+        instant_fitness = fitness(fitness_pre, df.iloc[i]['effort_score'])
+        instant_performance = performance(fitness_pre, fatigue_pre, df.iloc[i]['effort_score'])
+        instant_forme = forme(fitness_pre, fatigue_pre, df.iloc[i]['effort_score'])
+        instant_rapport = rapport(fatigue_pre, instant_performance)
+        fatigue_pre, fitness_pre = fatigue_fitness(instant_fatigue, instant_fitness, df.iloc[i]['effort_score'])
+        courbe_fatigue.append(instant_fatigue)
+        courbe_fitness.append(instant_fitness)
+        courbe_performance.append(instant_performance)
+        courbe_forme.append(instant_forme)
+        courbe_rapport.append(instant_rapport)
+    return courbe_fatigue, courbe_fitness, courbe_performance, courbe_forme, courbe_rapport, fatigue_pre, fitness_pre
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    years = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    n_days = int(years * 365)
+
+    rng = np.random.default_rng(42)
+    effort = rng.gamma(2.0, 40.0, n_days)
+    effort[rng.random(n_days) < 0.25] = 0.0  # jours de repos
+    df = pd.DataFrame({
+        "start_date": pd.date_range("2015-01-01", periods=n_days, freq="D"),
+        "effort_score": effort,
+    })
+    print(f"{n_days} jours ({years:g} ans)\n")
+
+    old, t_old = timed(legacy_courbe_ffm, df)
+    new, t_new = timed(courbe_ffm, df)
+    _, t_arrays = timed(calcul_ffm, effort)
+
+    names = ("fatigue", "fitness", "performance", "forme", "rapport")
+    errors = [
+        np.max(np.abs(np.asarray(a, dtype=float) - np.asarray(b, dtype=float)) / np.maximum(np.abs(np.asarray(a, dtype=float)), 1.0))
+        for a, b in zip(old[:5], new[:5])
+    ]
+
+    print(f"{'boucle df.iloc (avant)':<28} {t_old * 1000:9.1f}ms")
+    print(f"{'courbe_ffm (listes)':<28} {t_new * 1000:9.2f}ms  x{t_old / t_new:.0f}")
+    print(f"{'calcul_ffm (tableaux)':<28} {t_arrays * 1000:9.2f}ms  x{t_old / t_arrays:.0f}")
+    print("\nÉcart relatif max : " + ", ".join(f"{name} {err:.1e}" for name, err in zip(names, errors)))
+    print(f"États finaux : fatigue {old[5]:.6f} / {new[5]:.6f}, fitness {old[6]:.6f} / {new[6]:.6f}")
+
+
+if __name__ == "__main__":
+    main()
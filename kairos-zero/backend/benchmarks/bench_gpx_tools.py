@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark des outils GPX : points gpxpy + boucles Python (parse_gpx, calculate_*)
+contre la trace en tableaux NumPy (parse_gpx_track, track_*).
+Le parsing compare aussi la mémoire de pointe (gpxpy contre parse_gpx_stream).
+
+Génère une trace de trail synthétique (un point toutes les ~3 m, avec horodatage),
+vérifie que les deux versions donnent les mêmes résultats (à l'arrondi flottant près) et compare les temps.
+
+Usage :
+    python benchmarks/bench_gpx_tools.py [nombre_points]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+# Ajouter le répertoire backend au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.gpx_tools import (
+    parse_gpx, calculate_slope_profile, calculate_elevation_gain,
+    calculate_elevation_gain_smoothed, calculate_elevation_stats,
+    parse_gpx_track, track_slope_profile, track_elevation_gain,
+    track_elevation_gain_smoothed, track_elevation_stats,
+)
+
+
+def write_synthetic_gpx(path, n_points, seed=42):
+    """Écrit une trace de montagne synthétique : marche aléatoire en plan et en altitude."""
+    rng = np.random.default_rng(seed)
+    heading = np.cumsum(rng.normal(0, 0.2, n_points))
+    step = rng.uniform(2.0, 4.0, n_points) / 111_000
+    lat = 45.9 + np.cumsum(step * np.cos(heading))
+    lon = 6.8 + np.cumsum(step * np.sin(heading))
+    ele = 1200 + np.cumsum(rng.normal(0, 0.8, n_points)) + 300 * np.sin(np.arange(n_points) / 4000)
+    start = datetime(2025, 6, 1, 6, 0, tzinfo=timezone.utc)
+
+    with open(path, "w") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write('<gpx version="1.1" creator="bench" xmlns="http://www.topografix.com/GPX/1/1">\n')
+        f.write("<trk><name>bench</name><trkseg>\n")
+        for i in range(n_points):
+            timestamp = (start + timedelta(seconds=2 * i)).strftime("%Y-%m-%dT%H:%M:%SZ")
+            f.write(f'<trkpt lat="{lat[i]:.7f}" lon="{lon[i]:.7f}"><ele>{ele[i]:.1f}</ele>'
+                    f"<time>{timestamp}</time></trkpt>\n")
+        f.write("</trkseg></trk></gpx>\n")
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def peak_memory(fn, *args):
+    """Mémoire Python de pointe (Mo) allouée pendant l'appel."""
+    tracemalloc.start()
+    try:
+        fn(*args)
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    n_points = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "trail.gpx")
+        write_synthetic_gpx(path, n_points)
+        print(f"Trace synthétique de {n_points} points ({os.path.getsize(path) / 1e6:.1f} Mo)\n")
+
+        points, t_parse_old = timed(parse_gpx, path)
+        track, t_parse_new = timed(parse_gpx_track, path)
+        mem_old = peak_memory(parse_gpx, path)
+        mem_new = peak_memory(parse_gpx_track, path)
+
+    cases = [
+        ("profil de pente", calculate_slope_profile, track_slope_profile, {}),
+        ("dénivelé positif", calculate_elevation_gain, track_elevation_gain, {}),
+        ("dénivelé (30 m, 1.5 m)", calculate_elevation_gain, track_elevation_gain,
+         {"min_distance": 30.0, "min_elevation_gain": 1.5}),
+        ("dénivelé lissé", calculate_elevation_gain_smoothed, track_elevation_gain_smoothed, {}),
+        ("statistiques d'élévation", calculate_elevation_stats, track_elevation_stats, {}),
+    ]
+
+    print(f"{'':<26} {'avant':>10} {'après':>10} {'gain':>8}  écart relatif max")
+    print(f"{'parsing':<26} {t_parse_old * 1000:8.1f}ms {t_parse_new * 1000:8.1f}ms "
+          f"{t_parse_old / t_parse_new:7.1f}x")
+    print(f"{'mémoire de pointe':<26} {mem_old:8.1f}Mo {mem_new:8.1f}Mo {mem_old / mem_new:7.1f}x")
+
+    total_old = total_new = 0.0
+    for label, old_fn, new_fn, kwargs in cases:
+        old, t_old = timed(old_fn, points, **kwargs)
+        new, t_new = timed(new_fn, track, **kwargs)
+        total_old += t_old
+        total_new += t_new
+
+        if isinstance(old, dict):
+            old, new = list(old.values()), list(new.values())
+        elif isinstance(old, tuple):
+            old, new = np.concatenate(old), np.concatenate(new)
+        old, new = np.atleast_1d(np.asarray(old, dtype=float)), np.atleast_1d(np.asarray(new, dtype=float))
+        error = np.max(np.abs(old - new) / np.maximum(np.abs(old), 1e-12))
+        print(f"{label:<26} {t_old * 1000:8.1f}ms {t_new * 1000:8.1f}ms {t_old / t_new:7.1f}x  {error:.1e}")
+
+    print(f"\n{'calculs géométriques':<26} {total_old * 1000:8.1f}ms {total_new * 1000:8.1f}ms "
+          f"{total_old / total_new:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark du calcul des zones cardiaques : boucle Python par échantillon
+(ancienne version) contre np.diff / np.digitize / np.bincount.
+
+Stream synthétique d'une sortie longue à 1 Hz (3 h par défaut, avec pauses),
+passé en JSON (anciennes activités), en listes (API Strava) et en tableaux
+décodés depuis le blob de streams. Vérifie que les minutes par zone et le
+score d'effort sont identiques.
+
+Usage :
+    python benchmarks/bench_heart_rate_zones.py [duree_heures] [repetitions]
+"""
+
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# Ajouter le répertoire backend au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.activity_streams import decode_streams, encode_streams
+from app.utils.heart_rate_zones import calculate_heart_rate_zones, calculate_effort_score
+
+
+def legacy_zone_times(heartrate_values, time_values, max_hr):
+    """Ancienne boucle de calculate_heart_rate_zones (temps par zone en secondes)."""
+    zones = {
+        "zone_1": (0.5 * max_hr, 0.6 * max_hr),
+        "zone_2": (0.6 * max_hr, 0.7 * max_hr),
+        "zone_3": (0.7 * max_hr, 0.8 * max_hr),
+        "zone_4": (0.8 * max_hr, 0.9 * max_hr),
+        "zone_5": (0.9 * max_hr, max_hr)
+    }
+    zone_times = {zone: 0 for zone in zones.keys()}
+    zone_times["below_zone_1"] = 0
+    zone_times["above_zone_5"] = 0
+    for i in range(len(heartrate_values) - 1):
+        hr = heartrate_values[i]
+        time_diff = time_values[i + 1] - time_values[i] if i + 1 < len(time_values) else 0
+        zone_found = False
+        for zone_name, (min_hr, max_hr_zone) in zones.items():
+            if min_hr <= hr < max_hr_zone:
+                zone_times[zone_name] += time_diff
+                zone_found = True
+                break
+        if not zone_found:
+            if hr < zones["zone_1"][0]:
+                zone_times["below_zone_1"] += time_diff
+            else:
+                zone_times["above_zone_5"] += time_diff
+    return zone_times
+
+
+def synthetic_long_run(rng, hours):
+    """Sortie longue : échauffement, blocs au seuil, dérive cardiaque et quelques pauses."""
+    n = int(hours * 3600)
+    steps = np.ones(n, dtype=int)
+    steps[rng.choice(n, size=n // 600, replace=False)] = rng.integers(5, 120, n // 600)  # arrêts
+    time_s = np.cumsum(steps) - 1
+    base = 120 + 30 * np.minimum(np.arange(n) / 900, 1) + 10 * np.arange(n) / n
+    blocks = 20 * (np.sin(np.arange(n) / 400) > 0.7)
+    heartrate = np.clip(base + blocks + rng.normal(0, 3, n), 80, 205).round().astype(int)
+    return time_s.tolist(), heartrate.tolist()
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat
+
+
+def main():
+    hours = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    rng = np.random.default_rng(42)
+    time_s, heartrate = synthetic_long_run(rng, hours)
+    as_json = json.dumps({"time": time_s, "heartrate": heartrate})
+    decoded = decode_streams(encode_streams({"time": time_s, "heartrate": heartrate}))
+    print(f"Stream de {len(heartrate)} échantillons ({hours:g} h)\n")
+
+    # Référence : ancienne boucle sur le JSON parsé
+    def legacy():
+        data = json.loads(as_json)
+        return legacy_zone_times(data["heartrate"], data["time"], 194)
+
+    reference, t_legacy = timed(legacy, max(1, repeat // 4))
+    print(f"{'boucle Python (avant)':<30} {t_legacy * 1000:8.2f}ms")
+
+    cases = [
+        ("JSON", as_json),
+        ("listes (API Strava)", {"time": time_s, "heartrate": heartrate}),
+        ("tableaux décodés (blob)", {"time": decoded["time"], "heartrate": decoded["heartrate"]}),
+    ]
+    for label, payload in cases:
+        zone_data, elapsed = timed(lambda: calculate_heart_rate_zones(payload), repeat)
+        seconds = {zone: info["time_seconds"] for zone, info in zone_data["zones"].items()}
+        identical = seconds == reference
+        print(f"{label:<30} {elapsed * 1000:8.2f}ms  x{t_legacy / elapsed:5.1f}  "
+              f"identique: {identical}  score d'effort: {calculate_effort_score(zone_data)}")
+
+
+if __name__ == "__main__":
+    main()
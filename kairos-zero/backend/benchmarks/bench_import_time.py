@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark du démarrage de l'API : temps d'import de app.main (python -X importtime).
+
+Chaque mesure est faite dans un nouvel interpréteur, sur une base SQLite temporaire.
+Vérifie aussi que la pile d'analyse (matplotlib, scikit-learn, scipy) n'est pas
+chargée au démarrage : elle est importée au premier entraînement ou graphique.
+
+Code de sortie 1 si le meilleur temps dépasse le budget ou si un module lourd est importé,
+pour servir de test de non-régression.
+
+Usage :
+    python benchmarks/bench_import_time.py [repetitions] [budget_ms]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Budget pour import app.main (ms), environ 4 s avant le chargement différé
+DEFAULT_BUDGET_MS = 2500
+# Modules qui ne doivent pas être importés au démarrage de l'API
+LAZY_MODULES = ("matplotlib", "sklearn", "scipy")
+
+
+def import_profile():
+    """
+    Importe app.main dans un nouvel interpréteur.
+
+    Returns:
+        tuple: (temps cumulé de app.main en ms, {module: temps propre en ms})
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{directory}/import.db")
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import app.main"],
+            cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+        )
+
+    total_ms = None
+    self_ms = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # ligne d'en-tête
+        name = name.strip()
+        self_ms[name] = int(self_us) / 1000
+        if name == "app.main":
+            total_ms = int(cumulative_us) / 1000
+    return total_ms, self_ms
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    budget_ms = float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_BUDGET_MS
+
+    timings = []
+    for _ in range(repetitions):
+        total_ms, self_ms = import_profile()
+        timings.append(total_ms)
+    best = min(timings)
+    print(f"import app.main ({repetitions} interpréteurs) : meilleur {best:.0f} ms, "
+          f"médiane {sorted(timings)[len(timings) // 2]:.0f} ms, budget {budget_ms:.0f} ms\n")
+
+    # Temps propre par paquet de premier niveau (dernière mesure)
+    packages = defaultdict(float)
+    for name, duration in self_ms.items():
+        packages[name.split(".")[0]] += duration
+    print("Paquets les plus coûteux :")
+    for package, duration in sorted(packages.items(), key=lambda item: -item[1])[:10]:
+        print(f"  {package:<20} {duration:7.1f} ms")
+
+    errors = []
+    loaded = sorted({name.split(".")[0] for name in self_ms} & set(LAZY_MODULES))
+    if loaded:
+        errors.append(f"modules importés au démarrage : {', '.join(loaded)}")
+    if best > budget_ms:
+        errors.append(f"budget dépassé : {best:.0f} ms > {budget_ms:.0f} ms")
+    if errors:
+        print("\nÉCHEC : " + " ; ".join(errors))
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
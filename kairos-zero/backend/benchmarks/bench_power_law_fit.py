@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'ajustement du modèle de puissance (optimize_params) sur les records :
+ancienne fonction d'erreur (liste Python, gradient par différences finies de L-BFGS-B)
+contre l'erreur vectorisée à gradient analytique, à froid, à partir des paramètres
+précédents de l'athlète (nouveau record), et pour tous les athlètes à la fois
+(optimize_params_batch). Le nombre d'évaluations de l'ancien chemin compte aussi
+celles des différences finies (5 par gradient).
+
+Records synthétiques sur les distances Strava ; compare l'erreur atteinte par
+chaque athlète à celle de l'ancien ajustement.
+
+Usage :
+    python benchmarks/bench_power_law_fit.py [nombre_athletes]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+from scipy.optimize import minimize
+
+# Ajouter le répertoire backend au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.model_time_pred import INITIAL_PARAMS, PARAM_BOUNDS, error_function, fit_power_law, optimize_params_batch, predicted_time
+
+# Distances des best efforts Strava (m)
+DISTANCES = np.array([400, 805, 1000, 1609, 3218, 5000, 10000, 15000, 16093, 20000, 21097, 42195], dtype=float)
+
+
+def legacy_error_function(params, distances, real_times):
+    """Ancienne fonction d'erreur (un appel à predicted_time par distance)."""
+    vm, tc, gamma_s, gamma_l = params
+    predicted_times = [predicted_time(d, vm, tc, gamma_s, gamma_l) for d in distances]
+    return sum(((real - pred) / real) ** 2 for real, pred in zip(real_times, predicted_times))
+
+
+def legacy_fit(distances, real_times):
+    return minimize(legacy_error_function, list(INITIAL_PARAMS), args=(distances, real_times),
+                    method='L-BFGS-B', bounds=PARAM_BOUNDS)
+
+
+def synthetic_records(rng, n_athletes):
+    """Records (distances en m, temps en minutes) d'athlètes aux paramètres tirés au hasard."""
+    athletes = []
+    for _ in range(n_athletes):
+        vm, tc = rng.uniform(170, 230), rng.uniform(6, 14)
+        gamma_s, gamma_l = rng.uniform(0.05, 0.15), rng.uniform(0.03, 0.1)
+        distances = np.sort(rng.choice(DISTANCES, rng.integers(4, len(DISTANCES) + 1), replace=False))
+        times = np.array([predicted_time(d, vm, tc, gamma_s, gamma_l) for d in distances])
+        athletes.append((distances, times * rng.uniform(0.97, 1.03, len(times))))
+    return athletes
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    n_athletes = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    rng = np.random.default_rng(0)
+    athletes = synthetic_records(rng, n_athletes)
+    print(f"{n_athletes} athlètes, {sum(len(d) for d, _ in athletes)} records\n")
+
+    legacy, t_legacy = timed(lambda: [legacy_fit(d, t) for d, t in athletes])
+    cold, t_cold = timed(lambda: [fit_power_law(d, t) for d, t in athletes])
+
+    # Nouveau record sur une distance : réajustement à partir des paramètres précédents
+    improved = []
+    for distances, times in athletes:
+        times = times.copy()
+        times[rng.integers(len(times))] *= 0.98
+        improved.append((distances, times))
+    refit_cold, t_refit_cold = timed(lambda: [fit_power_law(d, t) for d, t in improved])
+    warm, t_warm = timed(lambda: [fit_power_law(d, t, r.x) for (d, t), r in zip(improved, cold)])
+
+    batch, t_batch = timed(lambda: optimize_params_batch([d for d, _ in athletes], [t for _, t in athletes]))
+
+    def report(label, results, duration, reference):
+        evaluations = sum(r.nfev for r in results) if results else None
+        per_fit = f"{evaluations / len(results):6.1f} éval./ajustement" if evaluations else " " * 23
+        print(f"{label:<36} {per_fit}  {duration * 1000:8.1f}ms  x{reference / duration:.1f}")
+
+    report("ancien (différences finies)", legacy, t_legacy, t_legacy)
+    report("vectorisé, gradient analytique", cold, t_cold, t_legacy)
+    report("nouveau record, à froid", refit_cold, t_refit_cold, t_legacy)
+    report("nouveau record, paramètres précédents", warm, t_warm, t_refit_cold)
+    report(f"tous les athlètes en une fois (LM)", [], t_batch, t_legacy)
+
+    # Les deux ajustements s'arrêtent à des minima locaux proches : comparaison athlète par athlète
+    reference = np.array([r.fun for r in legacy])
+    print()
+    for label, values in [
+        ("vectorisé", [r.fun for r in cold]),
+        ("en une fois", [error_function(params, d, t) for params, (d, t) in zip(batch, athletes)]),
+    ]:
+        gap = np.array(values) - reference
+        print(f"Erreur {label} / ancien : {np.sum(gap < -1e-6)} athlètes mieux ajustés, "
+              f"{np.sum(gap > 1e-6)} moins bien (écart max {gap.max():.1e}), somme {gap.sum():+.1e}")
+    gap = np.array([r.fun for r in warm]) - [r.fun for r in refit_cold]
+    print(f"Erreur paramètres précédents / à froid : {np.sum(gap < -1e-6)} mieux, {np.sum(gap > 1e-6)} moins bien, "
+          f"somme {gap.sum():+.1e}")
+
+if __name__ == "__main__":
+    main()
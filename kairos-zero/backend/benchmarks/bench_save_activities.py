@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la sauvegarde des activités synchronisées sur SQLite (fichier) :
+ancienne boucle (une recherche, une écriture ORM et un commit par activité, comme
+les boucles de synchronisation appelant save_activities avec une seule activité)
+contre upsert_activities (une requête IN, INSERT ... ON CONFLICT, un commit).
+
+Mesure une première synchronisation (insertions) puis une resynchronisation
+(mises à jour) du même lot, et vérifie que les deux chemins écrivent les mêmes lignes.
+La charge d'entraînement n'est pas recalculée (mesurée à part par l'application).
+
+Usage :
+    python benchmarks/bench_save_activities.py [nombre_activites] [points_par_activite] [taille_lot]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Ajouter le répertoire backend au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_activity_streams import synthetic_streams
+
+from app.database import Base
+import app.models  # noqa: F401  (enregistre toutes les tables)
+from app.models.strava_activity import StravaActivity
+from app.repositories.strava_activity import _activity_row, _UPDATED_COLUMNS, upsert_activities
+
+ATHLETE_ID = 1
+
+
+def synthetic_activities(rng, n_activities, n_points):
+    """Activités au format de fetch_full_activity_details."""
+    start = datetime(2025, 1, 1, 7)
+    activities = []
+    for i in range(n_activities):
+        activities.append({
+            "activity_data": {
+                "id": 10_000_000 + i,
+                "name": f"Sortie {i}",
+                "type": "Run",
+                "start_date": (start + timedelta(hours=20 * i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "distance": 10000.0,
+                "moving_time": n_points,
+                "elapsed_time": n_points,
+                "total_elevation_gain": 120.0,
+                "average_speed": 3.0,
+                "max_speed": 5.0,
+                "average_heartrate": 145.0,
+                "max_heartrate": 180.0,
+            },
+            "streams": synthetic_streams(rng, n_points),
+            "best_efforts": [],
+        })
+    return activities
+
+
+def legacy_save(db, activities):
+    """Ancien chemin : save_activities(db, athlete_id, [activite]) appelé dans une boucle."""
+    for act in activities:
+        row = _activity_row(ATHLETE_ID, act)
+        existing = db.query(StravaActivity).filter_by(activity_id=row["activity_id"]).first()
+        if existing:
+            for column in _UPDATED_COLUMNS:
+                setattr(existing, column, row[column])
+        else:
+            db.add(StravaActivity(**row))
+        db.commit()
+
+
+def bulk_save(db, activities, batch_size):
+    for start in range(0, len(activities), batch_size):
+        upsert_activities(db, ATHLETE_ID, activities[start:start + batch_size], update_training_load=False)
+
+
+def snapshot(db):
+    columns = [getattr(StravaActivity, name) for name in ["activity_id", "athlete_id"] + _UPDATED_COLUMNS]
+    return db.query(*columns).order_by(StravaActivity.activity_id).all()
+
+
+def run(save, activities):
+    directory = tempfile.mkdtemp()
+    engine = create_engine(f"sqlite:///{directory}/bench.db")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    timings = []
+    for _ in range(2):  # insertions puis mises à jour
+        start = time.perf_counter()
+        save(db, activities)
+        timings.append(time.perf_counter() - start)
+    rows = snapshot(db)
+    db.close()
+    engine.dispose()
+    return timings, rows
+
+
+def main():
+    n_activities = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    n_points = int(sys.argv[2]) if len(sys.argv) > 2 else 1800
+    batch_size = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+
+    rng = np.random.default_rng(0)
+    activities = synthetic_activities(rng, n_activities, n_points)
+    print(f"{n_activities} activités de {n_points} points, SQLite\n")
+
+    # Préparation des lignes seule (streams binaires, zones cardiaques), commune aux deux chemins
+    start = time.perf_counter()
+    for act in activities:
+        _activity_row(ATHLETE_ID, act)
+    print(f"{'préparation des lignes (commune)':<34} {time.perf_counter() - start:6.2f}s")
+
+    # Les logs de sauvegarde sont coupés pendant les mesures
+    stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+    try:
+        legacy, legacy_rows = run(legacy_save, activities)
+        bulk, bulk_rows = run(lambda db, acts: bulk_save(db, acts, batch_size), activities)
+        whole, whole_rows = run(lambda db, acts: bulk_save(db, acts, len(acts)), activities)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+    for label, timings in [("boucle (1 activité / commit)", legacy),
+                           (f"upsert en bloc (lots de {batch_size})", bulk),
+                           ("upsert en bloc (un seul lot)", whole)]:
+        print(f"{label:<34} insertions {timings[0]:6.2f}s  mises à jour {timings[1]:6.2f}s")
+
+    assert legacy_rows == bulk_rows == whole_rows, "Lignes différentes entre les chemins"
+    print(f"\nLignes identiques. Gain : x{legacy[0] / bulk[0]:.1f} (insertions), "
+          f"x{legacy[1] / bulk[1]:.1f} (mises à jour) avec des lots de {batch_size}")
+
+
+if __name__ == "__main__":
+    main()
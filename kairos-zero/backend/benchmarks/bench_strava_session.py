@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark du client HTTP Strava partagé contre un serveur Strava factice local.
+
+Compte les connexions TCP ouvertes (donc les poignées de main TLS en production)
+pour une synchronisation complète : liste des activités + détails + streams.
+
+Usage :
+    python benchmarks/bench_strava_session.py [nombre_activites]
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# Ajouter le répertoire backend au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.strava_client import StravaClient
+from app.services.strava_fetcher import StravaRateLimiter, fetch_activities_details
+from app.repositories.strava_activity import fetch_full_activity_details
+
+
+class StubStravaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connections = 0
+    lock = threading.Lock()
+    n_activities = 200
+
+    def setup(self):
+        super().setup()
+        with StubStravaHandler.lock:
+            StubStravaHandler.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path.endswith("/athlete/activities"):
+            body = [{"id": i + 1, "start_date": "2025-01-01T08:00:00Z"} for i in range(self.n_activities)]
+        elif re.search(r"/activities/\d+/streams$", path):
+            body = {key: {"data": list(range(500))} for key in ("distance", "time", "altitude", "heartrate")}
+        elif re.search(r"/activities/\d+$", path):
+            body = {"id": int(path.rsplit("/", 1)[1]), "name": "Run", "best_efforts": []}
+        else:
+            body = {}
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("X-RateLimit-Limit", "100000,1000000")
+        self.send_header("X-RateLimit-Usage", "0,0")
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def run_sync(label, fetch_list, fetch_details):
+    StubStravaHandler.connections = 0
+    start = time.perf_counter()
+    activity_ids = [a["id"] for a in fetch_list()]
+    n_requests = 1 + 2 * len(activity_ids)
+    fetch_details(activity_ids)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<38} {n_requests:>6} requêtes  {StubStravaHandler.connections:>6} connexions  {elapsed:6.2f}s")
+    return StubStravaHandler.connections
+
+
+def main():
+    n_activities = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    StubStravaHandler.n_activities = n_activities
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubStravaHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}/api/v3"
+    headers = {"Authorization": "Bearer test"}
+
+    print(f"Synchronisation de {n_activities} activités contre {base_url}\n")
+
+    # Avant : requests.get au niveau du module, une connexion par appel
+    def legacy_details(ids):
+        for activity_id in ids:
+            requests.get(f"{base_url}/activities/{activity_id}", headers=headers)
+            requests.get(f"{base_url}/activities/{activity_id}/streams", headers=headers)
+
+    legacy = run_sync(
+        "requests.get (avant)",
+        lambda: requests.get(f"{base_url}/athlete/activities", headers=headers).json(),
+        legacy_details
+    )
+
+    # Après : client partagé, séquentiel
+    client = StravaClient(base_url=base_url, rate_limiter=StravaRateLimiter(100000, 1000000))
+    pooled = run_sync(
+        "StravaClient séquentiel",
+        lambda: client.get("/athlete/activities", access_token="test").json(),
+        lambda ids: [fetch_full_activity_details("test", i, client) for i in ids]
+    )
+
+    # Après : client partagé + moteur concurrent
+    client = StravaClient(base_url=base_url, rate_limiter=StravaRateLimiter(100000, 1000000))
+    concurrent = run_sync(
+        "StravaClient + fetch_activities_details",
+        lambda: client.get("/athlete/activities", access_token="test").json(),
+        lambda ids: list(fetch_activities_details("test", ids, max_workers=4, client=client))
+    )
+
+    print(f"\nPoignées de main économisées par synchronisation : "
+          f"{legacy - pooled} (séquentiel), {legacy - concurrent} (concurrent)")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { Link } from 'react-router-dom';
 import { useAuth } from '../contexts/AuthContext';
 import { ApiService } from '../services/apiService';
 import AnalyticsCharts from '../components/AnalyticsCharts';
 
+// Intervalle de consultation de l'état de la synchronisation
+const SYNC_POLL_INTERVAL_MS = 2000;
+
 interface Activity {
   id: number;
   name: string;
@@ -23,7 +26,15 @@ const Dashboard: React.FC = () => {
   const [syncingActivities, setSyncingActivities] = useState(false);
   const [syncError, setSyncError] = useState<string | null>(null);
   const [autoSyncInProgress, setAutoSyncInProgress] = useState(false);
-  // Retirer les hooks et fonctions liés à la synchro simple
+  // Arrête le suivi des synchronisations quand on quitte le dashboard
+  const mountedRef = useRef(true);
+
+  useEffect(() => {
+    mountedRef.current = true;
+    return () => {
+      mountedRef.current = false;
+    };
+  }, []);
 
   const fetchRecentActivities = async () => {
     if (!user?.has_strava_linked) return;
@@ -39,18 +50,44 @@ const Dashboard: React.FC = () => {
     }
   };
 
+  // Lance une synchronisation en tâche de fond (ou rejoint celle en cours) et suit son
+  // avancement jusqu'à ce qu'elle soit terminée, échouée ou annulée.
+  // Renvoie null si le dashboard a été quitté entre-temps.
+  const runSyncJob = async () => {
+    let job = await ApiService.syncStravaActivities();
+    while (job.status === 'queued' || job.status === 'running') {
+      await new Promise((resolve) => setTimeout(resolve, SYNC_POLL_INTERVAL_MS));
+      if (!mountedRef.current) return null;
+      job = await ApiService.getSyncJob(job.id);
+    }
+    return job;
+  };
+
+  // Résultat d'une synchronisation terminée : les activités déjà sauvegardées sont
+  // affichées même après une annulation ou un échec
+  const handleSyncResult = async (job: any) => {
+    if (job.status === 'completed') {
+      console.log('Synchronization completed:', job);
+    } else if (job.status === 'cancelled') {
+      setSyncError(job.message || 'Synchronization cancelled');
+    } else {
+      setSyncError(job.error || job.message || 'Synchronization failed');
+    }
+    await fetchRecentActivities();
+  };
+
   const handleSyncActivities = async () => {
     try {
       setSyncingActivities(true);
       setSyncError(null);
       
-      const data = await ApiService.syncStravaActivities();
-      console.log('Synchronization successful:', data);
-      // Recharger les activités récentes après synchronisation
-      await fetchRecentActivities();
+      const job = await runSyncJob();
+      if (job) {
+        await handleSyncResult(job);
+      }
     } catch (error) {
       console.error('Error during synchronization:', error);
-              setSyncError('Connection error during synchronization');
+      setSyncError('Connection error during synchronization');
     } finally {
       setSyncingActivities(false);
     }
@@ -61,10 +98,10 @@ const Dashboard: React.FC = () => {
     
     try {
       setAutoSyncInProgress(true);
-      const data = await ApiService.syncStravaActivities();
-      console.log('Automatic synchronization successful:', data);
-      // Recharger les activités récentes après synchronisation
-      await fetchRecentActivities();
+      const job = await runSyncJob();
+      if (job) {
+        await handleSyncResult(job);
+      }
     } catch (error) {
       console.warn('Error during automatic synchronization:', error);
     } finally {
@@ -4,8 +4,12 @@ import { Link } from "react-router-dom";
 import { useAuth } from "../contexts/AuthContext";
 import { apiService } from "../services/apiService";
 
+// Intervalle de consultation de l'état de la synchronisation
+const SYNC_POLL_INTERVAL_MS = 2000;
+
 const StravaSuccess = () => {
   const [message, setMessage] = useState("Initialisation...");
+  const [progress, setProgress] = useState<number | null>(null);
   const [isSyncing, setIsSyncing] = useState(false);
   const [hasError, setHasError] = useState(false);
   const [result, setResult] = useState<any>(null);
@@ -36,19 +40,36 @@ const StravaSuccess = () => {
         
         setMessage("Connexion à Strava...");
         
-        // 2. Déclencher la synchronisation intelligente
-        const syncResponse = await apiService.get('/strava/sync-intelligent');
+        // 2. Lancer la synchronisation intelligente en tâche de fond
+        const syncResponse = await apiService.post('/strava/sync-jobs?mode=intelligent');
         
-        if (syncResponse.ok) {
-          const data = await syncResponse.json();
-          setResult(data);
-          setMessage(data.message);
-          setIsSyncing(false);
-        } else {
+        if (!syncResponse.ok) {
           const errorData = await syncResponse.json();
           throw new Error(errorData.detail || "Erreur de synchronisation");
         }
         
+        // 3. Suivre l'avancement jusqu'à la fin de la synchronisation
+        let job = await syncResponse.json();
+        while (job.status === 'queued' || job.status === 'running') {
+          setProgress(job.progress);
+          setMessage(job.message || "Synchronisation en cours...");
+          await new Promise((resolve) => setTimeout(resolve, SYNC_POLL_INTERVAL_MS));
+          
+          const statusResponse = await apiService.get(`/strava/sync-jobs/${job.id}`);
+          if (!statusResponse.ok) {
+            throw new Error("Impossible de suivre la synchronisation");
+          }
+          job = await statusResponse.json();
+        }
+        
+        if (job.status !== 'completed') {
+          throw new Error(job.error || job.message || "Erreur de synchronisation");
+        }
+        
+        setResult(job);
+        setMessage(job.message);
+        setIsSyncing(false);
+        
       } catch (error: any) {
         console.error("Erreur:", error);
         setMessage(`Erreur: ${error.message || 'Unknown error'}`);
@@ -83,7 +104,7 @@ const StravaSuccess = () => {
                 <div className="progress-bar">
                   <div 
                     className="progress-fill"
-                    style={{ 
+                    style={progress !== null && progress > 0 ? { width: `${progress}%` } : { 
                       width: '100%',
                       animation: 'pulse 2s infinite'
                     }}
@@ -96,11 +117,10 @@ const StravaSuccess = () => {
             {!isSyncing && !hasError && !isLoading && result && (
               <div style={{ marginTop: '2rem' }}>
                 <p style={{ color: '#00d4ff', fontWeight: '600' }}>✅ {result.message}</p>
-                {result.sync_info && (
+                {result.total_activities !== null && (
                   <div style={{ marginTop: '1rem', textAlign: 'left', background: '#f8f9fa', padding: '1rem', borderRadius: '8px' }}>
-                    <p><strong>Activities in Strava:</strong> {result.sync_info.total_activities_in_strava}</p>
-                    <p><strong>New activities found:</strong> {result.sync_info.new_activities_found}</p>
-                    <p><strong>Activities synchronized:</strong> {result.sync_info.successfully_synced}</p>
+                    <p><strong>New activities found:</strong> {result.total_activities}</p>
+                    <p><strong>Activities synchronized:</strong> {result.new_activities + result.updated_activities}</p>
                   </div>
                 )}
                 <Link to="/upload-gpx" className="btn btn-primary" style={{ marginTop: '1rem' }}>
@@ -50,8 +50,21 @@ export class ApiService {
     return this.makeRequest(`${API_BASE_URL}/strava/auth`);
   }
 
-  static async syncStravaActivities(): Promise<any> {
-    return this.makeRequest(`${API_BASE_URL}/strava/sync-intelligent`);
+  // Lance une synchronisation en tâche de fond (ou renvoie celle déjà en cours)
+  static async syncStravaActivities(mode: 'intelligent' | 'full' = 'intelligent'): Promise<any> {
+    return this.makeRequest(`${API_BASE_URL}/strava/sync-jobs?mode=${mode}`, {
+      method: 'POST',
+    });
+  }
+
+  static async getSyncJob(jobId: number): Promise<any> {
+    return this.makeRequest(`${API_BASE_URL}/strava/sync-jobs/${jobId}`);
+  }
+
+  static async cancelSyncJob(jobId: number): Promise<any> {
+    return this.makeRequest(`${API_BASE_URL}/strava/sync-jobs/${jobId}/cancel`, {
+      method: 'POST',
+    });
   }
 
   static async linkStravaToken(code: string): Promise<any> {